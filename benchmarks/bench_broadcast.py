@@ -0,0 +1,77 @@
+"""Notification broadcast throughput: per-user add_notification loop vs NotificationDispatcher
+
+Both run against a journal-backed DataManager holding a synthetic school,
+so the journal write per notification (loop) versus per batch (broadcast)
+is part of the measurement.
+
+Run from the project root:
+    python -m benchmarks.bench_broadcast --students 10000 30000
+"""
+import argparse
+import logging
+import shutil
+import tempfile
+import time
+from typing import List
+
+from benchmarks.synthetic_data import generate_school
+from managers.data_manager import DataManager
+from managers.notification_dispatcher import NotificationDispatcher
+from managers.storage import JournalStorage
+from models.passwords import SHA256Hasher, set_default_hasher
+
+
+def measure(students: int, seed: int) -> dict:
+    """Time a school-wide notification both ways"""
+    directory = tempfile.mkdtemp(prefix="eduplatform_broadcast_")
+    try:
+        data_manager = DataManager(storage=JournalStorage(directory))
+        generate_school(data_manager, students, seed, notifications_per_user=0, grades_per_student=0,
+                        submission_rate=0.0)
+        recipients = data_manager.get_recipients("all")
+
+        start = time.perf_counter()
+        with data_manager.bulk():
+            for user_id in recipients:
+                data_manager.add_notification(user_id, "School closed tomorrow")
+        loop_seconds = time.perf_counter() - start
+
+        dispatcher = NotificationDispatcher(data_manager)
+        start = time.perf_counter()
+        broadcast = dispatcher.broadcast("School closed tomorrow", "all")
+        enqueue_seconds = time.perf_counter() - start
+        broadcast.done.wait()
+        broadcast_seconds = time.perf_counter() - start
+
+        parents_start = time.perf_counter()
+        grade = dispatcher.broadcast("Parent meeting", "grade", "9", roles=["Parent"])
+        grade.done.wait()
+        grade_seconds = time.perf_counter() - parents_start
+
+        dispatcher.shutdown()
+        data_manager.close()
+        return {'recipients': len(recipients), 'loop_seconds': loop_seconds, 'enqueue_us': enqueue_seconds * 1e6,
+                'broadcast_seconds': broadcast_seconds, 'grade_parents': grade.delivered, 'grade_seconds': grade_seconds}
+    finally:
+        shutil.rmtree(directory)
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare per-user notifications with batched broadcasts")
+    parser.add_argument("--students", type=int, nargs="+", default=[10_000, 30_000])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    set_default_hasher(SHA256Hasher())  # Keep key derivation cost out of school generation
+    logging.disable(logging.INFO)
+
+    print(f"{'Students':>9} {'Recipients':>11} {'Loop (/s)':>11} {'Broadcast (/s)':>15} {'Enqueue (us)':>13} "
+          f"{'Grade-9 parents':>16} {'(ms)':>7}")
+    for students in args.students:
+        result = measure(students, args.seed)
+        print(f"{students:>9,} {result['recipients']:>11,} {result['recipients'] / result['loop_seconds']:>11,.0f} "
+              f"{result['recipients'] / result['broadcast_seconds']:>15,.0f} {result['enqueue_us']:>13.1f} "
+              f"{result['grade_parents']:>16,} {result['grade_seconds'] * 1000:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Journal write and replay benchmark for DataManager persistence
+
+Run from the project root:
+    python -m benchmarks.bench_journal_replay --records 1000000
+"""
+import argparse
+import shutil
+import tempfile
+import time
+from typing import List
+
+from managers.data_manager import DataManager
+from managers.storage import JournalStorage
+from models.users import Student, Teacher
+from models.passwords import SHA256Hasher, set_default_hasher
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark journal writes and startup replay")
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--students", type=int, default=10_000)
+    args = parser.parse_args(argv)
+    set_default_hasher(SHA256Hasher())  # Keep key derivation cost out of the measurement
+
+    directory = tempfile.mkdtemp(prefix="eduplatform_bench_")
+    try:
+        # Never snapshot, so startup has to replay the whole journal
+        data_manager = DataManager(storage=JournalStorage(directory, snapshot_every=args.records * 2))
+        teacher = Teacher(1, "Teacher", "teacher@edu.com", "teacher123", ["Mathematics"])
+        data_manager.add_user(teacher)
+        for user_id in range(2, args.students + 2):
+            data_manager.add_user(Student(user_id, f"Student {user_id}", f"s{user_id}@edu.com", "pw", "9-A"))
+
+        grade_count = args.records - args.students - 1
+        start = time.perf_counter()
+        for index in range(grade_count):
+            data_manager.add_grade(2 + index % args.students, "Mathematics", 1 + index % 5, 1)
+        data_manager.close()
+        write_time = time.perf_counter() - start
+        print(f"Journal writes: {grade_count / write_time:,.0f} grades/sec")
+
+        start = time.perf_counter()
+        restored = DataManager(storage=JournalStorage(directory, snapshot_every=args.records * 2))
+        replay_time = time.perf_counter() - start
+        print(f"Journal replay: {args.records:,} records in {replay_time:.2f}s")
+
+        start = time.perf_counter()
+        restored.create_snapshot()
+        restored.close()
+        snapshot_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        DataManager(storage=JournalStorage(directory))
+        print(f"Snapshot write: {snapshot_time:.2f}s, snapshot load: {time.perf_counter() - start:.2f}s")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
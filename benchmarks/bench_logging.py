@@ -0,0 +1,72 @@
+"""Caller-side cost of a log call in each logging mode
+
+Times the calling thread only: "basic" formats and writes to the file
+synchronously, "queue" hands the raw record to the listener thread, whose
+formatting and disk writes are then waited for separately.
+
+Run from the project root:
+    python -m benchmarks.bench_logging --calls 100000
+"""
+import argparse
+import io
+import logging
+import os
+import shutil
+import tempfile
+import time
+from contextlib import redirect_stderr
+from typing import List
+
+from config.logging_config import setup_logging
+
+logger = logging.getLogger("models.users")
+
+
+def measure(mode: str, calls: int, directory: str) -> dict:
+    """Average microseconds per call for eager, lazy and filtered log calls"""
+    filtered = logging.getLogger("models.entities")
+    results = {}
+    with redirect_stderr(io.StringIO()):  # Keep basic mode's console copy off the terminal
+        listener = setup_logging(mode=mode, path=os.path.join(directory, f"{mode}.log"),
+                                 levels={'models.entities': logging.WARNING}, fast_records=mode == "queue")
+        start = time.perf_counter()
+        for index in range(calls):
+            logger.info(f"Student {index} submitted assignment {index % 40}")
+        results['eager_us'] = (time.perf_counter() - start) / calls * 1e6
+
+        start = time.perf_counter()
+        for index in range(calls):
+            logger.info("Student %s submitted assignment %s", index, index % 40)
+        results['lazy_us'] = (time.perf_counter() - start) / calls * 1e6
+
+        start = time.perf_counter()
+        for index in range(calls):
+            filtered.info("Notification %d sent to user %s", index, index)
+        results['filtered_us'] = (time.perf_counter() - start) / calls * 1e6
+
+        start = time.perf_counter()
+        if listener is not None:
+            listener.stop()
+        results['drain_s'] = time.perf_counter() - start
+    return results
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare synchronous and queued logging on the caller thread")
+    parser.add_argument("--calls", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(prefix="eduplatform_logging_")
+    try:
+        print(f"{'Mode':>6} {'f-string (us)':>14} {'%-args (us)':>12} {'Filtered (us)':>14} {'Drain (s)':>10}")
+        for mode in ("basic", "queue"):
+            result = measure(mode, args.calls, directory)
+            print(f"{mode:>6} {result['eager_us']:>14.2f} {result['lazy_us']:>12.2f} "
+                  f"{result['filtered_us']:>14.3f} {result['drain_s']:>10.2f}")
+    finally:
+        setup_logging(mode="basic", path=os.devnull)
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
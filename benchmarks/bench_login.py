@@ -0,0 +1,66 @@
+"""Login latency benchmark for DataManager.authenticate_user and session resolution
+
+Run from the project root:
+    python -m benchmarks.bench_login --sizes 1000 10000 100000 1000000
+"""
+import argparse
+import random
+import time
+from typing import List
+
+from managers.data_manager import DataManager
+from managers.session_manager import SessionManager
+from models.users import Student
+from models.passwords import SHA256Hasher, set_default_hasher
+
+
+def build_data_manager(user_count: int) -> DataManager:
+    """Create DataManager populated with user_count students"""
+    data_manager = DataManager()
+    for user_id in range(1, user_count + 1):
+        student = Student(user_id, f"Student {user_id}", f"student{user_id}@edu.com", "student123", "9-A")
+        data_manager.add_user(student)
+    return data_manager
+
+
+def measure_logins(data_manager: DataManager, user_count: int, rounds: int) -> float:
+    """Return average authenticate_user latency in microseconds"""
+    emails = [f"Student{random.randint(1, user_count)}@EDU.com" for _ in range(rounds)]
+    start = time.perf_counter()
+    for email in emails:
+        if data_manager.authenticate_user(email, "student123") is None:
+            raise RuntimeError(f"Login failed for {email}")
+    elapsed = time.perf_counter() - start
+    return elapsed / rounds * 1_000_000
+
+
+def measure_session_resolve(data_manager: DataManager, user_count: int, rounds: int) -> float:
+    """Return average SessionManager.resolve latency in microseconds"""
+    sessions = SessionManager(data_manager, max_sessions=user_count)
+    tokens = [sessions.create(data_manager.users[random.randint(1, user_count)]) for _ in range(min(rounds, user_count))]
+    lookups = [random.choice(tokens) for _ in range(rounds)]
+    start = time.perf_counter()
+    for token in lookups:
+        if sessions.resolve(token) is None:
+            raise RuntimeError("Session lookup failed")
+    elapsed = time.perf_counter() - start
+    return elapsed / rounds * 1_000_000
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark login latency by user count")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--rounds", type=int, default=10_000)
+    args = parser.parse_args(argv)
+    set_default_hasher(SHA256Hasher())  # Keep key derivation cost out of the measurement
+
+    print(f"{'Users':>10} {'Login (us)':>12} {'Resolve (us)':>13}")
+    for size in args.sizes:
+        data_manager = build_data_manager(size)
+        latency = measure_logins(data_manager, size, args.rounds)
+        resolve_latency = measure_session_resolve(data_manager, size, args.rounds)
+        print(f"{size:>10} {latency:>12.2f} {resolve_latency:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
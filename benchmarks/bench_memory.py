@@ -0,0 +1,60 @@
+"""Memory footprint benchmark for model objects
+
+Run from the project root:
+    python -m benchmarks.bench_memory --students 20000
+"""
+import argparse
+import gc
+import tracemalloc
+from typing import List, Tuple
+
+from managers.notification_store import NotificationStore
+from models.users import Student
+from models.passwords import SHA256Hasher, set_default_hasher
+
+SUBJECTS = ["Mathematics", "Physics", "Chemistry", "Literature", "History"]
+
+
+def build_students(count: int, grades_per_subject: int,
+                   notifications: int) -> Tuple[List[Student], NotificationStore]:
+    """Create students with grades, and their notifications in a NotificationStore"""
+    students = []
+    store = NotificationStore()
+    for user_id in range(1, count + 1):
+        student = Student(user_id, f"Student {user_id}", f"student{user_id}@edu.com", "student123", "9-A")
+        for subject_index, subject in enumerate(SUBJECTS):
+            student.subjects[subject] = subject_index + 1
+            for grade_index in range(grades_per_subject):
+                student.add_grade(subject, 1 + (user_id + grade_index) % 5)
+        for notification_index in range(notifications):
+            store.add(user_id, f"Reminder {notification_index}")
+        students.append(student)
+    return students, store
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure bytes per student")
+    parser.add_argument("--students", type=int, default=20_000)
+    parser.add_argument("--grades-per-subject", type=int, default=8)
+    parser.add_argument("--notifications", type=int, default=3)
+    args = parser.parse_args(argv)
+    set_default_hasher(SHA256Hasher())  # Keep key derivation cost out of the measurement
+
+    import logging
+    logging.disable(logging.INFO)  # Keep per-notification log lines out of the measurement
+
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    students, store = build_students(args.students, args.grades_per_subject, args.notifications)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    print(f"Students: {len(students):,}")
+    print(f"Grades per student: {len(SUBJECTS) * args.grades_per_subject}, notifications: {args.notifications}")
+    print(f"Bytes per student: {used / len(students):,.0f}")
+
+
+if __name__ == "__main__":
+    main()
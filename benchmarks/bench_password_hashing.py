@@ -0,0 +1,95 @@
+"""Login throughput benchmark for salted password hashers
+
+Measures logins/sec and latency with concurrent clients at several cost
+settings, verifying on a bounded HashingPool.
+
+Run from the project root:
+    python -m benchmarks.bench_password_hashing --clients 16 --logins 400
+"""
+import argparse
+import statistics
+import threading
+import time
+from typing import List, Tuple
+
+from managers.data_manager import DataManager
+from managers.hashing_pool import HashingPool
+from models.passwords import PasswordHasher, PBKDF2Hasher, ScryptHasher, SHA256Hasher, set_default_hasher
+from models.users import Student
+
+COST_SETTINGS = [
+    ("pbkdf2 100k", PBKDF2Hasher(iterations=100_000)),
+    ("pbkdf2 300k", PBKDF2Hasher(iterations=300_000)),
+    ("pbkdf2 600k", PBKDF2Hasher(iterations=600_000)),
+    ("scrypt n=2^13", ScryptHasher(n=2 ** 13)),
+    ("scrypt n=2^14", ScryptHasher(n=2 ** 14)),
+    ("scrypt n=2^15", ScryptHasher(n=2 ** 15))
+]
+
+
+def build_data_manager(hasher: PasswordHasher, user_count: int, workers: int) -> DataManager:
+    """Create DataManager whose students share one precomputed hash"""
+    set_default_hasher(SHA256Hasher())  # Cheap constructor hashes, replaced below
+    password_hash = hasher.hash("student123")
+    data_manager = DataManager(hashing_pool=HashingPool(max_workers=workers, timeout=60.0))
+    for user_id in range(1, user_count + 1):
+        student = Student(user_id, f"Student {user_id}", f"student{user_id}@edu.com", "student123", "9-A")
+        student._password_hash = password_hash
+        data_manager.add_user(student)
+    set_default_hasher(hasher)  # Stored hashes are current, so no rehash happens
+    return data_manager
+
+
+def run_clients(data_manager: DataManager, user_count: int, clients: int, logins: int) -> Tuple[float, List[float]]:
+    """Run concurrent logins, returning (elapsed seconds, latencies in ms)"""
+    latencies: List[float] = []
+    lock = threading.Lock()
+    per_client = max(1, logins // clients)
+
+    def client(offset: int) -> None:
+        local = []
+        for index in range(per_client):
+            email = f"student{(offset * per_client + index) % user_count + 1}@edu.com"
+            start = time.perf_counter()
+            if data_manager.authenticate_user(email, "student123") is None:
+                raise RuntimeError(f"Login failed for {email}")
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(offset,)) for offset in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, latencies
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark logins/sec by password hashing cost")
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=None, help="Hashing pool size (default: pool default)")
+    args = parser.parse_args(argv)
+
+    print(f"{'Hasher':<15} {'Hash (ms)':>10} {'Logins/sec':>11} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    for label, hasher in COST_SETTINGS:
+        start = time.perf_counter()
+        encoded = hasher.hash("student123")
+        hash_time = (time.perf_counter() - start) * 1000
+        if not hasher.verify("student123", encoded):
+            raise RuntimeError(f"{label} failed to verify its own hash")
+
+        data_manager = build_data_manager(hasher, args.users, args.workers)
+        elapsed, latencies = run_clients(data_manager, args.users, args.clients, args.logins)
+        data_manager.close()
+
+        quantiles = statistics.quantiles(latencies, n=20)
+        print(f"{label:<15} {hash_time:>10.1f} {len(latencies) / elapsed:>11.1f} "
+              f"{statistics.median(latencies):>9.1f} {quantiles[18]:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""End-to-end benchmark suite on synthetic schools
+
+For every size a seeded school is generated (memory per entity is measured
+with tracemalloc while each generation phase runs), then login latency,
+every ExportManager format and the CLI report functions are timed. Results
+go to a JSON file that can be compared with one from another revision.
+
+Run from the project root:
+    python -m benchmarks.bench_suite --sizes 1000 10000 --output bench_results.json
+    python -m benchmarks.bench_suite --sizes 1000 10000 --compare bench_results.json
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.synthetic_data import SchoolGenerator
+from cli.interface import CLIInterface
+from managers.data_manager import DataManager
+from managers.export_manager import ExportManager
+from models.passwords import SHA256Hasher, set_default_hasher
+
+
+def git_revision() -> Optional[str]:
+    """Current commit hash, None outside a git checkout"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def generate(students: int, seed: int) -> Dict[str, Any]:
+    """Generate a school phase by phase, measuring bytes per created entity"""
+    data_manager = DataManager()
+    generator = SchoolGenerator(data_manager, students, seed)
+    memory = {}
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for phase in generator.PHASES:
+        before = tracemalloc.get_traced_memory()[0]
+        count = getattr(generator, phase)()
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+        memory[phase] = round(used / count) if count else None
+    seconds = time.perf_counter() - start  # Inflated by tracemalloc, reported for reference only
+    tracemalloc.stop()
+    return {'data_manager': data_manager, 'counts': generator.counts,
+            'bytes_per_entity': memory, 'generate_seconds': round(seconds, 3)}
+
+
+def time_logins(data_manager: DataManager, rounds: int, seed: int) -> Dict[str, float]:
+    """Average authenticate_user latency for existing and unknown users"""
+    rng = random.Random(seed)
+    users = list(data_manager.users.values())
+    passwords = {'Admin': "admin123", 'Teacher': "teacher123", 'Student': "student123", 'Parent': "parent123"}
+    picks = [rng.choice(users) for _ in range(rounds)]
+
+    start = time.perf_counter()
+    for user in picks:
+        if data_manager.authenticate_user(user._email.upper(), passwords[user.role]) is not user:
+            raise RuntimeError(f"Login failed for {user._email}")
+    success = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for index in range(rounds):
+        data_manager.authenticate_user(f"nobody{index}@school.edu", "wrong")
+    unknown = time.perf_counter() - start
+    return {'login_us': round(success / rounds * 1e6, 2), 'unknown_user_us': round(unknown / rounds * 1e6, 2)}
+
+
+def time_exports(export_manager: ExportManager, directory: str) -> Dict[str, Dict]:
+    """Run every export format, collecting the telemetry of its export log entry"""
+    exports: Dict[str, Callable[[], bool]] = {
+        'xlsx': lambda: export_manager.export_to_xlsx(os.path.join(directory, "data.xlsx")),
+        'csv': lambda: export_manager.export_to_csv(os.path.join(directory, "csv")),
+        'csv_gzip': lambda: export_manager.export_to_csv(os.path.join(directory, "csv_gzip"), compression="gzip"),
+        'sql': lambda: export_manager.export_to_sql(os.path.join(directory, "schema.sql")),
+        'sql_bulk': lambda: export_manager.export_to_sql(os.path.join(directory, "bulk.sql"), mode="bulk"),
+        'parquet': lambda: export_manager.export_to_parquet(os.path.join(directory, "parquet")),
+        'delta_full': lambda: export_manager.export_delta(os.path.join(directory, "delta"))
+    }
+    results = {}
+    for name, run in exports.items():
+        start = time.perf_counter()
+        success = run()
+        seconds = time.perf_counter() - start
+        entry = export_manager.export_log[-1]
+        results[name] = {
+            'success': success,
+            'seconds': round(seconds, 4),
+            'rows': entry.get('rows'),
+            'bytes': entry.get('bytes'),
+            'rows_per_sec': entry.get('rows_per_sec'),
+            'peak_rss_mb': entry.get('peak_rss_mb'),
+            'peak_rss_growth_mb': entry.get('peak_rss_growth_mb')
+        }
+    return results
+
+
+def time_reports(cli: CLIInterface, rounds: int) -> Dict[str, float]:
+    """Average milliseconds of each report, with its printing discarded"""
+    now = datetime.now()
+    reports: Dict[str, Callable[[], Any]] = {
+        'user_statistics': cli.show_user_statistics,
+        'assignment_reports': cli.show_assignment_reports,
+        'grade_analysis': cli.show_grade_analysis,
+        'system_statistics': cli.show_system_statistics,
+        'deadlines_7_days': lambda: cli.data_manager.get_assignments_due(now, now + timedelta(days=7))
+    }
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, report in reports.items():
+            start = time.perf_counter()
+            for _ in range(rounds):
+                report()
+            results[name] = round((time.perf_counter() - start) / rounds * 1000, 3)
+    return results
+
+
+def run_size(students: int, seed: int, login_rounds: int, report_rounds: int) -> Dict[str, Any]:
+    """Generate one school and run every measurement on it"""
+    generated = generate(students, seed)
+    data_manager = generated.pop('data_manager')
+    export_manager = ExportManager(data_manager)
+    cli = CLIInterface(data_manager, export_manager)
+    directory = tempfile.mkdtemp(prefix="eduplatform_bench_")
+    try:
+        result = {'students': students, **generated,
+                  'login': time_logins(data_manager, login_rounds, seed),
+                  'exports': time_exports(export_manager, directory),
+                  'reports_ms': time_reports(cli, report_rounds)}
+    finally:
+        cli.export_scheduler.shutdown()
+        shutil.rmtree(directory, ignore_errors=True)
+    return result
+
+
+def flatten(value: Any, prefix: str = "") -> Dict[str, float]:
+    """Numeric leaves of nested results as {dotted.path: number}"""
+    if isinstance(value, dict):
+        flat = {}
+        for key, item in value.items():
+            flat.update(flatten(item, f"{prefix}.{key}" if prefix else str(key)))
+        return flat
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {prefix: value}
+    return {}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print metrics that differ from a baseline result file"""
+    baseline_sizes = {result['students']: result for result in baseline['results']}
+    print(f"\nCompared with {baseline.get('revision') or 'baseline'} ({baseline.get('timestamp', '')[:19]})")
+    for result in current['results']:
+        previous = baseline_sizes.get(result['students'])
+        if previous is None:
+            continue
+        old_values = flatten(previous)
+        print(f"\n{result['students']:,} students")
+        for key, value in flatten(result).items():
+            old = old_values.get(key)
+            if old is None or key.startswith('counts.') or old == value:
+                continue
+            change = f"{(value - old) / old * 100:+.1f}%" if old else "new"
+            print(f"  {key:<40} {old:>14,.2f} -> {value:>14,.2f} {change:>8}")
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the end-to-end benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000], help="Students per school")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--login-rounds", type=int, default=10_000)
+    parser.add_argument("--report-rounds", type=int, default=5)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="Earlier result file to compare against")
+    args = parser.parse_args(argv)
+    set_default_hasher(SHA256Hasher())  # Keep key derivation cost out of the measurement
+
+    import logging
+    logging.disable(logging.INFO)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)  # Read first, output may overwrite it
+
+    results = {
+        'revision': git_revision(),
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': args.seed,
+        'results': []
+    }
+    print(f"{'Students':>9} {'Users':>8} {'Grades':>9} {'Login (us)':>11} {'CSV (s)':>8} {'XLSX (s)':>9} "
+          f"{'SQL (s)':>8} {'Stats (ms)':>11} {'B/grade':>8}")
+    for size in args.sizes:
+        result = run_size(size, args.seed, args.login_rounds, args.report_rounds)
+        results['results'].append(result)
+        exports = result['exports']
+        print(f"{size:>9,} {result['counts']['users']:>8,} {result['counts']['grades']:>9,} "
+              f"{result['login']['login_us']:>11.2f} {exports['csv']['seconds']:>8.2f} "
+              f"{exports['xlsx']['seconds']:>9.2f} {exports['sql']['seconds']:>8.2f} "
+              f"{result['reports_ms']['system_statistics']:>11.2f} "
+              f"{result['bytes_per_entity']['grades'] or 0:>8}")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if baseline is not None:
+        compare(results, baseline)
+
+
+if __name__ == "__main__":
+    main()
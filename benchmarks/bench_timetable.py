@@ -0,0 +1,106 @@
+"""Timetable queries: full scan over every Schedule vs TimetableIndex
+
+Both answer "is this teacher free for a lesson at day/time" and "which
+classes are free at day/time" on the timetables of a synthetic school.
+
+Run from the project root:
+    python -m benchmarks.bench_timetable --students 5000 20000
+"""
+import argparse
+import logging
+import random
+import time
+from typing import List
+
+from benchmarks.synthetic_data import DAYS, LESSON_TIMES, SchoolGenerator
+from managers.data_manager import DataManager
+from managers.timetable_index import to_minutes
+from models.entities import Schedule
+from models.passwords import SHA256Hasher, set_default_hasher
+
+
+def scan_teacher_busy(data_manager: DataManager, teacher_id: int, day: str, time_: str) -> bool:
+    """Check every schedule of the day for an overlapping lesson of the teacher"""
+    start = to_minutes(time_)
+    end = start + Schedule.LESSON_MINUTES
+    for schedule in data_manager.schedules.values():
+        if schedule.day != day:
+            continue
+        for lesson_time, lesson in schedule.lessons.items():
+            lesson_start = to_minutes(lesson_time)
+            if (lesson['teacher_id'] == teacher_id and lesson_start < end
+                    and start < lesson_start + lesson['duration']):
+                return True
+    return False
+
+
+def scan_free_classes(data_manager: DataManager, day: str, time_: str) -> List[str]:
+    """Collect busy classes by checking every schedule of the day"""
+    minute = to_minutes(time_)
+    busy = set()
+    classes = set()
+    for schedule in data_manager.schedules.values():
+        classes.add(schedule.class_id)
+        if schedule.day != day:
+            continue
+        for lesson_time, lesson in schedule.lessons.items():
+            lesson_start = to_minutes(lesson_time)
+            if lesson_start <= minute < lesson_start + lesson['duration']:
+                busy.add(schedule.class_id)
+    return sorted(classes - busy)
+
+
+def measure(students: int, seed: int, queries: int) -> dict:
+    """Average microseconds per query, scanning and indexed"""
+    data_manager = DataManager()
+    generator = SchoolGenerator(data_manager, students, seed)
+    generator.users()
+    generator.schedules()
+    rng = random.Random(seed)
+    teachers = list(data_manager.teachers)
+    picks = [(rng.choice(teachers), rng.choice(DAYS), rng.choice(LESSON_TIMES)) for _ in range(queries)]
+
+    start = time.perf_counter()
+    scanned = [scan_teacher_busy(data_manager, *pick) for pick in picks]
+    scan_conflict = time.perf_counter() - start
+    start = time.perf_counter()
+    indexed = [data_manager.timetable.conflict("", day, time_, teacher_id, Schedule.LESSON_MINUTES) is not None
+               for teacher_id, day, time_ in picks]
+    index_conflict = time.perf_counter() - start
+    if scanned != indexed:
+        raise RuntimeError("Index and scan disagree on teacher conflicts")
+
+    slots = picks[:max(1, queries // 10)]
+    start = time.perf_counter()
+    scanned = [scan_free_classes(data_manager, day, time_) for _, day, time_ in slots]
+    scan_free = time.perf_counter() - start
+    start = time.perf_counter()
+    indexed = [data_manager.timetable.free_classes(day, time_) for _, day, time_ in slots]
+    index_free = time.perf_counter() - start
+    if scanned != indexed:
+        raise RuntimeError("Index and scan disagree on free classes")
+
+    return {'lessons': len(data_manager.timetable),
+            'scan_conflict_us': scan_conflict / queries * 1e6, 'index_conflict_us': index_conflict / queries * 1e6,
+            'scan_free_us': scan_free / len(slots) * 1e6, 'index_free_us': index_free / len(slots) * 1e6}
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare timetable scans with the timetable index")
+    parser.add_argument("--students", type=int, nargs="+", default=[5_000, 20_000])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--queries", type=int, default=1_000)
+    args = parser.parse_args(argv)
+    set_default_hasher(SHA256Hasher())  # Keep key derivation cost out of school generation
+    logging.disable(logging.INFO)
+
+    print(f"{'Students':>9} {'Lessons':>8} {'Conflict scan (us)':>19} {'Index (us)':>11} "
+          f"{'Free scan (us)':>15} {'Index (us)':>11}")
+    for students in args.students:
+        result = measure(students, args.seed, args.queries)
+        print(f"{students:>9,} {result['lessons']:>8,} {result['scan_conflict_us']:>19,.1f} "
+              f"{result['index_conflict_us']:>11.2f} {result['scan_free_us']:>15,.1f} {result['index_free_us']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Peak memory and wall time of streaming vs in-memory XLSX export
+
+Every measurement runs in a fresh subprocess so peak RSS is not polluted by
+earlier runs.
+
+Run from the project root:
+    python -m benchmarks.bench_xlsx_export --rows 10000 100000 1000000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from managers.data_manager import DataManager
+from managers.export_manager import ExportManager
+from models.entities import Assignment
+from models.passwords import SHA256Hasher, set_default_hasher
+from models.users import Student, Teacher
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (ru_maxrss is KB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def build_data_manager(rows: int) -> DataManager:
+    """Create DataManager with about rows users and rows / 10 assignments"""
+    data_manager = DataManager()
+    teacher = Teacher(1, "Teacher", "teacher@edu.com", "teacher123", ["Mathematics"])
+    data_manager.add_user(teacher)
+    for user_id in range(2, rows + 1):
+        student = Student(user_id, f"Student {user_id}", f"student{user_id}@edu.com", "student123", "9-A")
+        student.subjects["Mathematics"] = 1
+        data_manager.add_user(student)
+    for assignment_id in range(1, rows // 10 + 1):
+        data_manager.add_assignment(Assignment(assignment_id, f"Homework {assignment_id}", "Exercises 1-10",
+                                               "2030-01-01T00:00:00", "Mathematics", 1, "9-A"))
+    return data_manager
+
+
+def run_worker(rows: int, streaming: bool) -> Dict:
+    """Export once in this process and report the measurements"""
+    import logging
+    logging.disable(logging.INFO)
+    set_default_hasher(SHA256Hasher())  # Keep key derivation cost out of the measurement
+
+    data_manager = build_data_manager(rows)
+    baseline = peak_rss_mb()
+    fd, filename = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        start = time.perf_counter()
+        if not ExportManager(data_manager).export_to_xlsx(filename, streaming=streaming):
+            raise RuntimeError("Export failed")
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(filename)
+    finally:
+        os.remove(filename)
+    return {'seconds': elapsed, 'baseline_mb': baseline, 'peak_mb': peak_rss_mb(), 'file_mb': size / 1e6}
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare streaming and in-memory XLSX export")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--in-memory", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker(args.rows[0], streaming=not args.in_memory)))
+        return
+
+    print(f"{'Rows':>10} {'Mode':>10} {'Time (s)':>9} {'Data (MB)':>10} {'Peak (MB)':>10} "
+          f"{'Export (MB)':>12} {'File (MB)':>10}")
+    for rows in args.rows:
+        for mode in ("streaming", "in-memory"):
+            command = [sys.executable, "-m", "benchmarks.bench_xlsx_export", "--worker", "--rows", str(rows)]
+            if mode == "in-memory":
+                command.append("--in-memory")
+            result = subprocess.run(command, capture_output=True, text=True)
+            if result.returncode != 0:
+                print(f"{rows:>10} {mode:>10} failed: {result.stderr.strip().splitlines()[-1:]}")
+                continue
+            stats = json.loads(result.stdout)
+            print(f"{rows:>10} {mode:>10} {stats['seconds']:>9.2f} {stats['baseline_mb']:>10.0f} "
+                  f"{stats['peak_mb']:>10.0f} {stats['peak_mb'] - stats['baseline_mb']:>12.0f} "
+                  f"{stats['file_mb']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
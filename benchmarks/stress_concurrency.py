@@ -0,0 +1,161 @@
+"""Concurrency stress test for DataManager
+
+Many threads log in, submit assignments, grade and send notifications while
+another thread keeps exporting. Afterwards every index, aggregate and the
+persisted journal are checked against the in-memory state.
+
+Run from the project root:
+    python -m benchmarks.stress_concurrency --threads 16 --operations 2000
+"""
+import argparse
+import logging
+import random
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from managers.data_manager import DataManager
+from managers.export_manager import ExportManager
+from managers.storage import JournalStorage
+from models.entities import Assignment
+from models.users import Student, Teacher
+from models.passwords import SHA256Hasher, set_default_hasher
+
+SUBJECTS = ["Mathematics", "Physics", "Chemistry"]
+
+
+def populate(data_manager: DataManager, students: int, teachers: int) -> None:
+    """Create teachers, students and one assignment per teacher"""
+    deadline = (datetime.now() + timedelta(days=30)).isoformat()
+    for _ in range(teachers):
+        teacher_id = data_manager.get_next_id()
+        data_manager.add_user(Teacher(teacher_id, f"Teacher {teacher_id}", f"t{teacher_id}@edu.com",
+                                      "teacher123", SUBJECTS))
+        data_manager.add_assignment(Assignment(
+            data_manager.get_next_assignment_id(), "Homework", "Solve tasks", deadline,
+            random.choice(SUBJECTS), teacher_id, "9-A"
+        ))
+    for _ in range(students):
+        student_id = data_manager.get_next_id()
+        data_manager.add_user(Student(student_id, f"Student {student_id}", f"s{student_id}@edu.com",
+                                      "student123", "9-A"))
+
+
+def worker(data_manager: DataManager, operations: int, errors: List[str]) -> None:
+    """Run a random mix of logins, registrations, submissions, grading and notifications"""
+    students = list(data_manager.students.values())
+    teachers = list(data_manager.teachers.values())
+    try:
+        for _ in range(operations):
+            action = random.random()
+            student = random.choice(students)
+            if action < 0.4:
+                if data_manager.authenticate_user(student._email.upper(), "student123") is not student:
+                    errors.append(f"Login failed for {student._email}")
+            elif action < 0.5:
+                user_id = data_manager.get_next_id()
+                new_student = Student(user_id, "New", f"new{user_id}@edu.com", "student123", "9-A")
+                if not data_manager.add_user(new_student):
+                    errors.append(f"Duplicate ID allocated: {user_id}")
+            elif action < 0.7:
+                assignment = random.choice(data_manager.get_assignments_by_class("9-A"))
+                data_manager.submit_assignment(student._id, assignment.id, "answer")
+            elif action < 0.9:
+                teacher = random.choice(teachers)
+                assignment_id = next(iter(teacher.assignments))
+                data_manager.grade_assignment(teacher._id, assignment_id, student._id, random.randint(1, 5))
+            else:
+                data_manager.add_notification(student._id, "Reminder")
+    except Exception as e:
+        errors.append(f"{type(e).__name__}: {e}")
+
+
+def exporter(export_manager: ExportManager, directory: str, stop: threading.Event, results: List[bool]) -> None:
+    """Export CSV repeatedly until stopped"""
+    while not stop.is_set():
+        results.append(export_manager.export_to_csv(directory))
+
+
+def check_consistency(data_manager: DataManager) -> List[str]:
+    """Verify indexes and aggregates against the primary collections"""
+    problems = []
+    if len(data_manager._users_by_email) != len(data_manager.users):
+        problems.append("Email index size differs from users")
+    if sum(len(members) for members in data_manager._students_by_class.values()) != len(data_manager.students):
+        problems.append("Class index size differs from students")
+    if len(data_manager.notifications) != sum(data_manager.notifications.count(user_id)
+                                              for user_id in data_manager.users):
+        problems.append("Notification total differs from the recipients' inboxes")
+    if len(data_manager.grade_store) != len(data_manager.grades):
+        problems.append("Grade store size differs from grades")
+    for student in data_manager.students.values():
+        grades = [value for values in student.grades.values() for value in values]
+        expected = sum(grades) / len(grades) if grades else 0.0
+        if abs(student.calculate_average_grade() - expected) > 1e-9:
+            problems.append(f"Average out of sync for student {student._id}")
+    for student_id in data_manager.students:
+        recorded = sum(1 for grade in data_manager.grades.values() if grade.student_id == student_id)
+        if recorded != data_manager.students[student_id].get_grade_count():
+            problems.append(f"Grade count out of sync for student {student_id}")
+    return problems
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Stress DataManager with concurrent sessions")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--operations", type=int, default=2_000)
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--teachers", type=int, default=20)
+    args = parser.parse_args(argv)
+    set_default_hasher(SHA256Hasher())  # Keep key derivation cost out of the measurement
+
+    logging.disable(logging.INFO)
+    directory = tempfile.mkdtemp(prefix="eduplatform_stress_")
+    try:
+        data_manager = DataManager(storage=JournalStorage(directory, snapshot_every=5_000))
+        populate(data_manager, args.students, args.teachers)
+        export_manager = ExportManager(data_manager)
+
+        errors: List[str] = []
+        exports: List[bool] = []
+        stop = threading.Event()
+        export_thread = threading.Thread(target=exporter, args=(export_manager, f"{directory}/csv", stop, exports))
+        workers = [threading.Thread(target=worker, args=(data_manager, args.operations, errors))
+                   for _ in range(args.threads)]
+
+        start = time.perf_counter()
+        export_thread.start()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        stop.set()
+        export_thread.join()
+        elapsed = time.perf_counter() - start
+        data_manager.close()
+
+        total = args.threads * args.operations
+        print(f"{total:,} operations on {args.threads} threads in {elapsed:.2f}s ({total / elapsed:,.0f} ops/sec)")
+        print(f"Concurrent exports: {len(exports)} ({exports.count(False)} failed)")
+
+        problems = errors + check_consistency(data_manager)
+        restored = DataManager(storage=JournalStorage(directory))
+        for name in ("users", "assignments", "grades"):
+            if len(getattr(restored, name)) != len(getattr(data_manager, name)):
+                problems.append(f"Recovered {name} count differs")
+
+        if problems or False in exports:
+            print(f"FAILED: {len(problems)} problems")
+            for problem in problems[:20]:
+                print(f"  {problem}")
+            raise SystemExit(1)
+        print("OK: indexes, aggregates and recovered state are consistent")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""Seeded synthetic school data for benchmarks
+
+Builds a realistic school of a given size through the public DataManager
+API: classes of about 25 students, subject teachers covering several
+classes each, parents, weekly timetables, assignments, submissions, grades
+and notifications. The same seed and size always produce the same school
+(timestamps are relative to now).
+
+Run from the project root to print the entity counts:
+    python -m benchmarks.synthetic_data --students 10000 --seed 42
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from managers.data_manager import DataManager
+from models.entities import Assignment, Schedule
+from models.users import Admin, Parent, Student, Teacher
+from models.passwords import SHA256Hasher, set_default_hasher
+
+SUBJECTS = ["Mathematics", "Physics", "Chemistry", "Biology", "Literature", "History", "English", "CS"]
+FIRST_NAMES = ["Alice", "Bob", "Camila", "Daniel", "Elif", "Farid", "Grace", "Hiro", "Ines", "Jamal",
+               "Kira", "Leo", "Maya", "Nikolai", "Olga", "Pedro", "Qiu", "Rosa", "Sami", "Tara"]
+LAST_NAMES = ["Adams", "Brown", "Chen", "Diaz", "Evans", "Fischer", "Garcia", "Hughes", "Ivanova", "Jensen",
+              "Kowalski", "Lopez", "Moreau", "Nakamura", "Okafor", "Petrov", "Rossi", "Silva", "Tanaka", "Weber"]
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+LESSON_TIMES = ["08:00", "08:55", "09:50", "10:55", "11:50", "12:45"]
+GRADE_WEIGHTS = [3, 10, 30, 35, 22]  # Likelihood of grades 1-5
+
+
+class SchoolGenerator:
+    """Populate a DataManager with a seeded synthetic school, one phase at a time
+
+    Phases run in order (users, schedules, assignments, submissions, grades,
+    notifications) so callers can time or measure each one; generate() runs
+    them all. Key derivation dominates user creation unless a cheap default
+    hasher is set first.
+    """
+
+    PHASES = ["users", "schedules", "assignments", "submissions", "grades", "notifications"]
+
+    def __init__(self, data_manager: DataManager, students: int = 1000, seed: int = 42,
+                 students_per_class: int = 25, classes_per_teacher: int = 6, parent_ratio: float = 0.6,
+                 assignments_per_subject: int = 2, submission_rate: float = 0.8, grading_rate: float = 0.7,
+                 grades_per_student: int = 20, notifications_per_user: int = 3):
+        self.data_manager = data_manager
+        self.student_count = students
+        self.random = random.Random(seed)
+        self.students_per_class = students_per_class
+        self.classes_per_teacher = classes_per_teacher
+        self.parent_ratio = parent_ratio
+        self.assignments_per_subject = assignments_per_subject
+        self.submission_rate = submission_rate
+        self.grading_rate = grading_rate
+        self.grades_per_student = grades_per_student
+        self.notifications_per_user = notifications_per_user
+        self.now = datetime.now()
+
+        class_count = max(1, -(-students // students_per_class))
+        # Levels 5-11, parallel classes A-Z, then A1-Z1 and so on for very large schools
+        self.classes = [f"{5 + index % 7}-{chr(ord('A') + index // 7 % 26)}{index // 182 or ''}"
+                        for index in range(class_count)]
+        self.class_subjects: Dict[str, List[str]] = {
+            class_id: self.random.sample(SUBJECTS, min(6, len(SUBJECTS))) for class_id in self.classes
+        }
+        self.class_teachers: Dict[str, Dict[str, int]] = {}  # {class_id: {subject: teacher_id}}
+        self.class_students: Dict[str, List[int]] = {class_id: [] for class_id in self.classes}
+        self.class_assignments: Dict[str, List[Assignment]] = {class_id: [] for class_id in self.classes}
+        self.counts: Dict[str, int] = {phase: 0 for phase in self.PHASES}
+
+    def _name(self) -> str:
+        """Random full name"""
+        return f"{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)}"
+
+    def generate(self) -> Dict[str, int]:
+        """Run every phase, returning entity counts"""
+        with self.data_manager.bulk():
+            for phase in self.PHASES:
+                getattr(self, phase)()
+        return self.counts
+
+    def users(self) -> int:
+        """Create the admin, teachers, students and parents"""
+        data_manager = self.data_manager
+        created = 0
+        admin_id = data_manager.get_next_id()
+        created += data_manager.add_user(Admin(admin_id, "System Admin", f"admin{admin_id}@school.edu", "admin123"))
+
+        # One teacher per subject for every classes_per_teacher classes teaching it
+        for subject in SUBJECTS:
+            classes = [class_id for class_id in self.classes if subject in self.class_subjects[class_id]]
+            for start in range(0, len(classes), self.classes_per_teacher):
+                teacher_id = data_manager.get_next_id()
+                teacher = Teacher(teacher_id, self._name(), f"teacher{teacher_id}@school.edu", "teacher123", [subject])
+                teacher.classes = classes[start:start + self.classes_per_teacher]
+                teacher.workload = len(teacher.classes) * 4
+                created += data_manager.add_user(teacher)
+                for class_id in teacher.classes:
+                    self.class_teachers.setdefault(class_id, {})[subject] = teacher_id
+
+        for index in range(self.student_count):
+            class_id = self.classes[index // self.students_per_class]
+            student_id = data_manager.get_next_id()
+            student = Student(student_id, self._name(), f"student{student_id}@school.edu", "student123", class_id)
+            student.subjects = dict(self.class_teachers[class_id])
+            created += data_manager.add_user(student)
+            self.class_students[class_id].append(student_id)
+
+            if self.random.random() < self.parent_ratio:
+                parent_id = data_manager.get_next_id()
+                parent = Parent(parent_id, self._name(), f"parent{parent_id}@school.edu", "parent123")
+                parent.children = [student_id]
+                created += data_manager.add_user(parent)
+
+        self.counts['users'] = created
+        return created
+
+    def schedules(self) -> int:
+        """Give every class a weekly timetable of its subjects, skipping slots where no teacher is free"""
+        timetable = self.data_manager.timetable
+        created = 0
+        schedule_id = len(self.data_manager.schedules) + 1
+        for class_id in self.classes:
+            subjects = self.class_subjects[class_id]
+            teachers = self.class_teachers[class_id]
+            for day_index, day in enumerate(DAYS):
+                schedule = Schedule(schedule_id, class_id, day)
+                schedule_id += 1
+                for slot, time in enumerate(LESSON_TIMES):
+                    for offset in range(len(subjects)):
+                        subject = subjects[(day_index + slot + offset) % len(subjects)]
+                        if timetable.where_is(teachers[subject], day, time) is None:
+                            schedule.add_lesson(time, subject, teachers[subject])
+                            break
+                created += self.data_manager.add_schedule(schedule)
+        self.counts['schedules'] = created
+        return created
+
+    def assignments(self) -> int:
+        """Create assignments for every class and subject, due within the next weeks"""
+        data_manager = self.data_manager
+        created = 0
+        for class_id in self.classes:
+            for subject, teacher_id in self.class_teachers[class_id].items():
+                for number in range(1, self.assignments_per_subject + 1):
+                    deadline = self.now + timedelta(days=self.random.randint(1, 30), hours=self.random.randint(8, 18))
+                    assignment = Assignment(data_manager.get_next_assignment_id(), f"{subject} homework {number}",
+                                            f"Exercises {number * 10}-{number * 10 + 9}", deadline.isoformat(),
+                                            subject, teacher_id, class_id,
+                                            self.random.choice(["easy", "medium", "hard"]))
+                    if data_manager.add_assignment(assignment):
+                        self.class_assignments[class_id].append(assignment)
+                        created += 1
+        self.counts['assignments'] = created
+        return created
+
+    def submissions(self) -> int:
+        """Let students submit a share of their class assignments"""
+        created = 0
+        for class_id, assignments in self.class_assignments.items():
+            for student_id in self.class_students[class_id]:
+                for assignment in assignments:
+                    if self.random.random() < self.submission_rate:
+                        created += self.data_manager.submit_assignment(student_id, assignment.id,
+                                                                       f"Solution by {student_id}")
+        self.counts['submissions'] = created
+        return created
+
+    def grades(self) -> int:
+        """Grade a share of the submissions and add classwork grades"""
+        data_manager = self.data_manager
+        created = 0
+        for class_id, assignments in self.class_assignments.items():
+            for assignment in assignments:
+                for student_id in list(assignment.submissions):
+                    if self.random.random() < self.grading_rate:
+                        value = self.random.choices(range(1, 6), GRADE_WEIGHTS)[0]
+                        created += data_manager.grade_assignment(assignment.teacher_id, assignment.id,
+                                                                 student_id, value)
+
+            teachers = self.class_teachers[class_id]
+            subjects = list(teachers)
+            for student_id in self.class_students[class_id]:
+                for value in self.random.choices(range(1, 6), GRADE_WEIGHTS, k=self.grades_per_student):
+                    subject = self.random.choice(subjects)
+                    created += data_manager.add_grade(student_id, subject, value, teachers[subject],
+                                                      "Classwork") is not None
+        self.counts['grades'] = created
+        return created
+
+    def notifications(self) -> int:
+        """Send every user a few notifications"""
+        created = 0
+        messages = ["New assignment posted", "Grade published", "Deadline tomorrow", "Parent meeting on Friday"]
+        for user_id in list(self.data_manager.users):
+            for _ in range(self.notifications_per_user):
+                priority = "high" if self.random.random() < 0.1 else "normal"
+                created += self.data_manager.add_notification(user_id, self.random.choice(messages), priority)
+        self.counts['notifications'] = created
+        return created
+
+
+def generate_school(data_manager: DataManager, students: int = 1000, seed: int = 42, **options) -> Dict[str, int]:
+    """Populate data_manager with a synthetic school, returning entity counts"""
+    return SchoolGenerator(data_manager, students, seed, **options).generate()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic school and print entity counts")
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    set_default_hasher(SHA256Hasher())  # Keep key derivation cost out of generation
+
+    import logging
+    logging.disable(logging.INFO)
+
+    counts = generate_school(DataManager(), args.students, args.seed)
+    for entity, count in counts.items():
+        print(f"{entity:>14}: {count:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,30 @@ from models.users import User, Student, Teacher, Parent, Admin
 from models.entities import Assignment
 from managers.data_manager import DataManager
 from managers.export_manager import ExportManager
+from managers.grade_analytics import GradeAnalytics
+from managers.session_manager import SessionManager
+from managers.export_scheduler import ExportScheduler
+from managers.import_manager import ImportManager
+from managers.notification_dispatcher import NotificationDispatcher
 
 
 class CLIInterface:
     """Command Line Interface for edu_platform"""
 
-    def __init__(self, data_manager: DataManager, export_manager: ExportManager):
+    def __init__(self, data_manager: DataManager, export_manager: ExportManager,
+                 session_manager: Optional[SessionManager] = None,
+                 export_scheduler: Optional[ExportScheduler] = None,
+                 import_manager: Optional[ImportManager] = None,
+                 notification_dispatcher: Optional[NotificationDispatcher] = None):
         self.data_manager = data_manager
         self.export_manager = export_manager
+        # SessionManager defines __len__, so an empty one is falsy
+        self.session_manager = session_manager if session_manager is not None else SessionManager(data_manager)
+        self.export_scheduler = export_scheduler or ExportScheduler(export_manager)
+        self.import_manager = import_manager or ImportManager(data_manager)
+        self.notification_dispatcher = notification_dispatcher or NotificationDispatcher(data_manager)
         self.current_user: Optional[User] = None
+        self.session_token: Optional[str] = None
 
     def display_banner(self):
         """Display application banner"""
@@ -26,8 +41,10 @@ class CLIInterface:
         email = input("Email: ").strip()
         password = input("Password: ").strip()
 
-        user = self.data_manager.authenticate_user(email, password)
+        token = self.session_manager.login(email, password)
+        user = self.session_manager.resolve(token)
         if user:
+            self.session_token = token
             self.current_user = user
             print(f"\n{user._full_name} ({user.role})")
             return True
@@ -35,6 +52,15 @@ class CLIInterface:
             print("Invalid credentials!")
             return False
 
+    def check_session(self) -> bool:
+        """Check the session is still valid, logging out if it expired or was revoked"""
+        if self.session_manager.resolve(self.session_token) is not None:
+            return True
+        self.current_user = None
+        self.session_token = None
+        print(" Session expired, please log in again")
+        return False
+
     def register_user(self) -> bool:
         """Register new user (Admin only)"""
         if not self.current_user or self.current_user.role != "Admin":
@@ -71,7 +97,10 @@ class CLIInterface:
             print("Invalid role selection!")
             return False
 
-        self.data_manager.add_user(user)
+        if not self.data_manager.add_user(user):
+            print(f"Email {email} is already registered!")
+            return False
+
         print(f"User {full_name} registered successfully!")
         return True
 
@@ -84,15 +113,22 @@ class CLIInterface:
             print("1. Register New User")
             print("2. View All Users")
             print("3. Generate Reports")
-            print("4. Export Data (All Formats)")
+            print("4. Export Data (All Formats, in background)")
             print("5. Export to XLSX")
             print("6. Export to CSV")
             print("7. Export to SQL")
             print("8. View Export Log")
             print("9. System Statistics")
+            print("10. Export Changes Since Last Sync (Delta)")
+            print("11. Export to Parquet")
+            print("12. Background Export Jobs")
+            print("13. Bulk Import Users, Assignments and Grades")
+            print("14. Broadcast Notification")
             print("0. Logout")
 
             choice = input("\nSelect option: ").strip()
+            if not self.check_session():
+                return
 
             if choice == "1":
                 self.register_user()
@@ -101,11 +137,8 @@ class CLIInterface:
             elif choice == "3":
                 self.generate_reports()
             elif choice == "4":
-                print("Exporting to all formats...")
-                if self.export_manager.auto_export_all():
-                    print("All exports completed successfully!")
-                else:
-                    print("Some exports failed. Check logs for details.")
+                job_id = self.export_scheduler.run_now('all', name="All formats")
+                print(f"Export job {job_id} started in background. See option 12 for its status.")
             elif choice == "5":
                 filename = input("XLSX filename (default: eduplatform_data.xlsx): ").strip()
                 if not filename:
@@ -118,7 +151,11 @@ class CLIInterface:
                 directory = input("CSV directory (default: csv_exports): ").strip()
                 if not directory:
                     directory = "csv_exports"
-                if self.export_manager.export_to_csv(directory):
+                compression = input("Compression (none/gzip/zstd, default: none): ").strip().lower()
+                part_rows = input("Rows per part file (default: no splitting): ").strip()
+                if self.export_manager.export_to_csv(directory,
+                                                     compression=None if compression in ("", "none") else compression,
+                                                     max_rows_per_part=int(part_rows) if part_rows.isdigit() else None):
                     print(f"Data exported to {directory}/")
                 else:
                     print("CSV export failed!")
@@ -126,7 +163,8 @@ class CLIInterface:
                 filename = input("SQL filename (default: eduplatform_schema.sql): ").strip()
                 if not filename:
                     filename = "eduplatform_schema.sql"
-                if self.export_manager.export_to_sql(filename):
+                mode = input("Mode - INSERT batches or BULK INSERT data files (insert/bulk, default: insert): ").strip().lower()
+                if self.export_manager.export_to_sql(filename, mode=mode or "insert"):
                     print(f"SQL schema exported to {filename}")
                 else:
                     print("SQL export failed!")
@@ -134,6 +172,28 @@ class CLIInterface:
                 self.view_export_log()
             elif choice == "9":
                 self.show_system_statistics()
+            elif choice == "10":
+                directory = input("Delta directory (default: delta_exports): ").strip()
+                if not directory:
+                    directory = "delta_exports"
+                if self.export_manager.export_delta(directory):
+                    print(f"Changes exported to {directory}/")
+                else:
+                    print("Delta export failed!")
+            elif choice == "11":
+                directory = input("Parquet directory (default: parquet_exports): ").strip()
+                if not directory:
+                    directory = "parquet_exports"
+                if self.export_manager.export_to_parquet(directory):
+                    print(f"Data exported to {directory}/")
+                else:
+                    print("Parquet export failed! (requires pyarrow)")
+            elif choice == "12":
+                self.manage_export_jobs()
+            elif choice == "13":
+                self.bulk_import()
+            elif choice == "14":
+                self.broadcast_notification()
             elif choice == "0":
                 break
             else:
@@ -155,6 +215,8 @@ class CLIInterface:
             print("0. Logout")
 
             choice = input("\nSelect option: ").strip()
+            if not self.check_session():
+                return
 
             if choice == "1":
                 self.create_assignment()
@@ -186,6 +248,8 @@ class CLIInterface:
             print("0. Logout")
 
             choice = input("\nSelect option: ").strip()
+            if not self.check_session():
+                return
 
             if choice == "1":
                 self.view_student_grades()
@@ -218,6 +282,8 @@ class CLIInterface:
             print("0. Logout")
 
             choice = input("\nSelect option: ").strip()
+            if not self.check_session():
+                return
 
             if choice == "1":
                 self.view_children()
@@ -265,12 +331,13 @@ class CLIInterface:
             return
 
         assignment_id = self.current_user.create_assignment(
-            title, description, deadline_iso, subject, class_id, difficulty
+            title, description, deadline_iso, subject, class_id, difficulty,
+            assignment_id=self.data_manager.get_next_assignment_id()
         )
 
         # Store in data manager
         assignment = self.current_user.assignments[assignment_id]
-        self.data_manager.assignments[assignment_id] = assignment
+        self.data_manager.add_assignment(assignment)
 
         print(f"Assignment '{title}' created successfully! (ID: {assignment_id})")
 
@@ -316,7 +383,7 @@ class CLIInterface:
             grade = int(input("Enter grade (1-5): "))
             comment = input("Comment (optional): ").strip()
 
-            if self.current_user.grade_assignment(assignment_id, student_id, grade):
+            if self.data_manager.grade_assignment(self.current_user._id, assignment_id, student_id, grade, comment):
                 print(" Grade assigned successfully!")
             else:
                 print(" Failed to assign grade!")
@@ -339,8 +406,8 @@ class CLIInterface:
 
         for subject, grade_list in grades.items():
             if grade_list:
-                avg = sum(grade_list) / len(grade_list)
-                print(f"{subject}: {grade_list} (Average: {avg:.2f})")
+                avg = self.current_user.calculate_average_grade(subject)
+                print(f"{subject}: {list(grade_list)} (Average: {avg:.2f})")
             else:
                 print(f"{subject}: No grades yet")
 
@@ -351,24 +418,25 @@ class CLIInterface:
 
         print("\n Submit Assignment")
 
-        # Show available assignments
-        if not self.data_manager.assignments:
+        # Show available assignments for the student's class
+        assignments = {a.id: a for a in self.data_manager.get_assignments_by_class(self.current_user.grade)}
+        if not assignments:
             print("No assignments available.")
             return
 
         print("Available assignments:")
-        for assignment in self.data_manager.assignments.values():
+        for assignment in assignments.values():
             print(f"ID: {assignment.id} - {assignment.title} (Due: {assignment.deadline})")
 
         try:
             assignment_id = int(input("Enter assignment ID: "))
+            if assignment_id not in assignments:
+                print(" Assignment not found for your class!")
+                return
+
             content = input("Enter your assignment content: ").strip()
 
-            if self.current_user.submit_assignment(assignment_id, content):
-                # Also add to assignment submissions
-                if assignment_id in self.data_manager.assignments:
-                    assignment = self.data_manager.assignments[assignment_id]
-                    assignment.add_submission(self.current_user._id, content)
+            if self.data_manager.submit_assignment(self.current_user._id, assignment_id, content):
                 print(" Assignment submitted successfully!")
             else:
                 print(" Failed to submit assignment!")
@@ -413,6 +481,7 @@ class CLIInterface:
         print("1. User Statistics")
         print("2. Assignment Reports")
         print("3. Grade Analysis")
+        print("4. Upcoming Deadlines")
 
         choice = input("Select report type: ").strip()
 
@@ -422,6 +491,8 @@ class CLIInterface:
             self.show_assignment_reports()
         elif choice == "3":
             self.show_grade_analysis()
+        elif choice == "4":
+            self.show_upcoming_deadlines()
 
     def show_user_statistics(self):
         """Show user statistics"""
@@ -455,23 +526,41 @@ class CLIInterface:
             print(f"Completion Rate: {completion_rate:.1f}%")
             print(f"Grading Rate: {grading_rate:.1f}%")
 
+    def show_upcoming_deadlines(self, days: int = 7):
+        """Show assignments due in the next days, optionally for one class"""
+        class_id = input("Class ID (leave empty for all classes): ").strip() or None
+        now = datetime.now()
+        assignments = self.data_manager.get_assignments_due(now, now + timedelta(days=days), class_id)
+
+        print(f"\n Deadlines in the next {days} days")
+        if not assignments:
+            print("No upcoming deadlines.")
+            return
+
+        for assignment in assignments:
+            print(f"{assignment.deadline[:16]} - {assignment.class_id} - {assignment.subject}: {assignment.title}")
+
     def show_grade_analysis(self):
         """Show grade analysis"""
-        all_grades = []
-        for student in self.data_manager.students.values():
-            for grade_list in student.grades.values():
-                all_grades.extend(grade_list)
-
-        if all_grades:
-            avg_grade = sum(all_grades) / len(all_grades)
-            max_grade = max(all_grades)
-            min_grade = min(all_grades)
+        analytics = GradeAnalytics(self.data_manager.grade_store)
+        overall = analytics.summary()
 
+        if overall['count']:
             print(f"\n Grade Analysis")
-            print(f"Total Grades: {len(all_grades)}")
-            print(f"Average Grade: {avg_grade:.2f}")
-            print(f"Highest Grade: {max_grade}")
-            print(f"Lowest Grade: {min_grade}")
+            print(f"Total Grades: {overall['count']}")
+            print(f"Average Grade: {overall['mean']:.2f}")
+            print(f"Median Grade: {overall['median']:.1f}")
+            print(f"Standard Deviation: {overall['std']:.2f}")
+            print(f"Highest Grade: {overall['max']:.0f}")
+            print(f"Lowest Grade: {overall['min']:.0f}")
+
+            distribution = analytics.histogram()
+            print("Distribution: " + ", ".join(f"{value}: {count}" for value, count in distribution.items()))
+
+            print("\nBy subject:")
+            for subject, stats in analytics.summary(group_by='subject').items():
+                print(f"  {subject}: avg {stats['mean']:.2f}, median {stats['median']:.1f}, "
+                      f"std {stats['std']:.2f} ({stats['count']} grades)")
         else:
             print("No grades recorded yet.")
 
@@ -485,8 +574,9 @@ class CLIInterface:
         self.show_grade_analysis()
 
         # Additional statistics
-        total_notifications = sum(len(user._notifications) for user in self.data_manager.users.values())
-        print(f"\nTotal Notifications: {total_notifications}")
+        notifications = self.data_manager.notifications.stats()
+        print(f"\nTotal Notifications: {notifications['total']} ({notifications['unread']} unread, "
+              f"{notifications['recipients']} recipients)")
 
     def view_export_log(self):
         """View export operation log"""
@@ -497,9 +587,107 @@ class CLIInterface:
             print("No export operations logged yet.")
             return
 
-        for log_entry in self.export_manager.export_log[-10:]:  # Show last 10 entries
+        for log_entry in list(self.export_manager.export_log)[-10:]:  # Show last 10 entries
             status = "✅" if log_entry['success'] else "❌"
-            print(f"{status} {log_entry['timestamp'][:19]} - {log_entry['format']} - {log_entry['filename']}")
+            job_status = f" - job {log_entry['job_id']} {log_entry['status']}" if 'job_id' in log_entry else ""
+            print(f"{status} {log_entry['timestamp'][:19]} - {log_entry['format']} - {log_entry['filename']}{job_status}")
+            if 'seconds' not in log_entry:
+                continue
+
+            rate = f"{log_entry['rows_per_sec']:,} rows/s" if log_entry['rows_per_sec'] is not None else "-"
+            peak = f"{log_entry['peak_rss_mb']} MB" if log_entry['peak_rss_mb'] is not None else "-"
+            if log_entry.get('peak_rss_growth_mb') is not None:
+                peak += f" (+{log_entry['peak_rss_growth_mb']} MB)"
+            print(f"   {log_entry['rows']:,} rows, {log_entry['bytes'] / 1e6:.2f} MB in {log_entry['seconds']:.2f}s "
+                  f"({rate}), peak memory {peak}")
+            for table, figures in log_entry['tables'].items():
+                print(f"     {table}: {figures['rows']:,} rows, {figures['bytes'] / 1e6:.2f} MB, "
+                      f"{figures['seconds']:.2f}s")
+
+    def bulk_import(self):
+        """Import users, assignments and grades from an XLSX file or CSV directory"""
+        print("\n Bulk Import")
+        source = input("XLSX file or CSV directory (default: csv_exports): ").strip() or "csv_exports"
+        default_password = input("Password for users without one (blank: reject them): ").strip()
+        errors_file = input("Write rejected rows to (default: import_errors.csv): ").strip() or "import_errors.csv"
+
+        report = self.import_manager.import_data(source, default_password or None, errors_file)
+        if 'error' in report:
+            print(f"Import failed: {report['error']}")
+        for table, counts in report['tables'].items():
+            if counts['rows']:
+                print(f"{table}: {counts['imported']:,} of {counts['rows']:,} imported, {counts['failed']:,} rejected")
+        print(f"Finished in {report['seconds']:.1f}s")
+        for error in report['errors'][:10]:
+            print(f"  {error['location']}: {error['error']}")
+        if report['error_count'] > 10:
+            print(f"  ... {report['error_count'] - 10:,} more in {errors_file}")
+
+    def broadcast_notification(self):
+        """Queue a notification for a class, grade level, role or the whole school"""
+        print("\n Broadcast Notification")
+        for broadcast in self.notification_dispatcher.status()[-5:]:
+            print(f"#{broadcast['id']} {broadcast['audience']} - {broadcast['status']}, "
+                  f"{broadcast['delivered']:,}/{broadcast['recipients']:,} delivered")
+
+        target = input("Audience (class/grade/role/all, default: all): ").strip().lower() or "all"
+        value = None
+        if target == "class":
+            value = input("Class ID (e.g., 9-A): ").strip()
+        elif target == "grade":
+            value = input("Grade level (e.g., 9): ").strip()
+        elif target == "role":
+            value = input("Role (Student/Teacher/Parent/Admin): ").strip().capitalize()
+        roles_input = input("Only these roles (comma-separated, empty for everyone): ").strip()
+        roles = [role.strip().capitalize() for role in roles_input.split(",") if role.strip()]
+        message = input("Message: ").strip()
+        priority = "high" if input("High priority? (y/n): ").strip().lower() == "y" else "normal"
+        if not message:
+            print("Message cannot be empty!")
+            return
+
+        try:
+            broadcast = self.notification_dispatcher.broadcast(message, target, value, roles, priority)
+        except ValueError as e:
+            print(f"Invalid broadcast: {e}")
+            return
+        print(f"Broadcast {broadcast.id} queued for delivery")
+
+    def manage_export_jobs(self):
+        """Show, schedule and cancel background export jobs"""
+        print("\n Background Export Jobs")
+        print("-" * 60)
+        jobs = self.export_scheduler.status()
+        if not jobs:
+            print("No export jobs yet.")
+        for job in jobs:
+            print(f"#{job['id']} {job['name']} ({job['schedule']}) - {job['status']}, "
+                  f"runs: {job['runs']}, skipped: {job['coalesced']}, next: {job['next_run'] or '-'}")
+
+        print("\n1. Schedule Interval Export")
+        print("2. Schedule Cron Export")
+        print("3. Cancel Job")
+        print("0. Back")
+        choice = input("\nSelect option: ").strip()
+
+        try:
+            if choice in ("1", "2"):
+                export_type = input(f"Export type ({'/'.join(ExportScheduler.ACTIONS)}): ").strip().lower()
+                if choice == "1":
+                    minutes = float(input("Run every N minutes: ").strip())
+                    job_id = self.export_scheduler.schedule_interval(export_type, minutes * 60)
+                else:
+                    expression = input("Cron expression (min hour day month weekday): ").strip()
+                    job_id = self.export_scheduler.schedule_cron(export_type, expression)
+                print(f"Export job {job_id} scheduled")
+            elif choice == "3":
+                job_id = int(input("Job ID: ").strip())
+                if self.export_scheduler.cancel(job_id):
+                    print(f"Export job {job_id} cancelled")
+                else:
+                    print("Job not found or already cancelled!")
+        except ValueError as e:
+            print(f"Invalid input: {e}")
 
     def view_profile(self):
         """View current user profile"""
@@ -516,22 +704,27 @@ class CLIInterface:
 
     def view_notifications(self):
         """View user notifications"""
-        notifications = self.current_user.view_notifications()
+        user_id = self.current_user._id
+        total = self.data_manager.notifications.count(user_id)
+        unread = self.data_manager.notifications.unread_count(user_id)
 
-        print(f"\n Your Notifications ({len(notifications)})")
+        print(f"\n Your Notifications ({total}, {unread} unread)")
         print("-" * 50)
 
-        if not notifications:
+        if not total:
             print("No notifications.")
             return
 
-        for notif in notifications[-10:]:  # Show last 10
-            status = "🔴" if notif['priority'] == 'high' else "🔵"
-            read_status = "📖" if notif['is_read'] else "📫"
-            print(f"{status} {read_status} {notif['message']}")
-            print(f"   {notif['created_at'][:19]}")
+        shown = self.data_manager.get_notifications(user_id, limit=10)  # Show first 10, high priority first
+        for notif in shown:
+            status = "🔴" if notif.priority == 'high' else "🔵"
+            read_status = "📖" if notif.is_read else "📫"
+            print(f"{status} {read_status} {notif.message}")
+            print(f"   {notif.created_at[:19]}")
             print()
 
+        self.data_manager.mark_notifications_read(user_id, [notif.id for notif in shown if not notif.is_read])
+
     def view_children(self):
         """View parent's children"""
         if not isinstance(self.current_user, Parent):
@@ -579,8 +772,8 @@ class CLIInterface:
 
                 for subject, grades in student.grades.items():
                     if grades:
-                        avg = sum(grades) / len(grades)
-                        print(f"{subject}: {grades} (Average: {avg:.2f})")
+                        avg = student.calculate_average_grade(subject)
+                        print(f"{subject}: {list(grades)} (Average: {avg:.2f})")
                     else:
                         print(f"{subject}: No grades yet")
         except (ValueError, IndexError):
@@ -602,11 +795,12 @@ class CLIInterface:
         print(f"\n Available Assignments")
         print("-" * 50)
 
-        if not self.data_manager.assignments:
+        assignments = self.data_manager.get_assignments_by_class(self.current_user.grade)
+        if not assignments:
             print("No assignments available.")
             return
 
-        for assignment in self.data_manager.assignments.values():
+        for assignment in assignments:
             status = " Submitted" if assignment.id in self.current_user.assignments else " Not Submitted"
             print(f"ID: {assignment.id}")
             print(f"Title: {assignment.title}")
@@ -619,8 +813,9 @@ class CLIInterface:
         """Main application loop"""
         self.display_banner()
 
-        # Create sample data for demonstration
-        self.create_sample_data()
+        # Create sample data for demonstration on first start
+        if not self.data_manager.users:
+            self.create_sample_data()
 
         while True:
             if not self.current_user:
@@ -638,7 +833,7 @@ class CLIInterface:
                     break
                 else:
                     print(" Invalid option!")
-            else:
+            elif self.check_session():
                 # Route to appropriate menu based on user role
                 if self.current_user.role == "Admin":
                     self.admin_menu()
@@ -649,9 +844,12 @@ class CLIInterface:
                 elif self.current_user.role == "Parent":
                     self.parent_menu()
 
-                # Logout
-                self.current_user = None
-                print(" Logged out successfully!")
+                # Logout, unless the menu already did because the session ended
+                if self.session_token is not None:
+                    self.session_manager.revoke(self.session_token)
+                    self.current_user = None
+                    self.session_token = None
+                    print(" Logged out successfully!")
 
     def create_sample_data(self):
         """Create sample data for demonstration"""
@@ -668,8 +866,10 @@ class CLIInterface:
         # Create sample student
         student = Student(3, "Alice Adam", "alice@edu.com", "student123", "9-A")
         student.subjects = {"Mathematics": 2, "Physics": 2}
-        student.grades = {"Mathematics": [4, 5, 4], "Physics": [5, 4, 5]}
         self.data_manager.add_user(student)
+        for subject, values in {"Mathematics": [4, 5, 4], "Physics": [5, 4, 5]}.items():
+            for value in values:
+                self.data_manager.add_grade(student._id, subject, value, teacher._id)
 
         # Create sample parent
         parent = Parent(4, "Bob Adam", "bob@edu.com", "parent123")
@@ -682,8 +882,7 @@ class CLIInterface:
             (datetime.now() + timedelta(days=7)).isoformat(),
             "CS", 2, "9-A", "medium"
         )
-        self.data_manager.assignments[1] = assignment
-        teacher.assignments[1] = assignment
+        self.data_manager.add_assignment(assignment)
 
         print("Sample login credentials:")
         print("Admin: admin@edu.com / admin123")
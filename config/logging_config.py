@@ -1,11 +1,109 @@
+import json
 import logging
+import logging.handlers
+import queue
+from datetime import datetime, timezone
+from typing import Dict, Optional, Union
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('eduplatform.log'),
-        logging.StreamHandler()
-    ]
-)
\ No newline at end of file
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_DEFAULT_SRCFILE = logging._srcfile  # Restored when fast_records is off
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line
+
+    Fields passed through `extra` are added to the object, so a call like
+    logger.info("Export done", extra={'rows': n}) stays machine-readable.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        cached = record.__dict__.get('_json')
+        if cached is not None:
+            return cached  # RotatingFileHandler formats once for its size check and again to write
+
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_FIELDS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        record._json = json.dumps(entry, default=str, ensure_ascii=False)
+        return record._json
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread
+
+    The stock handler renders the message in the caller before queueing it;
+    this one queues the record untouched, so the caller only pays for record
+    creation and a queue put. Log arguments are rendered later, so pass values
+    that are not mutated afterwards.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _apply_levels(level: Union[int, str], levels: Optional[Dict[str, Union[int, str]]]) -> None:
+    """Set the root level and any per-module overrides"""
+    logging.getLogger().setLevel(level)
+    for name, module_level in (levels or {}).items():
+        logging.getLogger(name).setLevel(module_level)
+
+
+def setup_logging(mode: str = "basic", path: str = 'eduplatform.log', level: Union[int, str] = logging.INFO,
+                  levels: Optional[Dict[str, Union[int, str]]] = None, max_bytes: int = 10 * 1024 * 1024,
+                  backup_count: int = 5, console_level: Union[int, str] = logging.WARNING,
+                  fast_records: bool = False) -> Optional[logging.handlers.QueueListener]:
+    """Configure application logging
+
+    "basic" writes text synchronously to the log file and the console.
+    "queue" puts records on an in-memory queue drained by a QueueListener
+    thread that writes JSON lines to a size-rotated file and console_level
+    messages and above to the console; the started listener is returned and
+    must be stopped on exit to flush it. levels maps logger names (modules
+    or packages such as 'models') to their own level. fast_records turns off
+    the caller file/line and process lookups for every record in the process
+    (pathname, lineno, funcName and process fields are left unset); every
+    call without it restores the defaults.
+    """
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+
+    # Documented switches; _srcfile = None disables findCaller()
+    logging._srcfile = None if fast_records else _DEFAULT_SRCFILE
+    logging.logProcesses = logging.logMultiprocessing = not fast_records
+
+    if mode == "basic":
+        logging.basicConfig(level=level, format=TEXT_FORMAT,
+                            handlers=[logging.FileHandler(path), logging.StreamHandler()])
+        _apply_levels(level, levels)
+        return None
+    if mode != "queue":
+        raise ValueError(f"Unknown logging mode: {mode}")
+
+    file_handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count,
+                                                        encoding='utf-8')
+    file_handler.setFormatter(JsonFormatter())
+    console = logging.StreamHandler()
+    console.setLevel(console_level)
+    console.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    records: 'queue.SimpleQueue[logging.LogRecord]' = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(records, file_handler, console, respect_handler_level=True)
+    root.addHandler(LazyQueueHandler(records))
+    _apply_levels(level, levels)
+    listener.start()
+    return listener
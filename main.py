@@ -1,15 +1,30 @@
 from cli.interface import CLIInterface
+from config.logging_config import setup_logging
 from managers.data_manager import DataManager
 from managers.export_manager import ExportManager
+from managers.export_scheduler import ExportScheduler
+from managers.hashing_pool import HashingPool
+from managers.notification_dispatcher import NotificationDispatcher
+from managers.storage import JournalStorage
 import logging
+import os
 
 def main():
     """Main function to run the EduPlatform CLI"""
+    log_listener = setup_logging(mode="queue")  # JSON lines to eduplatform.log, written off the caller thread
+    data_manager = None
+    export_manager = None
+    export_scheduler = None
+    notification_dispatcher = None
     try:
         # Initialize core components
-        data_manager = DataManager()
-        export_manager = ExportManager(data_manager)
-        cli = CLIInterface(data_manager, export_manager)
+        data_manager = DataManager(storage=JournalStorage("eduplatform_data"),
+                                   hashing_pool=HashingPool())
+        export_manager = ExportManager(data_manager, log_path=os.path.join("eduplatform_data", "export_log.jsonl"))
+        export_scheduler = ExportScheduler(export_manager)
+        notification_dispatcher = NotificationDispatcher(data_manager)
+        cli = CLIInterface(data_manager, export_manager, export_scheduler=export_scheduler,
+                           notification_dispatcher=notification_dispatcher)
 
         # Run the application
         cli.run()
@@ -17,8 +32,18 @@ def main():
     except KeyboardInterrupt:
         print("\n\nGoodbye!")
     except Exception as e:
-        logging.error(f"Application error: {e}")
+        logging.error("Application error: %s", e)
         print(f"An error occurred: {e}")
+    finally:
+        if export_scheduler is not None:
+            export_scheduler.shutdown()  # Let running exports finish before closing storage
+        if export_manager is not None:
+            export_manager.shutdown()  # Stop the XLSX worker process
+        if notification_dispatcher is not None:
+            notification_dispatcher.shutdown()  # Deliver queued broadcasts before closing storage
+        if data_manager is not None:
+            data_manager.close()
+        log_listener.stop()  # Flush queued log records
 
 
 if __name__ == "__main__":
@@ -0,0 +1,82 @@
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# ChangeTracker class content
+
+Watermark = Dict[str, object]  # {'epoch': str, 'version': int}
+
+
+class ChangeTracker:
+    """Version counter and latest change per exported row
+
+    Every change gets the next version number. Only the latest change of
+    each (table, key) is kept, in an OrderedDict ordered by version, so
+    changes_since() walks back from the newest entry and costs O(changes)
+    rather than O(rows). Watermarks carry the epoch they were taken in; a
+    watermark from another epoch cannot be used for a delta. The epoch,
+    version and change list are kept by storage (see to_record/restore), so
+    a restart only starts a new epoch when the storage cannot restore them.
+    """
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex
+        self._version = 0
+        self.recording = True  # Turned off while state is rebuilt from storage
+        # {(table, key): (version, deleted)}, oldest change first
+        self._changes: 'OrderedDict[Tuple[str, int], Tuple[int, bool]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        """Version of the latest change"""
+        return self._version
+
+    def mark(self, table: str, key: int, deleted: bool = False) -> None:
+        """Record that a row was inserted/updated or deleted"""
+        if not self.recording:
+            return
+        with self._lock:
+            self._version += 1
+            self._changes.pop((table, key), None)
+            self._changes[(table, key)] = (self._version, deleted)
+
+    def watermark(self) -> Watermark:
+        """Position marking everything recorded so far"""
+        return {'epoch': self.epoch, 'version': self._version}
+
+    def is_current(self, watermark: Optional[Watermark]) -> bool:
+        """Check whether a watermark was taken by this tracker
+
+        A watermark ahead of the current version was taken before a crash
+        lost the changes after it, so it cannot be used either.
+        """
+        return (watermark is not None and watermark.get('epoch') == self.epoch
+                and watermark.get('version', 0) <= self._version)
+
+    def to_record(self) -> Dict[str, Any]:
+        """Serialize epoch, version and changes for persistent storage"""
+        with self._lock:
+            return {'epoch': self.epoch, 'version': self._version,
+                    'changes': [[table, key, version, deleted]
+                                for (table, key), (version, deleted) in self._changes.items()]}
+
+    def restore(self, record: Dict[str, Any]) -> None:
+        """Continue the epoch of a stored record instead of the current one"""
+        with self._lock:
+            self.epoch = record['epoch']
+            self._version = record['version']
+            self._changes = OrderedDict(((table, key), (version, deleted))
+                                        for table, key, version, deleted in record.get('changes', ()))
+
+    def changes_since(self, version: int) -> Dict[str, Tuple[List[int], List[int]]]:
+        """Get {table: (upserted keys, deleted keys)} changed after version"""
+        changes: Dict[str, Tuple[List[int], List[int]]] = {}
+        with self._lock:
+            for (table, key), (changed_at, deleted) in reversed(self._changes.items()):
+                if changed_at <= version:
+                    break  # Everything older was already exported
+                upserted, removed = changes.setdefault(table, ([], []))
+                (removed if deleted else upserted).append(key)
+        return changes
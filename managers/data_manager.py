@@ -1,13 +1,76 @@
-from typing import Dict, Optional
+import threading
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+import logging
 from models.users import User, Student, Teacher, Parent, Admin
 from models.entities import Assignment, Grade, Schedule, Notification
+from managers.storage import Storage
+from managers.change_tracker import ChangeTracker
+from managers.hashing_pool import HashingPool
+from managers.grade_analytics import GradeStore
+from managers.notification_store import NotificationStore
+from managers.timetable_index import TimetableIndex
+
+logger = logging.getLogger(__name__)
 
 # DataManager class content
 
+class IdAllocator:
+    """Thread-safe monotonically increasing ID source"""
+
+    def __init__(self, start: int = 1):
+        self._next = start
+        self._lock = threading.Lock()
+
+    def allocate(self) -> int:
+        """Get next unused ID"""
+        with self._lock:
+            current_id = self._next
+            self._next += 1
+            return current_id
+
+    def reserve(self, used_id: int) -> None:
+        """Make sure an explicitly assigned ID is never handed out"""
+        with self._lock:
+            if used_id >= self._next:
+                self._next = used_id + 1
+
+    @property
+    def next_value(self) -> int:
+        """ID the next allocate() call will return"""
+        return self._next
+
+
+def _mutation(method):
+    """Run pending journal compaction once the outermost mutation has released its locks"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._local.depth = getattr(self._local, 'depth', 0) + 1
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._local.depth -= 1
+            if self._local.depth == 0 and self._snapshot_due:
+                self.create_snapshot()
+    return wrapper
+
+
 class DataManager:
-    """Manages in-memory data storage and operations"""
+    """Manages in-memory data storage and operations
 
-    def __init__(self):
+    Safe for concurrent use: every collection group has its own lock, taken in
+    the order users, assignments, schedules, grades, notifications, storage.
+    The schedules lock guards schedules and the timetable index. Hot lookups
+    (get_user_by_email, authenticate_user, dict gets) take no lock; they rely on
+    single dict operations being atomic.
+    """
+
+    USER_TYPES = {'Student': Student, 'Teacher': Teacher, 'Parent': Parent, 'Admin': Admin}
+
+    def __init__(self, storage: Optional[Storage] = None, hashing_pool: Optional[HashingPool] = None):
         self.users: Dict[int, User] = {}
         self.students: Dict[int, Student] = {}
         self.teachers: Dict[int, Teacher] = {}
@@ -16,40 +79,853 @@ class DataManager:
         self.assignments: Dict[int, Assignment] = {}
         self.grades: Dict[int, Grade] = {}
         self.schedules: Dict[int, Schedule] = {}
-        self.notifications: Dict[int, Notification] = {}
-        self._next_id = 1
+        self.timetable = TimetableIndex()  # Lessons by teacher, class and day for conflict checks
+        self.notifications = NotificationStore()  # Every user's notifications by recipient
+        self.grade_store = GradeStore()  # Columnar copy of grades for analytics
+        self.changes = ChangeTracker()  # Changed export rows for delta exports
+        self._users_by_email: Dict[str, User] = {}  # {normalized email: user}
+        self._students_by_class: Dict[str, Dict[int, Student]] = {}
+        self._teachers_by_class: Dict[str, Dict[int, Teacher]] = {}
+        self._parents_by_child: Dict[int, Dict[int, Parent]] = {}  # {student_id: {parent_id: parent}}
+        self._assignments_by_class: Dict[str, Dict[int, Assignment]] = {}
+        self._assignments_by_teacher: Dict[int, Dict[int, Assignment]] = {}
+        self._assignments_by_subject: Dict[str, Dict[int, Assignment]] = {}
+        self._deadline_index: List[Tuple[str, int]] = []  # sorted [(deadline, assignment_id)]
+        self._class_deadline_index: Dict[str, List[Tuple[str, int]]] = {}
+        self._user_ids = IdAllocator()
+        self._assignment_ids = IdAllocator()
+        self._grade_ids = IdAllocator()
+        self._users_lock = threading.RLock()
+        self._assignments_lock = threading.RLock()
+        self._schedules_lock = threading.RLock()
+        self._grades_lock = threading.RLock()
+        self._notifications_lock = threading.RLock()
+        self._storage_lock = threading.RLock()
+        self._local = threading.local()
+        self._revocation_listeners: List[Callable[[int], None]] = []
+        self._snapshot_due = False
+        self.storage = storage
+        self.hashing_pool = hashing_pool  # Runs password verification off the caller thread
+        self._replaying = False
+
+        if self.storage is not None:
+            self._load_from_storage()
+
+    @staticmethod
+    def _normalize_email(email: str) -> str:
+        """Normalize email for case-insensitive lookups"""
+        return email.strip().lower()
 
     def get_next_id(self) -> int:
         """Get next available ID"""
-        current_id = self._next_id
-        self._next_id += 1
-        return current_id
+        return self._user_ids.allocate()
 
+    @_mutation
     def add_user(self, user: User) -> bool:
         """Add user to appropriate storage"""
-        self.users[user._id] = user
+        email_key = self._normalize_email(user._email)
+        with self._users_lock:
+            if email_key in self._users_by_email or user._id in self.users:
+                return False  # Email or ID already registered
+
+            self.users[user._id] = user
+            self._users_by_email[email_key] = user
+            self._user_ids.reserve(user._id)
+
+            if isinstance(user, Student):
+                self.students[user._id] = user
+            elif isinstance(user, Teacher):
+                self.teachers[user._id] = user
+            elif isinstance(user, Parent):
+                self.parents[user._id] = user
+            elif isinstance(user, Admin):
+                self.admins[user._id] = user
+            self._index_user(user)
+
+            self._record('user.add', user.to_record())
+            self._mark_user(user)
+        return True
+
+    @_mutation
+    def add_users(self, users: List[User]) -> List[bool]:
+        """Add many users with one lock acquisition and one storage commit"""
+        with self.bulk(), self._users_lock:
+            return [self.add_user(user) for user in users]
 
+    @_mutation
+    def remove_user(self, user_id: int) -> bool:
+        """Remove user from all storages"""
+        with self._users_lock:
+            user = self.users.pop(user_id, None)
+            if user is None:
+                return False
+
+            self._users_by_email.pop(self._normalize_email(user._email), None)
+            for storage in (self.students, self.teachers, self.parents, self.admins):
+                storage.pop(user_id, None)
+            self._unindex_user(user)
+            if isinstance(user, Teacher):
+                with self._schedules_lock:
+                    self._remove_teacher_lessons(user_id)
+            with self._notifications_lock:
+                self.notifications.remove_recipient(user_id)
+
+            self._record('user.remove', {'id': user_id})
+            self._mark_user(user, deleted=True)
+            self._revoke_credentials(user_id)
+        return True
+
+    def _remove_teacher_lessons(self, teacher_id: int) -> None:
+        """Drop a removed teacher's lessons from schedules and the timetable (caller holds the schedules lock)"""
+        for schedule_id in {lesson[5] for lesson in self.timetable.teacher_lessons(teacher_id)}:
+            schedule = self.schedules[schedule_id]
+            for time in [time for time, lesson in schedule.lessons.items() if lesson['teacher_id'] == teacher_id]:
+                schedule.remove_lesson(time)
+                self.timetable.remove(schedule.class_id, schedule.day, time)
+
+    @_mutation
+    def update_user_email(self, user_id: int, new_email: str) -> bool:
+        """Change user email keeping the email index consistent"""
+        with self._users_lock:
+            user = self.users.get(user_id)
+            if user is None:
+                return False
+
+            if not self._email_available(user, new_email):
+                return False  # Email already taken by another user
+
+            self._set_email(user, new_email)
+            self._record('user.email', {'id': user_id, 'email': user._email})
+            self.changes.mark('users', user_id)
+        return True
+
+    def _email_available(self, user: User, email: str) -> bool:
+        """Check that no other user is registered with email"""
+        owner = self._users_by_email.get(self._normalize_email(email))
+        return owner is None or owner is user
+
+    def _set_email(self, user: User, email: str) -> None:
+        """Change user email and move its email index entry (caller holds the users lock)"""
+        self._users_by_email.pop(self._normalize_email(user._email), None)
+        user._email = email.strip()
+        self._users_by_email[self._normalize_email(email)] = user
+
+    def change_password(self, user_id: int, new_password: str) -> bool:
+        """Set a new password and revoke the user's open sessions"""
+        user = self.users.get(user_id)
+        if user is None:
+            return False
+
+        # Hash before taking any lock, key derivation is deliberately slow
+        if self.hashing_pool is not None:
+            password_hash = self.hashing_pool.hash(new_password)
+        else:
+            password_hash = user._hash_password(new_password)
+        if password_hash is None or not self._set_password_hash(user_id, password_hash):
+            return False
+
+        self._revoke_credentials(user_id)
+        logger.info("Password changed for user %s", user_id)
+        return True
+
+    def _mark_user(self, user: User, deleted: bool = False) -> None:
+        """Record change of a user's export rows"""
+        self.changes.mark('users', user._id, deleted)
         if isinstance(user, Student):
-            self.students[user._id] = user
+            self.changes.mark('students', user._id, deleted)
         elif isinstance(user, Teacher):
-            self.teachers[user._id] = user
+            self.changes.mark('teachers', user._id, deleted)
+
+    def add_revocation_listener(self, listener: Callable[[int], None]) -> None:
+        """Register callback run with a user ID when their credentials stop being valid"""
+        self._revocation_listeners.append(listener)
+
+    def _revoke_credentials(self, user_id: int) -> None:
+        """Notify listeners (e.g. session stores) that a user's logins are revoked"""
+        for listener in self._revocation_listeners:
+            listener(user_id)
+
+    @_mutation
+    def _set_password_hash(self, user_id: int, password_hash: str) -> bool:
+        """Store a new password hash for a user"""
+        with self._users_lock:
+            user = self.users.get(user_id)
+            if user is None:
+                return False
+
+            user._password_hash = password_hash
+            self._record('user.password', {'id': user_id, 'password_hash': password_hash})
+            self.changes.mark('users', user_id)
+        return True
+
+    @_mutation
+    def update_user_profile(self, user_id: int, **kwargs) -> bool:
+        """Update user profile, including email changes
+
+        Every field is validated before any is applied, and the whole update
+        is journaled as one record, so it is applied completely or not at all.
+        """
+        with self._users_lock:
+            user = self.users.get(user_id)
+            if user is None:
+                return False
+
+            fields = dict(kwargs)
+            email = fields.pop('email', None)
+            if email is not None and not self._email_available(user, email):
+                return False  # Email already taken by another user
+            if any(key.startswith('_') or not hasattr(user, key) for key in fields):
+                return False  # Not a profile field of this user
+
+            self._unindex_user(user)  # Class, classes or children may change
+            try:
+                if not user.update_profile(**fields):
+                    return False
+            finally:
+                self._index_user(user)
+            if email is not None:
+                self._set_email(user, email)
+                fields['email'] = user._email
+
+            self._record('user.update', {'id': user_id, 'fields': fields})
+            self._mark_user(user)
+        return True
+
+    def _index_user(self, user: User) -> None:
+        """Register user in the class and parent indexes used to resolve recipients"""
+        if isinstance(user, Student):
+            self._students_by_class.setdefault(user.grade, {})[user._id] = user
+        elif isinstance(user, Teacher):
+            for class_id in user.classes:
+                self._teachers_by_class.setdefault(class_id, {})[user._id] = user
         elif isinstance(user, Parent):
-            self.parents[user._id] = user
-        elif isinstance(user, Admin):
-            self.admins[user._id] = user
+            for child_id in user.children:
+                self._parents_by_child.setdefault(child_id, {})[user._id] = user
+
+    def _unindex_user(self, user: User) -> None:
+        """Drop user from the class and parent indexes"""
+        if isinstance(user, Student):
+            self._discard_from_index(self._students_by_class, user.grade, user._id)
+        elif isinstance(user, Teacher):
+            for class_id in user.classes:
+                self._discard_from_index(self._teachers_by_class, class_id, user._id)
+        elif isinstance(user, Parent):
+            for child_id in user.children:
+                self._discard_from_index(self._parents_by_child, child_id, user._id)
+
+    def get_students_by_class(self, class_id: str) -> List[Student]:
+        """Get students enrolled in a class"""
+        return list(self._students_by_class.get(class_id, {}).values())
+
+    def get_recipients(self, target: str, value: Optional[str] = None,
+                       roles: Optional[Iterable[str]] = None) -> List[int]:
+        """Resolve a broadcast target to sorted user IDs
+
+        target is "class" (value: class ID such as "9-A"), "grade" (value:
+        level such as "9", every class "9-*"), "role" (value: role name) or
+        "all". Class and grade audiences are their students, the teachers of
+        those classes and the students' parents; roles narrows any audience.
+        """
+        roles = set(roles) if roles else None
+        with self._users_lock:
+            if target == "all":
+                audience: Iterable[int] = self.users
+            elif target == "role":
+                storages = {'Student': self.students, 'Teacher': self.teachers,
+                            'Parent': self.parents, 'Admin': self.admins}
+                if value not in storages:
+                    raise ValueError(f"Unknown role: {value}")
+                audience = storages[value]
+            elif target in ("class", "grade"):
+                if target == "class":
+                    class_ids = [value] if value in self._students_by_class or value in self._teachers_by_class else []
+                else:
+                    class_ids = [class_id for class_id in set(self._students_by_class) | set(self._teachers_by_class)
+                                 if class_id.split("-", 1)[0] == value]
+                members: Set[int] = set()
+                for class_id in class_ids:
+                    students = self._students_by_class.get(class_id, {})
+                    members.update(students)
+                    members.update(self._teachers_by_class.get(class_id, {}))
+                    for student_id in students:
+                        members.update(self._parents_by_child.get(student_id, ()))
+                audience = members
+            else:
+                raise ValueError(f"Unknown broadcast target: {target}")
+
+            if roles is None:
+                return sorted(audience)
+            return sorted(user_id for user_id in audience if self.users[user_id].role in roles)
+
+    def get_next_assignment_id(self) -> int:
+        """Get next available assignment ID"""
+        return self._assignment_ids.allocate()
+
+    @_mutation
+    def add_assignment(self, assignment: Assignment) -> bool:
+        """Add assignment and register it in secondary indexes"""
+        with self._assignments_lock:
+            if assignment.id in self.assignments:
+                return False
+
+            self.assignments[assignment.id] = assignment
+            self._assignment_ids.reserve(assignment.id)
+            self._index_assignment(assignment)
+
+            teacher = self.teachers.get(assignment.teacher_id)
+            if teacher is not None:
+                teacher.assignments.setdefault(assignment.id, assignment)
+
+            self._record('assignment.add', assignment.to_record())
+            self.changes.mark('assignments', assignment.id)
+        return True
+
+    @_mutation
+    def add_assignments(self, assignments: List[Assignment]) -> List[bool]:
+        """Add many assignments with one lock acquisition and one storage commit"""
+        with self.bulk(), self._assignments_lock:
+            return [self.add_assignment(assignment) for assignment in assignments]
+
+    def _index_assignment(self, assignment: Assignment) -> None:
+        """Register assignment in secondary indexes"""
+        self._assignments_by_class.setdefault(assignment.class_id, {})[assignment.id] = assignment
+        self._assignments_by_teacher.setdefault(assignment.teacher_id, {})[assignment.id] = assignment
+        self._assignments_by_subject.setdefault(assignment.subject, {})[assignment.id] = assignment
+
+        entry = (self._deadline_key(assignment.deadline), assignment.id)
+        insort(self._deadline_index, entry)
+        insort(self._class_deadline_index.setdefault(assignment.class_id, []), entry)
+
+    @_mutation
+    def remove_assignment(self, assignment_id: int) -> bool:
+        """Remove assignment and drop it from secondary indexes"""
+        with self._assignments_lock:
+            assignment = self.assignments.pop(assignment_id, None)
+            if assignment is None:
+                return False
+
+            self._unindex_assignment(assignment)
+            self._record('assignment.remove', {'id': assignment_id})
+            self.changes.mark('assignments', assignment_id, deleted=True)
+        return True
+
+    def _unindex_assignment(self, assignment: Assignment) -> None:
+        """Drop assignment from secondary indexes"""
+        assignment_id = assignment.id
+        self._discard_from_index(self._assignments_by_class, assignment.class_id, assignment_id)
+        self._discard_from_index(self._assignments_by_teacher, assignment.teacher_id, assignment_id)
+        self._discard_from_index(self._assignments_by_subject, assignment.subject, assignment_id)
+
+        entry = (self._deadline_key(assignment.deadline), assignment.id)
+        self._discard_sorted(self._deadline_index, entry)
+        class_deadlines = self._class_deadline_index.get(assignment.class_id)
+        if class_deadlines is not None:
+            self._discard_sorted(class_deadlines, entry)
+            if not class_deadlines:
+                del self._class_deadline_index[assignment.class_id]
+
+    @staticmethod
+    def _deadline_key(deadline: Union[str, datetime]) -> str:
+        """Deadline as a fixed-precision ISO string, so "2025-01-10" and "2025-01-10T00:00:00" sort equal"""
+        try:
+            if not isinstance(deadline, datetime):
+                deadline = datetime.fromisoformat(deadline)
+            return deadline.isoformat(timespec='microseconds')
+        except ValueError:
+            return deadline  # Not ISO; sorts as given
+
+    @staticmethod
+    def _discard_from_index(index: Dict, key, entity_id: int) -> None:
+        """Remove an assignment or user from a key -> {id: entity} index"""
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(entity_id, None)
+            if not bucket:
+                del index[key]
 
+    @staticmethod
+    def _discard_sorted(entries: List[Tuple[str, int]], entry: Tuple[str, int]) -> None:
+        """Remove entry from a sorted list"""
+        position = bisect_left(entries, entry)
+        if position < len(entries) and entries[position] == entry:
+            del entries[position]
+
+    def get_assignments_by_class(self, class_id: str) -> List[Assignment]:
+        """Get assignments given to a class"""
+        return list(self._assignments_by_class.get(class_id, {}).values())
+
+    def get_assignments_by_teacher(self, teacher_id: int) -> List[Assignment]:
+        """Get assignments created by a teacher"""
+        return list(self._assignments_by_teacher.get(teacher_id, {}).values())
+
+    def get_assignments_by_subject(self, subject: str) -> List[Assignment]:
+        """Get assignments for a subject"""
+        return list(self._assignments_by_subject.get(subject, {}).values())
+
+    def get_assignments_due(self, start: Union[str, datetime], end: Union[str, datetime],
+                            class_id: Optional[str] = None) -> List[Assignment]:
+        """Get assignments with deadline in [start, end], ordered by deadline"""
+        start = self._deadline_key(start)
+        end = self._deadline_key(end)
+
+        with self._assignments_lock:
+            if class_id is None:
+                entries = self._deadline_index
+            else:
+                entries = self._class_deadline_index.get(class_id, [])
+
+            # Assignment IDs are positive, so (start, 0) sorts before any deadline equal to start
+            low = bisect_left(entries, (start, 0))
+            high = bisect_right(entries, (end, float('inf')))
+            return [self.assignments[assignment_id] for _, assignment_id in entries[low:high]]
+
+    @_mutation
+    def add_schedule(self, schedule: Schedule) -> bool:
+        """Register a class timetable day unless a lesson clashes with the class's or teacher's other lessons"""
+        with self._schedules_lock:
+            if schedule.id in self.schedules:
+                return False
+
+            indexed = []
+            for time, lesson in schedule.lessons.items():
+                try:
+                    added = self.timetable.add(schedule.id, schedule.class_id, schedule.day, time,
+                                               lesson['subject'], lesson['teacher_id'],
+                                               lesson.get('duration', Schedule.LESSON_MINUTES))
+                except ValueError:
+                    added = False
+                if not added:
+                    for indexed_time in indexed:
+                        self.timetable.remove(schedule.class_id, schedule.day, indexed_time)
+                    return False
+                indexed.append(time)
+
+            self.schedules[schedule.id] = schedule
+            self._record('schedule.add', schedule.to_record())
+        return True
+
+    @_mutation
+    def add_lesson(self, schedule_id: int, time: str, subject: str, teacher_id: int,
+                   duration: int = Schedule.LESSON_MINUTES) -> bool:
+        """Add lesson to a registered schedule if the class and the teacher are free"""
+        with self._schedules_lock:
+            schedule = self.schedules.get(schedule_id)
+            if schedule is None or time in schedule.lessons:
+                return False
+            try:
+                if not self.timetable.add(schedule_id, schedule.class_id, schedule.day, time,
+                                          subject, teacher_id, duration):
+                    return False
+            except ValueError:
+                return False
+            schedule.add_lesson(time, subject, teacher_id, duration)
+            self._record('schedule.lesson.add', {'schedule_id': schedule_id, 'time': time, 'subject': subject,
+                                                 'teacher_id': teacher_id, 'duration': duration})
+        return True
+
+    @_mutation
+    def remove_lesson(self, schedule_id: int, time: str) -> bool:
+        """Remove lesson from a registered schedule"""
+        with self._schedules_lock:
+            schedule = self.schedules.get(schedule_id)
+            if schedule is None or not schedule.remove_lesson(time):
+                return False
+            self.timetable.remove(schedule.class_id, schedule.day, time)
+            self._record('schedule.lesson.remove', {'schedule_id': schedule_id, 'time': time})
+        return True
+
+    def where_is_teacher(self, teacher_id: int, day: str, time: str) -> Optional[Dict[str, Any]]:
+        """Lesson a teacher is giving at a time, None if free"""
+        with self._schedules_lock:
+            lesson = self.timetable.where_is(teacher_id, day, time)
+        if lesson is None:
+            return None
+        start, end, class_id, _, subject, schedule_id = lesson
+        return {'class_id': class_id, 'subject': subject, 'start': f"{start // 60:02d}:{start % 60:02d}",
+                'end': f"{end // 60:02d}:{end % 60:02d}", 'schedule_id': schedule_id}
+
+    def get_free_classes(self, day: str, time: str) -> List[str]:
+        """Classes with no lesson at a time"""
+        with self._users_lock, self._schedules_lock:
+            classes = set(self._students_by_class) | set(self._teachers_by_class) | self.timetable.classes
+            return self.timetable.free_classes(day, time, classes)
+
+    def get_free_teachers(self, day: str, time: str, subject: Optional[str] = None) -> List[int]:
+        """Teachers (optionally of a subject) not teaching at a time"""
+        with self._users_lock, self._schedules_lock:
+            teachers = [teacher_id for teacher_id, teacher in self.teachers.items()
+                        if subject is None or subject in teacher.subjects]
+            return self.timetable.free_teachers(day, time, teachers)
+
+    @_mutation
+    def submit_assignment(self, student_id: int, assignment_id: int, content: str) -> bool:
+        """Record student submission for an assignment"""
+        student = self.students.get(student_id)
+        if student is None:
+            return False
+
+        with self._assignments_lock:
+            assignment = self.assignments.get(assignment_id)
+            if assignment is None:
+                return False
+
+            if not student.submit_assignment(assignment_id, content):
+                return False
+            if not assignment.add_submission(student_id, content):
+                del student.assignments[assignment_id]  # Deadline has passed
+                return False
+
+            self._record('submission', {'student_id': student_id, 'assignment_id': assignment_id, 'content': content})
+            self.changes.mark('assignments', assignment_id)
+        return True
+
+    @_mutation
+    def grade_assignment(self, teacher_id: int, assignment_id: int, student_id: int,
+                         value: int, comment: str = "") -> bool:
+        """Grade a submission and record the grade for the student"""
+        teacher = self.teachers.get(teacher_id)
+        if teacher is None or student_id not in self.students or not 1 <= value <= 5:
+            return False
+
+        with self._assignments_lock:
+            if not teacher.grade_assignment(assignment_id, student_id, value):
+                return False
+            assignment = teacher.assignments[assignment_id]
+
+            self._record('assignment.grade', {'assignment_id': assignment_id, 'student_id': student_id, 'value': value})
+            self.changes.mark('assignments', assignment_id)
+            return self.add_grade(student_id, assignment.subject, value, teacher_id, comment) is not None
+
+    @_mutation
+    def add_grade(self, student_id: int, subject: str, value: int,
+                  teacher_id: int, comment: str = "", date: Optional[str] = None) -> Optional[Grade]:
+        """Record a grade for a student, dated now unless an ISO date is given"""
+        if student_id not in self.students or not 1 <= value <= 5:
+            return None
+
+        with self._grades_lock:
+            grade = Grade(self._grade_ids.allocate(), student_id, subject, value, teacher_id, comment)
+            if date:
+                grade.date = date
+            self._store_grade(grade)
+            self._record('grade.add', grade.get_grade_info())
+        return grade
+
+    @_mutation
+    def add_grades(self, grades: List[Tuple[int, str, int, int, str, Optional[str]]]) -> List[Optional[Grade]]:
+        """Record many (student_id, subject, value, teacher_id, comment, date) grades in one storage commit"""
+        with self.bulk(), self._grades_lock:
+            return [self.add_grade(*grade) for grade in grades]
+
+    @_mutation
+    def update_grade(self, grade_id: int, value: int) -> bool:
+        """Change a recorded grade and the student's aggregates"""
+        with self._grades_lock:
+            grade = self.grades.get(grade_id)
+            if grade is None:
+                return False
+
+            old_value = grade.value
+            if not grade.update_grade(value):
+                return False
+
+            student = self.students.get(grade.student_id)
+            if student is not None:
+                student.update_grade(grade.subject, old_value, value)
+                self.changes.mark('students', student._id)
+            self.grade_store.update(grade_id, value)
+
+            self._record('grade.update', {'id': grade_id, 'value': value})
         return True
 
+    def _store_grade(self, grade: Grade) -> None:
+        """Register grade entity and append it to the student's grades"""
+        self.grades[grade.id] = grade
+        self._grade_ids.reserve(grade.id)
+
+        student = self.students.get(grade.student_id)
+        if student is not None:
+            student.add_grade(grade.subject, grade.value)
+            self.changes.mark('students', student._id)  # Average grade changed
+        self.grade_store.append(grade, student.grade if student is not None else "")
+
+    @_mutation
+    def add_notification(self, user_id: int, message: str, priority: str = "normal") -> bool:
+        """Send notification to a user"""
+        if user_id not in self.users:
+            return False
+
+        with self._notifications_lock:
+            notification = self.notifications.add(user_id, message, priority)
+            payload = {'user_id': user_id, 'notification': notification.to_record()}
+            evicted = self.notifications.evict(user_id)
+            if evicted:
+                payload['evicted'] = evicted
+            self._record('notification.add', payload)
+        return True
+
+    @_mutation
+    def add_notifications(self, user_ids: Iterable[int], message: str, priority: str = "normal") -> int:
+        """Send one notification to many users under one lock hold and one journal record"""
+        created_at = datetime.now().isoformat()
+        recipients = []
+        evicted = []
+        with self._notifications_lock:
+            for user_id in user_ids:
+                if user_id not in self.users:
+                    continue  # Removed since the recipients were resolved
+                notification = self.notifications.add(user_id, message, priority, created_at)
+                recipients.append([user_id, notification.id])
+                evicted.extend([user_id, notification_id] for notification_id in self.notifications.evict(user_id))
+
+            if recipients:
+                payload = {'recipients': recipients, 'message': message,
+                           'created_at': created_at, 'priority': priority}
+                if evicted:
+                    payload['evicted'] = evicted
+                self._record('notification.bulk', payload)
+        return len(recipients)
+
+    def notify_parents(self, student_id: int, message: str, priority: str = "high") -> int:
+        """Send a notification about a student to the student's parents"""
+        return self.add_notifications(list(self._parents_by_child.get(student_id, ())),
+                                      f"Child {student_id}: {message}", priority)
+
+    def get_notifications(self, user_id: int, offset: int = 0, limit: Optional[int] = None) -> List[Notification]:
+        """Get a page of a user's notifications, high priority first"""
+        with self._notifications_lock:
+            return self.notifications.page(user_id, offset, limit)
+
+    @_mutation
+    def mark_notifications_read(self, user_id: int, notification_ids: Optional[Iterable[int]] = None) -> int:
+        """Mark some or all of a user's notifications as read, returning how many changed"""
+        ids = None if notification_ids is None else list(notification_ids)
+        with self._notifications_lock:
+            marked = self.notifications.mark_read(user_id, ids)
+            if not marked:
+                return 0
+
+            payload = {'user_id': user_id, 'ids': ids}
+            evicted = self.notifications.evict(user_id)
+            if evicted:
+                payload['evicted'] = evicted
+            self._record('notification.read', payload)
+        return marked
+
+    @_mutation
+    def delete_notification(self, user_id: int, notification_id: int) -> bool:
+        """Delete one of a user's notifications"""
+        with self._notifications_lock:
+            if not self.notifications.remove(user_id, notification_id):
+                return False
+            self._record('notification.delete', {'user_id': user_id, 'id': notification_id,
+                                                 'next_id': self.notifications.next_id(user_id)})
+        return True
+
+    def _record(self, operation: str, payload: Dict[str, Any]) -> None:
+        """Append mutation to the storage journal (caller holds the collection lock)"""
+        if self.storage is None or self._replaying:
+            return
+
+        with self._storage_lock:
+            self.storage.append(operation, payload)
+            if self.storage.needs_snapshot():
+                self._snapshot_due = True
+
+    def _load_from_storage(self) -> None:
+        """Rebuild in-memory state from snapshot and journal"""
+        handlers = {
+            'user.add': self._replay_user,
+            'user.remove': lambda p: self.remove_user(p['id']),
+            'user.email': lambda p: self.update_user_email(p['id'], p['email']),
+            'user.password': lambda p: self._set_password_hash(p['id'], p['password_hash']),
+            'user.update': lambda p: self.update_user_profile(p['id'], **p['fields']),
+            'assignment.add': lambda p: self.add_assignment(Assignment.from_record(p)),
+            'assignment.remove': lambda p: self.remove_assignment(p['id']),
+            'assignment.grade': self._replay_assignment_grade,
+            'submission': self._replay_submission,
+            'grade.add': lambda p: self._store_grade(Grade.from_record(p)),
+            'grade.update': lambda p: self.update_grade(p['id'], p['value']),
+            'schedule.add': lambda p: self.add_schedule(Schedule.from_record(p)),
+            'schedule.lesson.add': lambda p: self.add_lesson(p['schedule_id'], p['time'], p['subject'],
+                                                             p['teacher_id'], p['duration']),
+            'schedule.lesson.remove': lambda p: self.remove_lesson(p['schedule_id'], p['time']),
+            'notification.inbox': self._replay_inbox,
+            'notification.add': self._replay_notification,
+            'notification.bulk': self._replay_notification_bulk,
+            'notification.read': self._replay_notification_read,
+            'notification.delete': self._replay_notification_delete,
+            'counters': self._replay_counters,
+            'changes': self._replay_changes
+        }
+
+        # Rows loaded before the stored change tracker state describe
+        # exported history; mutations replayed after it are marked again,
+        # in journal order, and get the same versions they had originally
+        self._replaying = True
+        self.changes.recording = False
+        try:
+            for operation, payload in self.storage.load():
+                handlers[operation](payload)
+        finally:
+            self._replaying = False
+            restored = self.changes.recording
+            self.changes.recording = True
+        if not restored:
+            # First start, or data stored before the tracker was persisted
+            with self._storage_lock:
+                self._record('changes', self.changes.to_record())
+
+    def _replay_changes(self, payload: Dict[str, Any]) -> None:
+        """Continue the stored change tracker epoch and mark replayed mutations from here on"""
+        self.changes.restore(payload)
+        self.changes.recording = True
+
+    def _replay_submission(self, payload: Dict[str, Any]) -> None:
+        """Apply journaled submission without re-checking the deadline"""
+        assignment = self.assignments.get(payload['assignment_id'])
+        if assignment is not None:
+            assignment.submissions[payload['student_id']] = payload['content']
+            self.changes.mark('assignments', assignment.id)
+        student = self.students.get(payload['student_id'])
+        if student is not None:
+            student.assignments[payload['assignment_id']] = "submitted"
+
+    def _replay_assignment_grade(self, payload: Dict[str, Any]) -> None:
+        """Apply journaled assignment grade"""
+        assignment = self.assignments.get(payload['assignment_id'])
+        if assignment is not None:
+            assignment.grades[payload['student_id']] = payload['value']
+            self.changes.mark('assignments', assignment.id)
+
+    def _replay_user(self, payload: Dict[str, Any]) -> None:
+        """Apply journaled user, loading notifications kept in older user records"""
+        self.add_user(self.USER_TYPES[payload['role']].from_record(payload))
+        if payload.get('notifications') or 'next_notification_id' in payload:
+            self.notifications.restore(payload['id'], payload.get('notifications', ()),
+                                       payload.get('next_notification_id', 1))
+
+    def _replay_inbox(self, payload: Dict[str, Any]) -> None:
+        """Restore a user's notifications from a snapshot"""
+        if payload['user_id'] in self.users:
+            self.notifications.restore(payload['user_id'], payload['notifications'], payload['next_id'])
+
+    def _replay_notification(self, payload: Dict[str, Any]) -> None:
+        """Apply journaled notification keeping its ID and timestamp"""
+        user_id = payload['user_id']
+        if user_id in self.users:
+            self.notifications.insert(Notification.from_record(payload['notification'], user_id))
+            for notification_id in payload.get('evicted', ()):
+                self.notifications.remove(user_id, notification_id)
+
+    def _replay_notification_bulk(self, payload: Dict[str, Any]) -> None:
+        """Apply journaled broadcast batch"""
+        for user_id, notification_id in payload['recipients']:
+            if user_id in self.users:
+                self.notifications.insert(Notification.from_record(
+                    {'id': notification_id, 'message': payload['message'], 'created_at': payload['created_at'],
+                     'is_read': False, 'priority': payload['priority']}, user_id))
+        for user_id, notification_id in payload.get('evicted', ()):
+            self.notifications.remove(user_id, notification_id)
+
+    def _replay_notification_read(self, payload: Dict[str, Any]) -> None:
+        """Apply journaled mark-read and the evictions it caused"""
+        self.notifications.mark_read(payload['user_id'], payload['ids'])
+        for notification_id in payload.get('evicted', ()):
+            self.notifications.remove(payload['user_id'], notification_id)
+
+    def _replay_notification_delete(self, payload: Dict[str, Any]) -> None:
+        """Apply journaled delete without letting its ID be issued again"""
+        self.notifications.remove(payload['user_id'], payload['id'])
+        self.notifications.reserve(payload['user_id'], payload['next_id'])
+
+    def _replay_counters(self, payload: Dict[str, Any]) -> None:
+        """Restore ID counters from a snapshot"""
+        self._user_ids.reserve(payload['next_id'] - 1)
+        self._assignment_ids.reserve(payload['next_assignment_id'] - 1)
+        self._grade_ids.reserve(payload['next_grade_id'] - 1)
+
+    def _snapshot_records(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield records describing the complete current state"""
+        for user in self.users.values():
+            yield 'user.add', user.to_record()
+        for user_id, inbox in self.notifications.inboxes():
+            yield 'notification.inbox', {'user_id': user_id, 'next_id': inbox.next_id,
+                                         'notifications': inbox.to_records()}
+        for assignment in self.assignments.values():
+            yield 'assignment.add', assignment.to_record()
+        for grade in self.grades.values():
+            yield 'grade.add', grade.get_grade_info()
+        for schedule in self.schedules.values():
+            yield 'schedule.add', schedule.to_record()
+        yield 'counters', {
+            'next_id': self._user_ids.next_value,
+            'next_assignment_id': self._assignment_ids.next_value,
+            'next_grade_id': self._grade_ids.next_value
+        }
+        yield 'changes', self.changes.to_record()  # Last, so the rows above are not marked again
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Hold every collection lock for a point-in-time consistent view"""
+        with self._users_lock, self._assignments_lock, self._schedules_lock, self._grades_lock, \
+                self._notifications_lock, self._storage_lock:
+            yield
+
+    def create_snapshot(self) -> bool:
+        """Compact the journal into a full snapshot"""
+        if self.storage is None:
+            return False
+        with self.locked():
+            self._snapshot_due = False
+            self.storage.write_snapshot(self._snapshot_records())
+        return True
+
+    @contextmanager
+    def bulk(self) -> Iterator[None]:
+        """Batch storage writes of many mutations into one commit"""
+        if self.storage is None:
+            yield
+            return
+        with self.storage.bulk(self._storage_lock):
+            yield
+
+    def close(self) -> None:
+        """Stop hashing workers and flush pending journal writes"""
+        if self.hashing_pool is not None:
+            self.hashing_pool.shutdown()
+        if self.storage is not None:
+            with self._storage_lock:
+                self.storage.close()
+
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Find user by email"""
-        for user in self.users.values():
-            if user._email == email:
-                return user
-        return None
+        return self._users_by_email.get(self._normalize_email(email))
 
     def authenticate_user(self, email: str, password: str) -> Optional[User]:
         """Authenticate user with email and password"""
         user = self.get_user_by_email(email)
-        if user and user.verify_password(password):
-            return user
-        return None
\ No newline at end of file
+        if user is None:
+            return None
+
+        if self.hashing_pool is not None:
+            verified = self.hashing_pool.verify(user, password)
+        else:
+            verified = user.verify_password(password)
+        if not verified:
+            return None
+
+        if user.password_needs_rehash():
+            self._rehash_password(user, password)
+        return user
+
+    def _rehash_password(self, user: User, password: str) -> None:
+        """Upgrade a legacy or outdated hash while the plain password is known"""
+        if self.hashing_pool is not None:
+            password_hash = self.hashing_pool.hash(password)
+        else:
+            password_hash = user._hash_password(password)
+
+        if password_hash is not None and self.users.get(user._id) is user:
+            self._set_password_hash(user._id, password_hash)
+            logger.info("Upgraded password hash for user %s", user._id)
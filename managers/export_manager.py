@@ -1,162 +1,649 @@
 import csv
+import gzip
+import hashlib
+import io
+import json
+import multiprocessing
 import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Deque, Iterable, Iterator, List, Dict, Optional, Tuple
 from openpyxl import Workbook
 import logging
 from managers.data_manager import DataManager
+from managers.change_tracker import Watermark
+from models.users import User, Student, Teacher
+from models.entities import Assignment
+
+logger = logging.getLogger(__name__)
 
 # ExportManager class content
 
+TableRows = Dict[str, List[Tuple]]  # {table: materialized export rows}
+EXPORT_TABLES = ('users', 'students', 'teachers', 'assignments')
+Delta = Dict[str, Tuple[List[Tuple], List[int]]]  # {table: (upserted rows, deleted keys)}
+
+
+def _sql_value(value) -> str:
+    """Render a Python value as a T-SQL literal"""
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return "N'" + str(value).replace("'", "''") + "'"
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    """Parse ISO timestamp text, None when it is not a valid timestamp"""
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process since it started"""
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class ExportStats:
+    """Timings, row and byte counts of one export
+
+    Peak memory is the process high-water mark (ru_maxrss) when the export
+    ends, plus how far the export raised it. The mark cannot be reset
+    without affecting the whole process, so an export that stays below an
+    earlier peak reports zero growth, and exports running at the same time
+    in one process share their growth.
+    """
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._peak_rss_before = _peak_rss_bytes()
+        self.tables: Dict[str, Dict] = {}
+
+    @contextmanager
+    def table(self, name: str) -> Iterator[Dict]:
+        """Time writing one table; the caller fills in rows and bytes"""
+        entry = {'rows': 0, 'bytes': 0}
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry['seconds'] = time.perf_counter() - start
+            self.tables[name] = entry
+
+    def summary(self, total_bytes: Optional[int] = None, peak_rss: Optional[int] = None) -> Dict:
+        """Totals, throughput and per-table figures for the export log"""
+        seconds = time.perf_counter() - self._start
+        for entry in self.tables.values():
+            entry['rows_per_sec'] = round(entry['rows'] / entry['seconds']) if entry['seconds'] else None
+            entry['seconds'] = round(entry['seconds'], 4)
+        rows = sum(entry['rows'] for entry in self.tables.values())
+        if total_bytes is None:
+            total_bytes = sum(entry['bytes'] for entry in self.tables.values())
+        if peak_rss is None:
+            peak_rss = _peak_rss_bytes()
+        growth = (peak_rss - self._peak_rss_before
+                  if peak_rss is not None and self._peak_rss_before is not None else None)
+        return {
+            'seconds': round(seconds, 4),
+            'rows': rows,
+            'bytes': total_bytes,
+            'rows_per_sec': round(rows / seconds) if seconds else None,
+            'peak_rss_mb': round(peak_rss / 2 ** 20, 1) if peak_rss is not None else None,
+            'peak_rss_growth_mb': round(growth / 2 ** 20, 1) if growth is not None else None,
+            'tables': self.tables
+        }
+
+
+class _HashingFile(io.RawIOBase):
+    """Binary file wrapper tracking SHA-256 and size of everything written"""
+
+    def __init__(self, path: str):
+        self._file = open(path, 'wb')
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.sha256.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+
+class _CsvPartWriter:
+    """Write CSV rows into numbered, optionally compressed part files"""
+
+    EXTENSIONS = {None: ".csv", 'gzip': ".csv.gz", 'zstd': ".csv.zst"}
+
+    def __init__(self, directory: str, table: str, header: List[str], compression: Optional[str],
+                 max_rows: Optional[int], max_bytes: Optional[int]):
+        if compression not in self.EXTENSIONS:
+            raise ValueError(f"Unknown CSV compression: {compression}")
+        self.directory = directory
+        self.table = table
+        self.header = header
+        self.compression = compression
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.split = compression is not None or bool(max_rows or max_bytes)
+        self.parts: List[Dict] = []
+        self._raw: Optional[_HashingFile] = None
+        self._text = None
+        self._writer = None
+        self._rows = 0
+        self._open_part()
+
+    def _open_part(self) -> None:
+        """Start the next part file and write its header"""
+        if self.split:
+            name = f"{self.table}.part{len(self.parts) + 1:04d}{self.EXTENSIONS[self.compression]}"
+        else:
+            name = f"{self.table}.csv"  # Same file name as before parts existed
+        self._name = name
+        self._raw = _HashingFile(os.path.join(self.directory, name))
+        if self.compression == 'gzip':
+            binary = gzip.GzipFile(filename=name, mode='wb', fileobj=self._raw, mtime=0)
+        elif self.compression == 'zstd':
+            import zstandard
+            binary = zstandard.ZstdCompressor().stream_writer(self._raw, closefd=False)
+        else:
+            binary = self._raw  # Its file is buffered; another buffer would hide the size from write()
+        # A byte limit on plain parts needs every row passed straight down to be counted
+        self._text = io.TextIOWrapper(binary, encoding='utf-8', newline='',
+                                      write_through=self.compression is None and bool(self.max_bytes))
+        self._writer = csv.writer(self._text)
+        self._writer.writerow(self.header)
+        self._rows = 0
+
+    def _close_part(self) -> None:
+        """Finish the current part and record it in the manifest"""
+        self._text.close()  # Flushes the compressor; gzip and zstd leave the raw file open
+        self._raw.close()
+        self.parts.append({
+            'file': self._name,
+            'rows': self._rows,
+            'bytes': self._raw.size,
+            'sha256': self._raw.sha256.hexdigest()
+        })
+
+    def write(self, row: Tuple) -> None:
+        """Write one row, rotating to a new part when the current one is full"""
+        if self._rows and ((self.max_rows and self._rows >= self.max_rows) or
+                           (self.max_bytes and self._raw.size >= self.max_bytes)):
+            self._close_part()
+            self._open_part()
+        self._writer.writerow(row)
+        self._rows += 1
+
+    def close(self) -> List[Dict]:
+        """Finish the last part and return the part list"""
+        if self._text is not None:
+            self._close_part()
+            self._text = None
+        return self.parts
+
+
+def _write_xlsx_workbook(filename: str, sheets: Iterable[Tuple[str, List[str], Iterable[Tuple], int]],
+                         streaming: bool = True) -> Dict:
+    """Write (title, header, rows, width) sheets to an Excel file
+
+    Module level so a worker process can run it; only the first width
+    columns of each row are written. Returns the ExportStats summary, with
+    the peak memory of the process that wrote the file, so a dedicated
+    worker process reports the export's own peak.
+    """
+    stats = ExportStats()
+    wb = Workbook(write_only=streaming)
+    if not streaming:
+        wb.remove(wb.active)  # Remove default sheet
+
+    for title, header, rows, width in sheets:
+        with stats.table(title) as entry:
+            sheet = wb.create_sheet(title)
+            sheet.append(header)
+            for row in rows:
+                sheet.append(row[:width])
+                entry['rows'] += 1
+            # Per-sheet bytes stay 0: sheets are zipped into one file on save
+
+    wb.save(filename)
+    return stats.summary(total_bytes=os.path.getsize(filename))
+
+
 class ExportManager:
     """Manages data export to various formats"""
 
-    def __init__(self, data_manager: DataManager):
+    # (sheet title, header, table, number of leading row columns to write)
+    XLSX_SHEETS = [
+        ("Users", ["ID", "Full Name", "Email", "Role", "Created At", "Phone", "Address"], 'users', 7),
+        ("Students", ["User ID", "Grade", "Subjects", "Average Grade"], 'students', 4),
+        ("Teachers", ["User ID", "Subjects", "Classes", "Workload"], 'teachers', 4),
+        ("Assignments", ["ID", "Title", "Subject", "Teacher ID", "Class ID",
+                         "Deadline", "Difficulty", "Submissions", "Grades"], 'assignments', 9)
+    ]
+
+    # {table: (SQL table, columns in export row order)}; the first column is the key
+    SQL_TABLES = {
+        'users': ("Users", ["ID", "FullName", "Email", "Role", "CreatedAt", "Phone", "Address", "PasswordHash"]),
+        'students': ("Students", ["UserID", "Grade", "Subjects", "AverageGrade"]),
+        'teachers': ("Teachers", ["UserID", "Subjects", "Classes", "Workload"]),
+        'assignments': ("Assignments", ["ID", "Title", "Subject", "TeacherID", "ClassID", "Deadline",
+                                        "Difficulty", "SubmissionCount", "GradeCount", "Description"])
+    }
+    # Column order of the CREATE TABLE statements, which BULK INSERT data files follow
+    SQL_SCHEMA_COLUMNS = {
+        'users': ["ID", "FullName", "Email", "PasswordHash", "Role", "CreatedAt", "Phone", "Address"],
+        'students': ["UserID", "Grade", "Subjects", "AverageGrade"],
+        'teachers': ["UserID", "Subjects", "Classes", "Workload"],
+        'assignments': ["ID", "Title", "Description", "Subject", "TeacherID", "ClassID", "Deadline",
+                        "Difficulty", "SubmissionCount", "GradeCount"]
+    }
+    SQL_BATCH_ROWS = 1000  # SQL Server limit for one INSERT ... VALUES
+
+    # {table: [(column, type)]} for Parquet export, in export row order
+    PARQUET_COLUMNS = {
+        'users': [('id', 'int64'), ('full_name', 'string'), ('email', 'string'), ('role', 'string'),
+                  ('created_at', 'timestamp'), ('phone', 'string'), ('address', 'string')],
+        'students': [('user_id', 'int64'), ('grade', 'string'), ('subjects', 'string'), ('average_grade', 'float64')],
+        'teachers': [('user_id', 'int64'), ('subjects', 'string'), ('classes', 'string'), ('workload', 'int32')],
+        'assignments': [('id', 'int64'), ('title', 'string'), ('subject', 'string'), ('teacher_id', 'int64'),
+                        ('class_id', 'string'), ('deadline', 'timestamp'), ('difficulty', 'string'),
+                        ('submissions', 'int32'), ('grades', 'int32'), ('description', 'string')]
+    }
+
+    def __init__(self, data_manager: DataManager, log_path: Optional[str] = None, log_size: int = 500):
         self.data_manager = data_manager
-        self.export_log: List[Dict] = []
+        # Ring buffer of the latest log_size entries, mirrored to a JSON-lines file at log_path
+        self.export_log: Deque[Dict] = deque(maxlen=log_size)
+        self.log_path = log_path
+        self._log_lock = threading.Lock()
+        self._log_lines = 0  # Lines in the log file, compacted at twice log_size
+        # Kept apart from the ring buffer, which job entries would evict it from
+        self._watermark: Optional[Watermark] = None  # Of the latest successful delta export
+        self._processes: Optional[ProcessPoolExecutor] = None  # Started by the first auto_export_all
+        self._processes_lock = threading.Lock()
+        if log_path:
+            self._load_log()
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        """Worker process for CPU-bound writers, started once and reused
+
+        The worker is spawned rather than forked: a fork copies locks held by
+        the storage, scheduler and logging threads of this process, and the
+        child can deadlock on them.
+        """
+        with self._processes_lock:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+            return self._processes
+
+    def shutdown(self) -> None:
+        """Stop the export worker process, if one was started"""
+        with self._processes_lock:
+            if self._processes is not None:
+                self._processes.shutdown(wait=True)
+                self._processes = None
+
+    def _load_log(self) -> None:
+        """Load the latest entries of the persisted export log and the delta watermark"""
+        try:
+            with open(self.log_path, encoding='utf-8') as f:
+                for line in f:
+                    self._log_lines += 1
+                    try:
+                        log_entry = json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line from a crash
+                    self.export_log.append(log_entry)
+                    if log_entry['format'] == "DELTA" and log_entry['success'] and 'watermark' in log_entry:
+                        self._watermark = log_entry['watermark']  # Logs written before the watermark file
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error("Error loading export log: %s", e)
 
-    def log_export(self, format_type: str, filename: str, success: bool) -> None:
-        """Log export operation"""
+        try:
+            with open(self.log_path + ".watermark", encoding='utf-8') as f:
+                self._watermark = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error("Error loading delta watermark: %s", e)
+
+    def _save_watermark(self, watermark: Watermark) -> None:
+        """Remember the watermark of a successful delta export, in memory and next to the log file"""
+        with self._log_lock:
+            self._watermark = watermark
+            if not self.log_path:
+                return
+            try:
+                temp_path = self.log_path + ".watermark.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(watermark, f)
+                os.replace(temp_path, self.log_path + ".watermark")
+            except Exception as e:
+                logger.error("Error writing delta watermark: %s", e)
+
+    def _append_log(self, log_entry: Dict) -> None:
+        """Add entry to the ring buffer and the log file"""
+        with self._log_lock:
+            self.export_log.append(log_entry)
+            if not self.log_path:
+                return
+            try:
+                if self._log_lines >= 2 * self.export_log.maxlen:
+                    # Rewrite the file with just the buffer so it stays bounded too
+                    temp_path = self.log_path + ".tmp"
+                    with open(temp_path, 'w', encoding='utf-8') as f:
+                        f.writelines(json.dumps(entry) + "\n" for entry in self.export_log)
+                    os.replace(temp_path, self.log_path)
+                    self._log_lines = len(self.export_log)
+                else:
+                    with open(self.log_path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(log_entry) + "\n")
+                    self._log_lines += 1
+            except Exception as e:
+                logger.error("Error writing export log: %s", e)
+
+    def log_export(self, format_type: str, filename: str, success: bool,
+                   watermark: Optional[Watermark] = None, stats: Optional[Dict] = None) -> None:
+        """Log export operation with its ExportStats summary"""
         log_entry = {
             'timestamp': datetime.now().isoformat(),
             'format': format_type,
             'filename': filename,
             'success': success
         }
-        self.export_log.append(log_entry)
-        logging.info(f"Export {format_type} to {filename}: {'Success' if success else 'Failed'}")
-
-    def export_to_xlsx(self, filename: str = "eduplatform_data.xlsx") -> bool:
-        """Export all data to the Excel file"""
+        if watermark is not None:
+            log_entry['watermark'] = watermark
+        if stats is not None:
+            log_entry.update(stats)
+        if format_type == "DELTA" and success and watermark is not None:
+            self._save_watermark(watermark)  # Before the log entry, so a crash never loses the newer one
+        self._append_log(log_entry)
+        if stats is not None:
+            logger.info("Export %s to %s: %s (%d rows, %d bytes in %.2fs)", format_type, filename,
+                        'Success' if success else 'Failed', stats['rows'], stats['bytes'], stats['seconds'],
+                        extra={'rows': stats['rows'], 'bytes': stats['bytes'], 'seconds': stats['seconds']})
+        else:
+            logger.info("Export %s to %s: %s", format_type, filename, 'Success' if success else 'Failed')
+
+    def log_job(self, job_id: int, name: str, status: str, success: Optional[bool] = None) -> None:
+        """Log background export job state change"""
+        self._append_log({
+            'timestamp': datetime.now().isoformat(),
+            'format': "JOB",
+            'filename': name,
+            'success': success if success is not None else status not in ("failed", "cancelled"),
+            'job_id': job_id,
+            'status': status
+        })
+        logger.info("Export job %s (%s): %s", job_id, name, status)
+
+    def iter_rows(self, table: str) -> Iterator[Tuple]:
+        """Stream export rows for a table
+
+        Rows come straight from SQL when the data manager is backed by a
+        storage that supports streaming, otherwise from the in-memory objects.
+        users rows end with the password hash, assignments rows with the
+        description; sheet and CSV writers drop these trailing columns.
+        """
+        storage = self.data_manager.storage
+        if hasattr(storage, 'stream_rows'):
+            return self._iter_sql_rows(storage, table)
+        return getattr(self, f"_iter_{table}_rows")()
+
+    def _iter_users_rows(self) -> Iterator[Tuple]:
+        """Users rows from in-memory objects"""
+        # list() copies are atomic, so concurrent writers cannot break iteration
+        return map(self._user_row, list(self.data_manager.users.values()))
+
+    def _iter_students_rows(self) -> Iterator[Tuple]:
+        """Students rows from in-memory objects"""
+        return map(self._student_row, list(self.data_manager.students.values()))
+
+    def _iter_teachers_rows(self) -> Iterator[Tuple]:
+        """Teachers rows from in-memory objects"""
+        return map(self._teacher_row, list(self.data_manager.teachers.values()))
+
+    def _iter_assignments_rows(self) -> Iterator[Tuple]:
+        """Assignments rows from in-memory objects"""
+        return map(self._assignment_row, list(self.data_manager.assignments.values()))
+
+    @staticmethod
+    def _user_row(user: User) -> Tuple:
+        """Users export row"""
+        profile = user.get_profile()
+        return (profile['id'], profile['full_name'], profile['email'], profile['role'],
+                profile['created_at'], profile['phone'], profile['address'], user._password_hash)
+
+    @staticmethod
+    def _student_row(student: Student) -> Tuple:
+        """Students export row"""
+        return student._id, student.grade, ", ".join(student.subjects.keys()), student.calculate_average_grade()
+
+    @staticmethod
+    def _teacher_row(teacher: Teacher) -> Tuple:
+        """Teachers export row"""
+        return teacher._id, ", ".join(teacher.subjects), ", ".join(teacher.classes), teacher.workload
+
+    @staticmethod
+    def _assignment_row(assignment: Assignment) -> Tuple:
+        """Assignments export row"""
+        return (assignment.id, assignment.title, assignment.subject, assignment.teacher_id,
+                assignment.class_id, assignment.deadline, assignment.difficulty,
+                len(assignment.submissions), len(assignment.grades), assignment.description)
+
+    @staticmethod
+    def _iter_sql_rows(storage, table: str) -> Iterator[Tuple]:
+        """Export rows streamed from SQL storage"""
+        for row in storage.stream_rows(table):
+            if table == 'students':
+                yield row[0], row[1], ", ".join(json.loads(row[2]).keys()), row[3]
+            elif table == 'teachers':
+                yield row[0], ", ".join(json.loads(row[1])), ", ".join(json.loads(row[2])), row[3]
+            else:
+                yield row
+
+    def snapshot_rows(self) -> TableRows:
+        """Materialize rows of every table at one consistent point in time"""
+        with self.data_manager.locked():
+            return {table: list(self.iter_rows(table)) for table in EXPORT_TABLES}
+
+    def _rows(self, table: str, rows: Optional[TableRows]) -> Iterable[Tuple]:
+        """Use materialized rows when given, otherwise stream them"""
+        return rows[table] if rows is not None else self.iter_rows(table)
+
+    def _xlsx_sheets(self, rows: Optional[TableRows]) -> List[Tuple[str, List[str], Iterable[Tuple], int]]:
+        """(title, header, rows, width) of every sheet"""
+        return [(title, header, self._rows(table, rows), width) for title, header, table, width in self.XLSX_SHEETS]
+
+    def export_to_xlsx(self, filename: str = "eduplatform_data.xlsx", streaming: bool = True,
+                       rows: Optional[TableRows] = None) -> bool:
+        """Export all data to the Excel file
+
+        In streaming mode rows go through a write-only workbook that serializes
+        each row as it is appended, so memory stays flat regardless of row
+        count. streaming=False keeps every cell in memory until save.
+        """
         try:
-            wb = Workbook()
-            wb.remove(wb.active)  # Remove default sheet
-
-            # Users sheet
-            users_sheet = wb.create_sheet("Users")
-            users_sheet.append(["ID", "Full Name", "Email", "Role", "Created At", "Phone", "Address"])
-
-            for user in self.data_manager.users.values():
-                profile = user.get_profile()
-                users_sheet.append([
-                    profile['id'], profile['full_name'], profile['email'],
-                    profile['role'], profile['created_at'], profile['phone'], profile['address']
-                ])
-
-            # Students sheet
-            students_sheet = wb.create_sheet("Students")
-            students_sheet.append(["User ID", "Grade", "Subjects", "Average Grade"])
-
-            for student in self.data_manager.students.values():
-                avg_grade = student.calculate_average_grade()
-                students_sheet.append([
-                    student._id, student.grade,
-                    ", ".join(student.subjects.keys()), avg_grade
-                ])
-
-            # Teachers sheet
-            teachers_sheet = wb.create_sheet("Teachers")
-            teachers_sheet.append(["User ID", "Subjects", "Classes", "Workload"])
-
-            for teacher in self.data_manager.teachers.values():
-                teachers_sheet.append([
-                    teacher._id, ", ".join(teacher.subjects),
-                    ", ".join(teacher.classes), teacher.workload
-                ])
-
-            # Assignments sheet
-            assignments_sheet = wb.create_sheet("Assignments")
-            assignments_sheet.append([
-                "ID", "Title", "Subject", "Teacher ID", "Class ID",
-                "Deadline", "Difficulty", "Submissions", "Grades"
-            ])
-
-            for assignment in self.data_manager.assignments.values():
-                assignments_sheet.append([
-                    assignment.id, assignment.title, assignment.subject,
-                    assignment.teacher_id, assignment.class_id, assignment.deadline,
-                    assignment.difficulty, len(assignment.submissions), len(assignment.grades)
-                ])
-
-            wb.save(filename)
-            self.log_export("XLSX", filename, True)
+            stats = _write_xlsx_workbook(filename, self._xlsx_sheets(rows), streaming)
+            self.log_export("XLSX", filename, True, stats=stats)
             return True
 
         except Exception as e:
-            logging.error(f"XLSX export failed: {e}")
+            logger.error("XLSX export failed: %s", e)
             self.log_export("XLSX", filename, False)
             return False
 
-    def export_to_csv(self, directory: str = "csv_exports") -> bool:
-        """Export data to CSV files"""
+    def export_to_csv(self, directory: str = "csv_exports", rows: Optional[TableRows] = None,
+                      compression: Optional[str] = None, max_rows_per_part: Optional[int] = None,
+                      max_bytes_per_part: Optional[int] = None) -> bool:
+        """Export data to CSV files
+
+        compression is None, "gzip" or "zstd" (needs the zstandard package).
+        With max_rows_per_part or max_bytes_per_part (on-disk bytes) each table
+        is split into numbered parts, every part with its own header row; the
+        byte limit is checked against compressed output already flushed, so a
+        part can overshoot it by one compressor block. manifest.json lists the
+        parts with row counts and SHA-256 checksums.
+        """
         try:
+            stats = ExportStats()
             os.makedirs(directory, exist_ok=True)
-
-            # Users CSV
-            users_file = os.path.join(directory, "users.csv")
-            with open(users_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(["ID", "Full Name", "Email", "Role", "Created At", "Phone", "Address"])
-
-                for user in self.data_manager.users.values():
-                    profile = user.get_profile()
-                    writer.writerow([
-                        profile['id'], profile['full_name'], profile['email'],
-                        profile['role'], profile['created_at'], profile['phone'], profile['address']
-                    ])
-
-            # Students CSV
-            students_file = os.path.join(directory, "students.csv")
-            with open(students_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(["User ID", "Grade", "Subjects", "Average Grade"])
-
-                for student in self.data_manager.students.values():
-                    avg_grade = student.calculate_average_grade()
-                    writer.writerow([
-                        student._id, student.grade,
-                        ", ".join(student.subjects.keys()), avg_grade
-                    ])
-
-            # Teachers CSV
-            teachers_file = os.path.join(directory, "teachers.csv")
-            with open(teachers_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(["User ID", "Subjects", "Classes", "Workload"])
-
-                for teacher in self.data_manager.teachers.values():
-                    writer.writerow([
-                        teacher._id, ", ".join(teacher.subjects),
-                        ", ".join(teacher.classes), teacher.workload
-                    ])
-
-            # Assignments CSV
-            assignments_file = os.path.join(directory, "assignments.csv")
-            with open(assignments_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    "ID", "Title", "Subject", "Teacher ID", "Class ID",
-                    "Deadline", "Difficulty", "Submissions", "Grades"
-                ])
-
-                for assignment in self.data_manager.assignments.values():
-                    writer.writerow([
-                        assignment.id, assignment.title, assignment.subject,
-                        assignment.teacher_id, assignment.class_id, assignment.deadline,
-                        assignment.difficulty, len(assignment.submissions), len(assignment.grades)
-                    ])
-
-            self.log_export("CSV", directory, True)
+            manifest = {
+                'generated_at': datetime.now().isoformat(),
+                'compression': compression,
+                'tables': {}
+            }
+
+            for _, header, table, width in self.XLSX_SHEETS:
+                with stats.table(table) as entry:
+                    writer = _CsvPartWriter(directory, table, header, compression,
+                                            max_rows_per_part, max_bytes_per_part)
+                    try:
+                        for row in self._rows(table, rows):
+                            writer.write(row[:width])
+                    finally:
+                        parts = writer.close()
+                    entry['rows'] = sum(part['rows'] for part in parts)
+                    entry['bytes'] = sum(part['bytes'] for part in parts)
+                manifest['tables'][table] = {'rows': entry['rows'], 'parts': parts}
+
+            with open(os.path.join(directory, "manifest.json"), 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2)
+
+            self.log_export("CSV", directory, True, stats=stats.summary())
             return True
 
         except Exception as e:
-            logging.error(f"CSV export failed: {e}")
+            logger.error("CSV export failed: %s", e)
             self.log_export("CSV", directory, False)
             return False
 
-    def export_to_sql(self, filename: str = "eduplatform_schema.sql") -> bool:
-        """Export data as SQL scripts for SSMS"""
+    def export_to_parquet(self, directory: str = "parquet_exports", rows: Optional[TableRows] = None,
+                          row_group_size: int = 100_000, compression: str = "zstd") -> bool:
+        """Export tables and the raw grades fact table to Parquet files
+
+        Columns are typed (integers, floats, timestamps, dictionary-encoded
+        labels) and written one row group of row_group_size rows at a time, so
+        memory stays bounded by a single row group. Requires pyarrow.
+        """
         try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            logger.error("Parquet export requires pyarrow (pip install pyarrow)")
+            self.log_export("PARQUET", directory, False)
+            return False
+
+        try:
+            stats = ExportStats()
+            os.makedirs(directory, exist_ok=True)
+            types = {'int64': pa.int64(), 'int32': pa.int32(), 'float64': pa.float64(),
+                     'string': pa.string(), 'timestamp': pa.timestamp('us')}
+
+            for table, columns in self.PARQUET_COLUMNS.items():
+                schema = pa.schema([(name, types[type_name]) for name, type_name in columns])
+                table_rows = iter(self._rows(table, rows))
+                path = os.path.join(directory, f"{table}.parquet")
+                with stats.table(table) as entry:
+                    with pq.ParquetWriter(path, schema, compression=compression) as writer:
+                        while True:
+                            batch = list(islice(table_rows, row_group_size))
+                            if not batch:
+                                break
+                            values = list(zip(*batch))
+                            arrays = [pa.array(list(map(_parse_timestamp, values[index]))
+                                               if type_name == 'timestamp' else values[index], type=types[type_name])
+                                      for index, (_, type_name) in enumerate(columns)]
+                            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                            entry['rows'] += len(batch)
+                    entry['bytes'] = os.path.getsize(path)
+
+            path = os.path.join(directory, "grades.parquet")
+            with stats.table('grades') as entry:
+                entry['rows'] = self._write_grades_parquet(path, row_group_size, compression)
+                entry['bytes'] = os.path.getsize(path)
+            self.log_export("PARQUET", directory, True, stats=stats.summary())
+            return True
+
+        except Exception as e:
+            logger.error("Parquet export failed: %s", e)
+            self.log_export("PARQUET", directory, False)
+            return False
+
+    def _write_grades_parquet(self, filename: str, row_group_size: int, compression: str) -> int:
+        """Write the grades fact table straight from the GradeStore columns, returning the row count"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        store = self.data_manager.grade_store
+        with self.data_manager.locked():
+            size = len(store)
+            columns = {name: store.column(name)[:size] for name in store.COLUMNS}
+            classes = pa.array(store.classes, type=pa.string())
+            subjects = pa.array(store.subjects, type=pa.string())
+
+        labels = pa.dictionary(pa.int32(), pa.string())
+        schema = pa.schema([('grade_id', pa.int64()), ('student_id', pa.int64()), ('class_id', labels),
+                            ('subject', labels), ('teacher_id', pa.int64()), ('value', pa.int8()),
+                            ('graded_at', pa.timestamp('us', tz='UTC'))])
+        with pq.ParquetWriter(filename, schema, compression=compression) as writer:
+            for start in range(0, size, row_group_size):
+                end = min(start + row_group_size, size)
+                graded_at = (columns['timestamp'][start:end] * 1_000_000).astype('int64')
+                writer.write_table(pa.Table.from_arrays([
+                    pa.array(columns['grade_id'][start:end]),
+                    pa.array(columns['student_id'][start:end]),
+                    pa.DictionaryArray.from_arrays(pa.array(columns['class_code'][start:end]), classes),
+                    pa.DictionaryArray.from_arrays(pa.array(columns['subject_code'][start:end]), subjects),
+                    pa.array(columns['teacher_id'][start:end]),
+                    pa.array(columns['value'][start:end]),
+                    pa.array(graded_at, type=pa.timestamp('us', tz='UTC'))
+                ], schema=schema))
+        return size
+
+    def export_to_sql(self, filename: str = "eduplatform_schema.sql", rows: Optional[TableRows] = None,
+                      mode: str = "insert", batch_size: int = SQL_BATCH_ROWS, batches_per_transaction: int = 10) -> bool:
+        """Export data as SQL scripts for SSMS
+
+        mode="insert" writes escaped multi-row INSERT statements of batch_size
+        rows, batches_per_transaction statements per transaction, each
+        transaction followed by GO so SSMS runs the script in pieces.
+        mode="bulk" writes one CSV data file per table next to the script and
+        BULK INSERT statements loading them (the files must be readable by the
+        SQL Server service).
+        """
+        if mode not in ("insert", "bulk"):
+            logger.error("Unknown SQL export mode: %s", mode)
+            self.log_export("SQL", filename, False)
+            return False
+        batch_size = max(1, min(batch_size, self.SQL_BATCH_ROWS))
+        try:
+            stats = ExportStats()
             with open(filename, 'w', encoding='utf-8') as f:
                 # Write database schema
                 f.write("-- EduPlatform Database Schema for SQL Server\n")
@@ -213,43 +700,242 @@ class ExportManager:
                            );\n\n""")
 
                 # Insert data
-                f.write("-- Insert Users data\n")
-                for user in self.data_manager.users.values():
-                    profile = user.get_profile()
-                    f.write(
-                        f"INSERT INTO Users VALUES ({profile['id']}, N'{profile['full_name']}', '{profile['email']}', '{user._password_hash}', '{profile['role']}', '{profile['created_at']}', '{profile['phone']}', N'{profile['address']}');\n")
-
-                f.write("\n-- Insert Students data\n")
-                for student in self.data_manager.students.values():
-                    avg_grade = student.calculate_average_grade()
-                    subjects = ", ".join(student.subjects.keys())
-                    f.write(
-                        f"INSERT INTO Students VALUES ({student._id}, '{student.grade}', N'{subjects}', {avg_grade});\n")
-
-                f.write("\n-- Insert Teachers data\n")
-                for teacher in self.data_manager.teachers.values():
-                    subjects = ", ".join(teacher.subjects)
-                    classes = ", ".join(teacher.classes)
-                    f.write(
-                        f"INSERT INTO Teachers VALUES ({teacher._id}, N'{subjects}', N'{classes}', {teacher.workload});\n")
-
-                f.write("\n-- Insert Assignments data\n")
-                for assignment in self.data_manager.assignments.values():
-                    f.write(
-                        f"INSERT INTO Assignments VALUES ({assignment.id}, N'{assignment.title}', N'{assignment.description}', '{assignment.subject}', {assignment.teacher_id}, '{assignment.class_id}', '{assignment.deadline}', '{assignment.difficulty}', {len(assignment.submissions)}, {len(assignment.grades)});\n")
-
-            self.log_export("SQL", filename, True)
+                data_bytes = 0
+                for table in EXPORT_TABLES:
+                    sql_table, columns = self.SQL_TABLES[table]
+                    with stats.table(table) as entry:
+                        start = f.tell()
+                        f.write(f"-- Insert {sql_table} data\n")
+                        if mode == "bulk":
+                            data_file, entry['rows'] = self._write_bulk_data_file(filename, table,
+                                                                                  self._rows(table, rows))
+                            path = data_file.replace("'", "''")
+                            f.write(f"BULK INSERT {sql_table} FROM '{path}'\n"
+                                    f"WITH (FORMAT = 'CSV', CODEPAGE = '65001', FIELDTERMINATOR = ',', "
+                                    f"ROWTERMINATOR = '0x0a', BATCHSIZE = {batch_size * batches_per_transaction}, "
+                                    f"TABLOCK);\nGO\n\n")
+                            entry['bytes'] = os.path.getsize(data_file)
+                            data_bytes += entry['bytes']
+                        else:
+                            entry['rows'] = self._write_insert_batches(f, sql_table, columns, self._rows(table, rows),
+                                                                       batch_size, batches_per_transaction)
+                            f.write("\n")
+                            entry['bytes'] = f.tell() - start  # tell() is a byte offset for UTF-8
+                script_bytes = f.tell()
+
+            self.log_export("SQL", filename, True, stats=stats.summary(total_bytes=script_bytes + data_bytes))
             return True
 
         except Exception as e:
-            logging.error(f"SQL export failed: {e}")
+            logger.error("SQL export failed: %s", e)
             self.log_export("SQL", filename, False)
             return False
 
+    @staticmethod
+    def _write_insert_batches(f, sql_table: str, columns: List[str], rows: Iterable[Tuple],
+                              batch_size: int, batches_per_transaction: int = 0) -> int:
+        """Write escaped multi-row INSERT statements, returning the row count
+
+        With batches_per_transaction every that many statements are wrapped in
+        their own transaction; without it the caller manages transactions.
+        """
+        prefix = f"INSERT INTO {sql_table} ({', '.join(columns)}) VALUES\n    "
+        rows = iter(rows)
+        count = batches = 0
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            if batches_per_transaction and batches % batches_per_transaction == 0:
+                f.write("BEGIN TRANSACTION;\n")
+            f.write(prefix + ",\n    ".join("(" + ", ".join(map(_sql_value, row)) + ")" for row in batch) + ";\n")
+            batches += 1
+            count += len(batch)
+            if batches_per_transaction and batches % batches_per_transaction == 0:
+                f.write("COMMIT TRANSACTION;\nGO\n")
+        if batches_per_transaction and batches % batches_per_transaction:
+            f.write("COMMIT TRANSACTION;\nGO\n")
+        return count
+
+    def _write_bulk_data_file(self, filename: str, table: str, rows: Iterable[Tuple]) -> Tuple[str, int]:
+        """Write table rows as a headerless CSV file in SQL table column order, returning path and row count"""
+        _, columns = self.SQL_TABLES[table]
+        positions = [columns.index(column) for column in self.SQL_SCHEMA_COLUMNS[table]]
+        data_file = os.path.abspath(f"{os.path.splitext(filename)[0]}_{table}.csv")
+        count = 0
+        with open(data_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            for row in rows:
+                writer.writerow([row[position] for position in positions])
+                count += 1
+        return data_file, count
+
+    def last_watermark(self) -> Optional[Watermark]:
+        """Watermark of the latest successful delta export"""
+        with self._log_lock:
+            return self._watermark
+
+    def _delta_rows(self, since: Optional[Watermark]) -> Tuple[Delta, bool]:
+        """Rows changed after since, or every row when since is unusable (caller holds locks)"""
+        tracker = self.data_manager.changes
+        if not tracker.is_current(since):
+            return {table: (list(getattr(self, f"_iter_{table}_rows")()), []) for table in EXPORT_TABLES}, True
+
+        changes = tracker.changes_since(since['version'])
+        builders = {'users': self._user_row, 'students': self._student_row,
+                    'teachers': self._teacher_row, 'assignments': self._assignment_row}
+        delta: Delta = {}
+        for table in EXPORT_TABLES:
+            upserted, deleted = changes.get(table, ([], []))
+            entities = getattr(self.data_manager, table)
+            rows = [builders[table](entities[key]) for key in sorted(upserted) if key in entities]
+            delta[table] = (rows, sorted(deleted))
+        return delta, False
+
+    def export_delta(self, directory: str = "delta_exports", since: Optional[Watermark] = None) -> bool:
+        """Export rows inserted, updated or deleted since the last delta export
+
+        Writes one CSV per table with an Op column (upsert/delete) and a SQL
+        script that applies the changes with MERGE and DELETE. since defaults
+        to the watermark of the last successful delta export. Without a usable
+        watermark (first run, or storage that could not restore the change
+        tracker) every row is exported and the script also deletes rows
+        missing from the export.
+        """
+        if since is None:
+            since = self.last_watermark()
+        try:
+            stats = ExportStats()
+            with self.data_manager.locked():
+                delta, full = self._delta_rows(since)
+                watermark = self.data_manager.changes.watermark()
+                if self.data_manager.storage is not None:
+                    self.data_manager.storage.sync()  # Never hand out a watermark ahead of durable state
+
+            version = watermark['version']
+            changed = sum(len(rows) + len(deleted) for rows, deleted in delta.values())
+            if changed or full:
+                # Nothing changed means the files for this version already exist
+                os.makedirs(directory, exist_ok=True)
+                self._write_delta_csv(directory, delta, version, stats)
+                sql_file = os.path.join(directory, f"delta_{version}.sql")
+                with stats.table('sql') as entry:
+                    self._write_delta_sql(sql_file, delta, full)
+                    entry['bytes'] = os.path.getsize(sql_file)
+            logger.info("Delta export to version %d: %d changed rows%s", version, changed, ' (full)' if full else '')
+            self.log_export("DELTA", directory, True, watermark, stats.summary())
+            return True
+
+        except Exception as e:
+            logger.error("Delta export failed: %s", e)
+            self.log_export("DELTA", directory, False)
+            return False
+
+    def _write_delta_csv(self, directory: str, delta: Delta, version: int, stats: ExportStats) -> None:
+        """Write {table}_delta_{version}.csv files with an Op column"""
+        for _, header, table, width in self.XLSX_SHEETS:
+            rows, deleted = delta[table]
+            path = os.path.join(directory, f"{table}_delta_{version}.csv")
+            with stats.table(table) as entry:
+                with open(path, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(["Op"] + header)
+                    writer.writerows(("upsert",) + row[:width] for row in rows)
+                    writer.writerows(("delete", key) for key in deleted)
+                entry['rows'] = len(rows) + len(deleted)
+                entry['bytes'] = os.path.getsize(path)
+
+    def _write_delta_sql(self, filename: str, delta: Delta, full: bool) -> None:
+        """Write T-SQL applying the delta through staging tables and MERGE"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write("-- EduPlatform delta for SQL Server\n")
+            f.write("-- Generated on: " + datetime.now().isoformat() + "\n\n")
+            f.write("SET XACT_ABORT ON;\nBEGIN TRANSACTION;\n\n")
+
+            # Stage changed rows
+            for table in EXPORT_TABLES:
+                sql_table, columns = self.SQL_TABLES[table]
+                rows = delta[table][0]
+                f.write(f"SELECT TOP 0 * INTO #{sql_table}Delta FROM {sql_table};\n")
+                self._write_insert_batches(f, f"#{sql_table}Delta", columns, rows, self.SQL_BATCH_ROWS)
+                f.write("\n")
+
+            # Deletes run child tables first because of the foreign keys to Users.
+            # Assignments of a removed teacher stay in memory but can no longer
+            # reference Users, so they are deleted with the teacher.
+            assignments_table = self.SQL_TABLES['assignments'][0]
+            for table in reversed(EXPORT_TABLES):
+                sql_table, columns = self.SQL_TABLES[table]
+                key = columns[0]
+                if full:
+                    if table == 'users':
+                        f.write(f"DELETE FROM {assignments_table} "
+                                f"WHERE TeacherID NOT IN (SELECT ID FROM #{sql_table}Delta);\n")
+                    f.write(f"DELETE FROM {sql_table} WHERE {key} NOT IN (SELECT {key} FROM #{sql_table}Delta);\n")
+                else:
+                    deleted = delta[table][1]
+                    for start in range(0, len(deleted), self.SQL_BATCH_ROWS):
+                        keys = ", ".join(map(str, deleted[start:start + self.SQL_BATCH_ROWS]))
+                        if table == 'users':
+                            f.write(f"DELETE FROM {assignments_table} WHERE TeacherID IN ({keys});\n")
+                        f.write(f"DELETE FROM {sql_table} WHERE {key} IN ({keys});\n")
+            f.write("\n")
+
+            # Upserts run parent table first; assignments of a removed teacher are skipped
+            for table in EXPORT_TABLES:
+                sql_table, columns = self.SQL_TABLES[table]
+                key = columns[0]
+                updates = ", ".join(f"{column} = source.{column}" for column in columns[1:])
+                source = f"#{sql_table}Delta"
+                if table == 'assignments':
+                    source = f"(SELECT * FROM {source} WHERE TeacherID IN (SELECT ID FROM Users))"
+                f.write(f"MERGE {sql_table} AS target USING {source} AS source ON target.{key} = source.{key}\n"
+                        f"WHEN MATCHED THEN UPDATE SET {updates}\n"
+                        f"WHEN NOT MATCHED BY TARGET THEN INSERT ({', '.join(columns)}) "
+                        f"VALUES ({', '.join('source.' + column for column in columns)});\n"
+                        f"DROP TABLE #{sql_table}Delta;\n\n")
+
+            f.write("COMMIT TRANSACTION;\n")
+
     def auto_export_all(self) -> bool:
-        """Export to all formats automatically"""
-        xlsx_success = self.export_to_xlsx()
-        csv_success = self.export_to_csv()
-        sql_success = self.export_to_sql()
+        """Export to all formats in parallel from one consistent snapshot
+
+        Rows of every table are materialized once under the data manager
+        locks. The CPU-bound XLSX writer runs in the reused worker process,
+        which only receives those plain row tuples, while CSV and SQL are
+        written by threads, so the total time is close to that of the slowest
+        format.
+        """
+        try:
+            rows = self.snapshot_rows()
+        except Exception as e:
+            logger.error("Export snapshot failed: %s", e)
+            return False
 
-        return xlsx_success and csv_success and sql_success
\ No newline at end of file
+        xlsx_filename = "eduplatform_data.xlsx"
+        with ThreadPoolExecutor(max_workers=2) as threads:
+            csv_future = threads.submit(self.export_to_csv, rows=rows)
+            sql_future = threads.submit(self.export_to_sql, rows=rows)
+
+            try:
+                processes = self._process_pool()
+                xlsx_future = processes.submit(_write_xlsx_workbook, xlsx_filename, self._xlsx_sheets(rows))
+                xlsx_stats = xlsx_future.result()  # Peak memory is that of the worker process
+                xlsx_success = True
+            except BrokenProcessPool as e:
+                logger.error("XLSX export worker died: %s", e)
+                with self._processes_lock:
+                    if self._processes is processes:
+                        self._processes = None  # Start a fresh worker next time
+                xlsx_stats = None
+                xlsx_success = False
+            except Exception as e:
+                logger.error("XLSX export failed: %s", e)
+                xlsx_stats = None
+                xlsx_success = False
+            self.log_export("XLSX", xlsx_filename, xlsx_success, stats=xlsx_stats)
+
+            csv_success = csv_future.result()
+            sql_success = sql_future.result()
+
+        return xlsx_success and csv_success and sql_success
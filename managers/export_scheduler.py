@@ -0,0 +1,275 @@
+import heapq
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time as day_time, timedelta
+from typing import Callable, Dict, List, Optional, Union
+import logging
+from managers.export_manager import ExportManager
+
+logger = logging.getLogger(__name__)
+
+# ExportScheduler class content
+
+Action = Union[str, Callable[[], bool]]
+
+
+class CronSchedule:
+    """Five-field cron expression: minute hour day-of-month month weekday
+
+    Fields accept *, numbers, ranges (a-b), lists (a,b) and steps (*/n, a-b/n).
+    Weekdays run 0-6 from Sunday. Unlike classic cron, day-of-month and
+    weekday must both match when both are restricted.
+    """
+
+    FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            self._parse(field, low, high) for field, (low, high) in zip(fields, self.FIELD_RANGES))
+
+    @staticmethod
+    def _parse(field: str, low: int, high: int) -> List[int]:
+        """Expand one cron field into the sorted values it matches"""
+        values = set()
+        for part in field.split(','):
+            step = 1
+            if '/' in part:
+                part, step_text = part.split('/')
+                step = int(step_text)
+            if part == '*':
+                start, end = low, high
+            elif '-' in part:
+                start, end = map(int, part.split('-'))
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+            if not low <= start <= end <= high or step < 1:
+                raise ValueError(f"Invalid cron field: {field!r}")
+            values.update(range(start, end + 1, step))
+        return sorted(values)
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First matching minute strictly after moment"""
+        start = (moment + timedelta(minutes=1)).replace(second=0, microsecond=0)
+        day = start.date()
+        for _ in range(366 * 5):  # Long enough for Feb 29 schedules
+            if (day.month in self.months and day.day in self.days
+                    and (day.weekday() + 1) % 7 in self.weekdays):
+                for hour in self.hours:
+                    for minute in self.minutes:
+                        candidate = datetime.combine(day, day_time(hour, minute))
+                        if candidate >= start:
+                            return candidate
+            day += timedelta(days=1)
+        raise ValueError(f"Cron expression never fires: {self.expression!r}")
+
+
+class ExportJob:
+    """Scheduled export job and its latest state"""
+
+    __slots__ = ('id', 'name', 'action', 'interval', 'cron', 'next_run', 'status',
+                 'running', 'cancelled', 'runs', 'coalesced', 'last_run', 'last_success')
+
+    def __init__(self, job_id: int, name: str, action: Callable[[], bool],
+                 interval: Optional[float] = None, cron: Optional[CronSchedule] = None):
+        self.id = job_id
+        self.name = name
+        self.action = action
+        self.interval = interval
+        self.cron = cron
+        self.next_run: Optional[float] = None  # POSIX seconds
+        self.status = "scheduled"
+        self.running = False
+        self.cancelled = False
+        self.runs = 0
+        self.coalesced = 0  # Runs skipped because the previous one was still going
+        self.last_run: Optional[str] = None
+        self.last_success: Optional[bool] = None
+
+    def schedule_next(self, now: float) -> None:
+        """Compute next run time, never scheduling into the past"""
+        if self.interval is not None:
+            following = (self.next_run or now) + self.interval
+            self.next_run = following if following > now else now + self.interval
+        elif self.cron is not None:
+            self.next_run = self.cron.next_after(datetime.fromtimestamp(now)).timestamp()
+        else:
+            self.next_run = None  # One-off job
+
+    def get_info(self) -> Dict:
+        """Get job status information"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'schedule': (f"every {self.interval:g}s" if self.interval is not None
+                         else self.cron.expression if self.cron is not None else "once"),
+            'status': self.status,
+            'next_run': datetime.fromtimestamp(self.next_run).isoformat() if self.next_run else None,
+            'runs': self.runs,
+            'coalesced': self.coalesced,
+            'last_run': self.last_run,
+            'last_success': self.last_success
+        }
+
+
+class ExportScheduler:
+    """Runs ExportManager jobs on background worker threads
+
+    A scheduler thread waits on a heap of due times and hands due jobs to a
+    small thread pool, so exports never block the caller. A job that is due
+    while its previous run is still going is coalesced (skipped) instead of
+    queued, and a job that fell behind runs once rather than catching up.
+    Job state changes are written to the export log.
+    """
+
+    # Export type names usable as job actions
+    ACTIONS = {
+        'all': 'auto_export_all',
+        'xlsx': 'export_to_xlsx',
+        'csv': 'export_to_csv',
+        'sql': 'export_to_sql',
+        'delta': 'export_delta',
+        'parquet': 'export_to_parquet'
+    }
+
+    def __init__(self, export_manager: ExportManager, max_workers: int = 1):
+        self.export_manager = export_manager
+        self.jobs: Dict[int, ExportJob] = {}
+        self._queue: List = []  # heap of (next_run, job_id)
+        self._next_job_id = 1
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export-job")
+        self._thread = threading.Thread(target=self._run, name="export-scheduler", daemon=True)
+        self._thread.start()
+
+    def _resolve_action(self, action: Action) -> Callable[[], bool]:
+        """Turn an export type name into a bound ExportManager method"""
+        if callable(action):
+            return action
+        if action not in self.ACTIONS:
+            raise ValueError(f"Unknown export type: {action}")
+        return getattr(self.export_manager, self.ACTIONS[action])
+
+    def _add_job(self, name: str, action: Action, first_run: float, interval: Optional[float] = None,
+                 cron: Optional[CronSchedule] = None) -> int:
+        """Register job and queue its first run"""
+        with self._condition:
+            job = ExportJob(self._next_job_id, name, self._resolve_action(action), interval, cron)
+            self._next_job_id += 1
+            job.next_run = first_run
+            self.jobs[job.id] = job
+            heapq.heappush(self._queue, (job.next_run, job.id))
+            self._condition.notify()
+        self.export_manager.log_job(job.id, name, "scheduled")
+        return job.id
+
+    def run_now(self, action: Action, name: Optional[str] = None) -> int:
+        """Run an export once in the background"""
+        return self._add_job(name or str(action), action, time.time())
+
+    def schedule_interval(self, action: Action, seconds: float, name: Optional[str] = None,
+                          run_immediately: bool = False) -> int:
+        """Run an export every given number of seconds"""
+        if seconds <= 0:
+            raise ValueError("Interval must be positive")
+        now = time.time()
+        return self._add_job(name or str(action), action, now if run_immediately else now + seconds, interval=seconds)
+
+    def schedule_cron(self, action: Action, expression: str, name: Optional[str] = None) -> int:
+        """Run an export on a cron schedule"""
+        cron = CronSchedule(expression)
+        first_run = cron.next_after(datetime.now()).timestamp()
+        return self._add_job(name or str(action), action, first_run, cron=cron)
+
+    def cancel(self, job_id: int) -> bool:
+        """Stop future runs of a job (a run in progress is allowed to finish, a queued one is dropped)"""
+        with self._condition:
+            job = self.jobs.get(job_id)
+            if job is None or job.cancelled:
+                return False
+            job.cancelled = True
+            job.next_run = None  # Its heap entry becomes stale and is skipped
+            job.status = "cancelling" if job.running else "cancelled"
+            self._condition.notify()
+        self.export_manager.log_job(job_id, job.name, job.status)
+        return True
+
+    def status(self) -> List[Dict]:
+        """Get status of every job"""
+        with self._condition:
+            return [job.get_info() for job in self.jobs.values()]
+
+    def _run(self) -> None:
+        """Scheduler loop dispatching due jobs"""
+        with self._condition:
+            while not self._stopping:
+                if not self._queue:
+                    self._condition.wait()
+                    continue
+
+                due_at, job_id = self._queue[0]
+                now = time.time()
+                if due_at > now:
+                    self._condition.wait(due_at - now)
+                    continue
+
+                heapq.heappop(self._queue)
+                job = self.jobs.get(job_id)
+                if job is None or job.cancelled or job.next_run != due_at:
+                    continue  # Stale heap entry
+
+                if job.running:
+                    job.coalesced += 1
+                    logger.info("Export job %d (%s) still running, skipping this run", job.id, job.name)
+                else:
+                    job.running = True
+                    job.status = "running"
+                    self._executor.submit(self._execute, job)
+
+                job.schedule_next(now)
+                if job.next_run is not None:
+                    heapq.heappush(self._queue, (job.next_run, job.id))
+
+    def _execute(self, job: ExportJob) -> None:
+        """Run one job on a worker thread and record the outcome"""
+        with self._condition:
+            cancelled = job.cancelled  # Cancelled while waiting for a free worker
+            if cancelled:
+                job.running = False
+                job.status = "cancelled"
+        if cancelled:
+            self.export_manager.log_job(job.id, job.name, "cancelled")
+            return
+        self.export_manager.log_job(job.id, job.name, "running")
+        started = datetime.now().isoformat()
+        try:
+            success = bool(job.action())
+        except Exception as e:
+            logger.error("Export job %d (%s) failed: %s", job.id, job.name, e)
+            success = False
+
+        with self._condition:
+            job.running = False
+            job.runs += 1
+            job.last_run = started
+            job.last_success = success
+            if job.cancelled:
+                job.status = "cancelled"
+            elif job.next_run is None:
+                job.status = "succeeded" if success else "failed"
+            else:
+                job.status = "scheduled"
+        self.export_manager.log_job(job.id, job.name, "succeeded" if success else "failed", success)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop scheduling and optionally wait for running exports"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,195 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Union
+import numpy as np
+from models.entities import Grade
+
+# GradeStore and GradeAnalytics class content
+
+GroupKey = Union[str, int]
+
+
+class GradeStore:
+    """Columnar grade store backed by growable NumPy arrays
+
+    Each grade is one row across the columns below. Subjects and classes are
+    interned to integer codes so grouping works on plain integer arrays.
+    Grade IDs arrive in increasing order, which lets update() find a row by
+    binary search; a store fed out of order falls back to a linear scan.
+    """
+
+    COLUMNS = {
+        'grade_id': np.int64,
+        'student_id': np.int64,
+        'class_code': np.int32,
+        'subject_code': np.int32,
+        'teacher_id': np.int64,
+        'value': np.int8,
+        'timestamp': np.float64  # POSIX seconds
+    }
+
+    def __init__(self, capacity: int = 1024):
+        self._size = 0
+        self.ordered = True  # Grade IDs strictly increasing, so searchsorted finds rows
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.zeros(capacity, dtype=dtype) for name, dtype in self.COLUMNS.items()
+        }
+        self.subjects: List[str] = []
+        self.classes: List[str] = []
+        self._subject_codes: Dict[str, int] = {}
+        self._class_codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def column(self, name: str) -> np.ndarray:
+        """Get read-only view of a column"""
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    @staticmethod
+    def _intern(value: str, codes: Dict[str, int], labels: List[str]) -> int:
+        """Map label to a stable integer code"""
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(labels)
+            labels.append(value)
+        return code
+
+    def append(self, grade: Grade, class_id: str) -> None:
+        """Add grade row (grade IDs are expected to be increasing)"""
+        if self._size == len(self._columns['grade_id']):
+            for name, values in self._columns.items():
+                self._columns[name] = np.resize(values, max(len(values) * 2, 1024))
+
+        row = self._size
+        columns = self._columns
+        if row and grade.id <= columns['grade_id'][row - 1]:
+            self.ordered = False
+        columns['grade_id'][row] = grade.id
+        columns['student_id'][row] = grade.student_id
+        columns['class_code'][row] = self._intern(class_id, self._class_codes, self.classes)
+        columns['subject_code'][row] = self._intern(grade.subject, self._subject_codes, self.subjects)
+        columns['teacher_id'][row] = grade.teacher_id
+        columns['value'][row] = grade.value
+        columns['timestamp'][row] = datetime.fromisoformat(grade.date).timestamp()
+        self._size += 1
+
+    def update(self, grade_id: int, value: int) -> bool:
+        """Change value of a stored grade"""
+        grade_ids = self._columns['grade_id'][:self._size]
+        if self.ordered:
+            row = int(np.searchsorted(grade_ids, grade_id))
+        else:
+            matches = np.flatnonzero(grade_ids == grade_id)
+            row = int(matches[0]) if len(matches) else self._size
+        if row < self._size and grade_ids[row] == grade_id:
+            self._columns['value'][row] = value
+            return True
+        return False
+
+
+class GradeAnalytics:
+    """Vectorized grade statistics over a GradeStore"""
+
+    GROUP_COLUMNS = {'class': 'class_code', 'subject': 'subject_code', 'teacher': 'teacher_id'}
+    DEFAULT_PERCENTILES = (25, 50, 75, 90)
+
+    def __init__(self, store: GradeStore):
+        self.store = store
+
+    def _select(self, since: Optional[datetime]) -> np.ndarray:
+        """Row mask for grades recorded at or after since"""
+        if since is None:
+            return np.ones(len(self.store), dtype=bool)
+        return self.store.column('timestamp') >= since.timestamp()
+
+    def _labels(self, group_by: str, keys: np.ndarray) -> List[GroupKey]:
+        """Turn group codes into readable labels"""
+        if group_by == 'class':
+            return [self.store.classes[key] for key in keys]
+        if group_by == 'subject':
+            return [self.store.subjects[key] for key in keys]
+        return [int(key) for key in keys]
+
+    def summary(self, group_by: Optional[str] = None, since: Optional[datetime] = None,
+                percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict:
+        """Count, mean, std, min, max and percentiles, overall or per group
+
+        group_by is one of 'class', 'subject' or 'teacher'. Without it a single
+        stats dict is returned, otherwise a {group label: stats} dict.
+        """
+        mask = self._select(since)
+        values = self.store.column('value')[mask].astype(np.float64)
+        if group_by is None:
+            groups = np.zeros(len(values), dtype=np.int64)
+        else:
+            groups = self.store.column(self.GROUP_COLUMNS[group_by])[mask]
+
+        if len(values) == 0:
+            return {} if group_by else self._empty_stats(percentiles)
+
+        keys, inverse = np.unique(groups, return_inverse=True)
+        counts = np.bincount(inverse)
+        sums = np.bincount(inverse, weights=values)
+        squares = np.bincount(inverse, weights=values * values)
+        means = sums / counts
+        stds = np.sqrt(np.maximum(squares / counts - means * means, 0.0))
+
+        # Sort by (group, value) so each group is a contiguous sorted run
+        order = np.lexsort((values, inverse))
+        sorted_values = values[order]
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        minimums = sorted_values[starts]
+        maximums = sorted_values[starts + counts - 1]
+        quantiles = {q: self._grouped_percentile(sorted_values, starts, counts, q)
+                     for q in set(percentiles) | {50}}
+
+        result = {}
+        for index, label in enumerate(self._labels(group_by, keys) if group_by else [None]):
+            stats = {
+                'count': int(counts[index]),
+                'mean': float(means[index]),
+                'std': float(stds[index]),
+                'min': float(minimums[index]),
+                'max': float(maximums[index])
+            }
+            stats['median'] = float(quantiles[50][index])
+            for q in percentiles:
+                stats[f'p{q:g}'] = float(quantiles[q][index])
+            result[label] = stats
+
+        return result if group_by else result[None]
+
+    @staticmethod
+    def _grouped_percentile(sorted_values: np.ndarray, starts: np.ndarray,
+                            counts: np.ndarray, q: float) -> np.ndarray:
+        """Linear-interpolated percentile of every sorted group run"""
+        position = (counts - 1) * (q / 100.0)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, counts - 1)
+        fraction = position - lower
+        return sorted_values[starts + lower] * (1 - fraction) + sorted_values[starts + upper] * fraction
+
+    @staticmethod
+    def _empty_stats(percentiles: Sequence[float]) -> Dict:
+        """Stats for an empty selection"""
+        stats = {'count': 0, 'mean': 0.0, 'std': 0.0, 'min': 0.0, 'max': 0.0, 'median': 0.0}
+        stats.update({f'p{q:g}': 0.0 for q in percentiles})
+        return stats
+
+    def histogram(self, group_by: Optional[str] = None, since: Optional[datetime] = None) -> Dict:
+        """Number of grades per value 1-5, overall or per group"""
+        mask = self._select(since)
+        values = self.store.column('value')[mask].astype(np.int64)
+        if group_by is None:
+            counts = np.bincount(values, minlength=6)[1:6]
+            return {value: int(count) for value, count in zip(range(1, 6), counts)}
+
+        groups = self.store.column(self.GROUP_COLUMNS[group_by])[mask]
+        keys, inverse = np.unique(groups, return_inverse=True)
+        table = np.bincount(inverse * 6 + values, minlength=len(keys) * 6).reshape(len(keys), 6)[:, 1:6]
+        return {
+            label: {value: int(count) for value, count in zip(range(1, 6), row)}
+            for label, row in zip(self._labels(group_by, keys), table)
+        }
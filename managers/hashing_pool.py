@@ -0,0 +1,64 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
+import logging
+from models import passwords
+from models.base import AbstractRole
+
+logger = logging.getLogger(__name__)
+
+# HashingPool class content
+
+
+class HashingPool:
+    """Bounded worker pool for password hashing and verification
+
+    hashlib's scrypt and pbkdf2_hmac release the GIL while deriving keys, so a
+    thread pool runs them in parallel. At most max_workers hashes run at once
+    and at most max_pending more wait; further requests block for up to
+    timeout and are then rejected, so a login burst cannot take every core or
+    pile up unbounded work.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 timeout: float = 5.0):
+        self.max_workers = max_workers or max(1, min(4, (os.cpu_count() or 2) // 2))
+        self.max_pending = max_pending if max_pending is not None else self.max_workers * 8
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+
+    def submit(self, function: Callable, *args) -> Optional[Future]:
+        """Queue hashing work, or return None when the pool is saturated"""
+        if not self._slots.acquire(timeout=self.timeout):
+            logger.warning("Password hashing pool saturated, request rejected")
+            return None
+        try:
+            future = self._executor.submit(function, *args)
+        except RuntimeError:
+            self._slots.release()  # Pool already shut down
+            return None
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def verify(self, user: AbstractRole, password: str) -> bool:
+        """Verify user password on a pool worker"""
+        future = self.submit(user.verify_password, password)
+        return future is not None and future.result()
+
+    def hash(self, password: str) -> Optional[str]:
+        """Hash password with the default hasher on a pool worker"""
+        future = self.submit(passwords.hash_password, password)
+        return future.result() if future is not None else None
+
+    def hash_many(self, values: Iterable[str],
+                  hasher: Optional[passwords.PasswordHasher] = None) -> List[Optional[str]]:
+        """Hash many passwords in parallel (default hasher unless given), keeping input order"""
+        function = hasher.hash if hasher is not None else passwords.hash_password
+        futures = [self.submit(function, password) for password in values]
+        return [future.result() if future is not None else None for future in futures]
+
+    def shutdown(self) -> None:
+        """Finish queued work and stop the workers"""
+        self._executor.shutdown(wait=True)
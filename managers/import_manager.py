@@ -0,0 +1,535 @@
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import time
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from openpyxl import load_workbook
+import logging
+from managers.data_manager import DataManager
+from managers.hashing_pool import HashingPool
+from models import passwords
+from models.entities import Assignment
+
+logger = logging.getLogger(__name__)
+
+# ImportManager class content
+
+Row = Dict[str, str]  # {normalized header: cell text}
+LocatedRows = Iterator[Tuple[str, Row]]  # (location such as "users.csv row 12", row)
+Fail = Callable[[str, str, str], None]  # Reports (table, location, error) of a rejected row
+
+_EMAIL = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+class RowError(ValueError):
+    """Validation failure of a single import row"""
+
+
+def _column(name: Any) -> str:
+    """Normalize header so "User ID", "user_id" and "USER ID" match"""
+    return _text(name).lower().replace("_", " ")
+
+
+def _text(value: Any) -> str:
+    """Cell value as stripped text (XLSX cells come typed)"""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _split(value: str) -> List[str]:
+    """Split a comma-separated cell into its non-empty items"""
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _int(row: Row, column: str, required: bool = True) -> Optional[int]:
+    """Parse an integer column"""
+    value = row.get(column, "")
+    if not value:
+        if required:
+            raise RowError(f"Missing {column}")
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise RowError(f"Invalid {column}: {value!r}") from None
+
+
+def _timestamp(row: Row, column: str) -> Optional[str]:
+    """Validate an optional ISO timestamp column"""
+    value = row.get(column, "")
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).isoformat()
+    except ValueError:
+        raise RowError(f"Invalid {column}: {value!r}") from None
+
+
+def _open_text(path: str):
+    """Open a plain, gzip or zstd CSV file as text"""
+    if path.endswith(".gz"):
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    if path.endswith(".zst"):
+        import zstandard
+        reader = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+        return io.TextIOWrapper(reader, encoding='utf-8', newline='')
+    return open(path, encoding='utf-8-sig', newline='')  # utf-8-sig drops the BOM spreadsheets add
+
+
+class _ProfileRows:
+    """Students or Teachers rows, read just ahead of the users rows they belong to
+
+    Exports sort every table by user ID, so rows are read only up to the
+    largest user ID of the current users batch and memory stays bounded by
+    one batch. A row that comes after its user was already imported is
+    handed back by late() so it can be applied to the stored user.
+    """
+
+    def __init__(self, table: str, rows: LocatedRows, report: Dict, fail: Fail):
+        self.table = table
+        self.imported: Set[int] = set()  # IDs of this table's users imported so far
+        self._rows = self._validated(rows, report['tables'][table], fail)
+        self._pending: Dict[int, Tuple[str, Row]] = {}  # {user_id: (location, row)} read, not yet claimed
+        self._next: Optional[Tuple[int, str, Row]] = None  # First row beyond the last bound
+
+    def _validated(self, rows: LocatedRows, counts: Dict, fail: Fail) -> Iterator[Tuple[int, str, Row]]:
+        """Yield (user_id, location, row), reporting rows without a valid user ID"""
+        for location, row in rows:
+            counts['rows'] += 1
+            try:
+                user_id = _int(row, 'user id')
+                if self.table == 'teachers':
+                    _int(row, 'workload', required=False)
+            except RowError as e:
+                fail(self.table, location, str(e))
+                continue
+            yield user_id, location, row
+
+    def read_until(self, bound: int) -> None:
+        """Read rows up to the first one with a user ID above bound"""
+        while True:
+            if self._next is None:
+                self._next = next(self._rows, None)
+                if self._next is None:
+                    return
+            user_id, location, row = self._next
+            if user_id > bound:
+                return
+            self._next = None
+            self._pending[user_id] = (location, row)
+
+    def pop(self, user_id: Optional[int]) -> Optional[Tuple[str, Row]]:
+        """Claim the row of a user"""
+        return self._pending.pop(user_id, None)
+
+    def late(self) -> List[Tuple[int, str, Row]]:
+        """Take the pending rows of users imported before their row was read"""
+        return [(user_id, *self._pending.pop(user_id)) for user_id in list(self._pending)
+                if user_id in self.imported]
+
+    def remaining(self) -> Iterator[Tuple[int, str, Row]]:
+        """Every row not claimed yet, reading the rest of the table"""
+        for user_id, (location, row) in self._pending.items():
+            yield user_id, location, row
+        self._pending.clear()
+        if self._next is not None:
+            yield self._next
+            self._next = None
+        yield from self._rows
+
+
+class ImportManager:
+    """Streams users, assignments and grades from CSV/XLSX files into DataManager
+
+    Reads the layouts ExportManager writes: an XLSX workbook with Users,
+    Students, Teachers and Assignments sheets, or a CSV export directory
+    (plain, compressed or split into parts listed in manifest.json), plus an
+    optional Grades sheet / grades.csv. Columns are matched by header name,
+    so a single users table may also carry Password, Grade, Subjects and
+    Classes columns.
+
+    Rows are validated and inserted batch_size at a time, with the Students
+    and Teachers rows of a users batch read alongside it: passwords of a
+    batch are hashed in parallel on a HashingPool, then the batch goes into
+    DataManager under one lock acquisition and one storage commit. A bad row
+    is reported with its location and skipped; it never aborts the import.
+    Key derivation dominates the run time, so large onboardings can pass a
+    cheaper hasher; authenticate_user upgrades those hashes on first login.
+    """
+
+    TABLES = {
+        'users': "Users",
+        'students': "Students",
+        'teachers': "Teachers",
+        'assignments': "Assignments",
+        'grades': "Grades"
+    }
+    MAX_REPORTED_ERRORS = 1000  # Errors kept in the report; errors_file gets all of them
+
+    def __init__(self, data_manager: DataManager, hashing_pool: Optional[HashingPool] = None,
+                 batch_size: int = 1000, hasher: Optional[passwords.PasswordHasher] = None):
+        self.data_manager = data_manager
+        self.hashing_pool = hashing_pool  # None: a pool using every core is created per import
+        self.batch_size = batch_size
+        self.hasher = hasher  # None: default hasher
+        self._templates: Dict[str, Dict[str, Any]] = {}
+
+    def import_data(self, source: str, default_password: Optional[str] = None,
+                    errors_file: Optional[str] = None) -> Dict[str, Any]:
+        """Import an XLSX workbook or CSV export directory, returning a report
+
+        default_password is used for users without a Password or Password
+        Hash column (exports never contain plain passwords). errors_file
+        receives every rejected row as CSV.
+        """
+        report = {
+            'source': source,
+            'tables': {table: {'rows': 0, 'imported': 0, 'failed': 0} for table in self.TABLES},
+            'errors': [],
+            'error_count': 0
+        }
+        start = time.perf_counter()
+        workbook = None
+        pool = self.hashing_pool
+        own_pool = pool is None
+        errors = None
+        try:
+            if source.lower().endswith(".xlsx"):
+                workbook = load_workbook(source, read_only=True)
+                tables = {table: self._iter_sheet(workbook, title) for table, title in self.TABLES.items()}
+            else:
+                tables = {table: self._iter_csv(self._csv_files(source, table)) for table in self.TABLES}
+
+            if errors_file:
+                errors = open(errors_file, 'w', newline='', encoding='utf-8')
+                error_writer = csv.writer(errors)
+                error_writer.writerow(["Table", "Location", "Error"])
+                report['errors_file'] = errors_file
+            else:
+                error_writer = None
+
+            def fail(table: str, location: str, error: str) -> None:
+                report['tables'][table]['failed'] += 1
+                report['error_count'] += 1
+                if len(report['errors']) < self.MAX_REPORTED_ERRORS:
+                    report['errors'].append({'table': table, 'location': location, 'error': error})
+                if error_writer is not None:
+                    error_writer.writerow([table, location, error])
+
+            if own_pool:
+                pool = HashingPool(max_workers=os.cpu_count() or 1)
+            profiles = {table: _ProfileRows(table, tables[table], report, fail) for table in ('students', 'teachers')}
+            self._import_users(tables['users'], profiles, pool, default_password, report, fail)
+            for profile_rows in profiles.values():
+                remaining = profile_rows.remaining()
+                while True:
+                    batch = list(islice(remaining, self.batch_size))
+                    if not batch:
+                        break
+                    self._apply_profiles(profile_rows, batch, report, fail)
+            self._import_assignments(tables['assignments'], report, fail)
+            self._import_grades(tables['grades'], report, fail)
+
+        except Exception as e:
+            logger.error("Import from %s failed: %s", source, e)
+            report['error'] = str(e)
+        finally:
+            if workbook is not None:
+                workbook.close()
+            if own_pool and pool is not None:
+                pool.shutdown()
+            if errors is not None:
+                errors.close()
+
+        report['seconds'] = round(time.perf_counter() - start, 3)
+        imported = sum(counts['imported'] for counts in report['tables'].values())
+        report['rows_per_sec'] = round(imported / report['seconds']) if report['seconds'] else None
+        logger.info("Import from %s: %d rows imported, %d rejected in %.1fs",
+                    source, imported, report['error_count'], report['seconds'])
+        return report
+
+    def _csv_files(self, directory: str, table: str) -> List[str]:
+        """Files holding a table in a CSV export directory, parts in order"""
+        manifest_path = os.path.join(directory, "manifest.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as f:
+                entry = json.load(f)['tables'].get(table)
+            if entry is not None:
+                return [os.path.join(directory, part['file']) for part in entry['parts']]
+
+        for extension in (".csv", ".csv.gz", ".csv.zst"):
+            path = os.path.join(directory, table + extension)
+            if os.path.exists(path):
+                return [path]
+        return []
+
+    @staticmethod
+    def _iter_csv(paths: List[str]) -> LocatedRows:
+        """Stream rows of CSV files, each file with its own header row"""
+        for path in paths:
+            name = os.path.basename(path)
+            with _open_text(path) as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if header is None:
+                    continue
+                columns = [_column(name) for name in header]
+                for number, values in enumerate(reader, start=2):
+                    if any(values):
+                        yield f"{name} row {number}", dict(zip(columns, map(_text, values)))
+
+    @staticmethod
+    def _iter_sheet(workbook, title: str) -> LocatedRows:
+        """Stream rows of a workbook sheet, nothing when the sheet is missing"""
+        if title not in workbook.sheetnames:
+            return
+        rows = workbook[title].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [_column(name) for name in header]
+        for number, values in enumerate(rows, start=2):
+            if any(value is not None for value in values):
+                yield f"{title} row {number}", dict(zip(columns, map(_text, values)))
+
+    def _template(self, role: str) -> Dict[str, Any]:
+        """Default record of a role, built once so rows need no constructor (and no hash)"""
+        if role not in self._templates:
+            extra = {'Student': ("",), 'Teacher': ([],)}.get(role, ())  # grade / subjects
+            user = self.data_manager.USER_TYPES[role](0, "", "", "", *extra)
+            self._templates[role] = user.to_record()
+        return self._templates[role]
+
+    @staticmethod
+    def _profile_fields(role: str, details: Row, partial: bool = False) -> Dict[str, Any]:
+        """Role-specific fields from a users row merged with its Students/Teachers row
+
+        partial leaves out fields whose columns are empty, for a profile
+        applied to an already imported user.
+        """
+        if role == "Student":
+            grade = details.get('grade') or details.get('class id') or details.get('class', "")
+            subjects = {}
+            for item in _split(details.get('subjects', "")):
+                subject, _, teacher = item.partition(":")  # "Mathematics" or "Mathematics:12"
+                subjects[subject.strip()] = int(teacher) if teacher.strip().isdigit() else 0
+            fields = {'grade': grade, 'subjects': subjects}
+            given = {'grade': bool(grade), 'subjects': bool(details.get('subjects'))}
+        elif role == "Teacher":
+            fields = {'subjects': _split(details.get('subjects', "")),
+                      'classes': _split(details.get('classes', "")),
+                      'workload': _int(details, 'workload', required=False) or 0}
+            given = {column: bool(details.get(column)) for column in fields}
+        else:
+            return {}
+        if partial:
+            return {column: value for column, value in fields.items() if given[column]}
+        return fields
+
+    def _apply_profiles(self, profile_rows: _ProfileRows, rows: List[Tuple[int, str, Row]],
+                        report: Dict, fail: Fail) -> None:
+        """Apply Students/Teachers rows read after their users were imported"""
+        counts = report['tables'][profile_rows.table]
+        role = profile_rows.table[:-1].capitalize()
+        with self.data_manager.bulk():
+            for user_id, location, row in rows:
+                if user_id not in profile_rows.imported:
+                    fail(profile_rows.table, location, "User ID not found in users table")
+                elif self.data_manager.update_user_profile(user_id, **self._profile_fields(role, row, partial=True)):
+                    counts['imported'] += 1
+                else:
+                    fail(profile_rows.table, location, "Profile could not be applied to the user")
+
+    def _user_record(self, row: Row, profile: Optional[Row], default_password: Optional[str]) -> Tuple[Dict, Optional[str]]:
+        """Validate a users row, returning its record and the password still to hash"""
+        role = row.get('role', "").capitalize()
+        if role not in self.data_manager.USER_TYPES:
+            raise RowError(f"Invalid role: {row.get('role', '')!r}")
+        full_name = row.get('full name', "")
+        if not full_name:
+            raise RowError("Missing full name")
+        email = row.get('email', "")
+        if not _EMAIL.match(email):
+            raise RowError(f"Invalid email: {email!r}")
+        if self.data_manager.get_user_by_email(email) is not None:
+            raise RowError(f"Email already registered: {email}")  # Checked before paying for a hash
+
+        user_id = _int(row, 'id', required=False)
+        if user_id is None:
+            user_id = self.data_manager.get_next_id()
+        elif user_id < 1:
+            raise RowError(f"Invalid id: {user_id}")
+        elif user_id in self.data_manager.users:
+            raise RowError(f"User ID already registered: {user_id}")
+
+        record = dict(self._template(role))
+        record.update({
+            'id': user_id,
+            'full_name': full_name,
+            'email': email,
+            'created_at': _timestamp(row, 'created at') or datetime.now().isoformat(),
+            'phone': row.get('phone', ""),
+            'address': row.get('address', "")
+        })
+
+        details = dict(row)
+        if profile is not None:
+            details.update({column: value for column, value in profile.items() if value})
+        record.update(self._profile_fields(role, details))
+        if role == "Student":
+            record['assignments'] = {}
+
+        password_hash = row.get('password hash', "")
+        if password_hash:
+            try:
+                passwords.identify_hasher(password_hash)
+            except KeyError:
+                raise RowError("Unknown password hash format") from None
+            if '$' not in password_hash and not re.fullmatch(r"[0-9a-f]{64}", password_hash):
+                raise RowError("Unknown password hash format")
+            record['password_hash'] = password_hash
+            return record, None
+
+        password = row.get('password', "") or default_password
+        if not password:
+            raise RowError("Missing password")
+        return record, password
+
+    def _import_users(self, rows: LocatedRows, profiles: Dict[str, _ProfileRows], pool: Optional[HashingPool],
+                      default_password: Optional[str], report: Dict, fail: Fail) -> None:
+        """Validate, hash and insert users batch by batch"""
+        counts = report['tables']['users']
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            counts['rows'] += len(batch)
+            user_ids = [int(row['id']) if row.get('id', "").isdigit() else None for _, row in batch]
+            bound = max((user_id for user_id in user_ids if user_id is not None), default=0)
+            for profile_rows in profiles.values():
+                profile_rows.read_until(bound)
+
+            valid = []
+            for (location, row), user_id in zip(batch, user_ids):
+                # Students/Teachers rows of this user, merged into its record
+                profile_table = row.get('role', "").lower() + "s"
+                profile = profiles[profile_table].pop(user_id) if profile_table in profiles else None
+                try:
+                    record, password = self._user_record(row, profile[1] if profile else None, default_password)
+                    valid.append((location, record, password, profile_table if profile else None))
+                except RowError as e:
+                    fail('users', location, str(e))
+                    if profile:
+                        fail(profile_table, profile[0], "User row rejected")
+
+            # Key derivation runs in parallel and outside every DataManager lock
+            pending = [password for _, _, password, _ in valid if password is not None]
+            if pool is not None:
+                hashes = pool.hash_many(pending, self.hasher)
+            else:
+                hashes = [None] * len(pending)
+            hash_iter = iter(hashes)
+            users = []
+            for _, record, password, _ in valid:
+                if password is not None:
+                    password_hash = next(hash_iter)
+                    if password_hash is None:  # Pool saturated or unavailable
+                        password_hash = (self.hasher or passwords.get_default_hasher()).hash(password)
+                    record['password_hash'] = password_hash
+                users.append(self.data_manager.USER_TYPES[record['role']].from_record(record))
+
+            for (location, record, _, profile_table), added in zip(valid, self.data_manager.add_users(users)):
+                if added:
+                    counts['imported'] += 1
+                    if profile_table:
+                        report['tables'][profile_table]['imported'] += 1
+                    if record['role'] in ("Student", "Teacher"):
+                        profiles[record['role'].lower() + "s"].imported.add(record['id'])
+                else:
+                    fail('users', location, "Email or ID already registered")
+            for profile_rows in profiles.values():
+                self._apply_profiles(profile_rows, profile_rows.late(), report, fail)
+
+    def _import_assignments(self, rows: LocatedRows, report: Dict, fail: Fail) -> None:
+        """Validate and insert assignments batch by batch"""
+        counts = report['tables']['assignments']
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            counts['rows'] += len(batch)
+
+            assignments, locations = [], []
+            for location, row in batch:
+                try:
+                    title, subject = row.get('title', ""), row.get('subject', "")
+                    class_id = row.get('class id', "")
+                    if not title or not subject or not class_id:
+                        raise RowError("Missing title, subject or class id")
+                    teacher_id = _int(row, 'teacher id')
+                    if teacher_id not in self.data_manager.teachers:
+                        raise RowError(f"Unknown teacher: {teacher_id}")
+                    deadline = _timestamp(row, 'deadline')
+                    if deadline is None:
+                        raise RowError("Missing deadline")
+                    assignment_id = _int(row, 'id', required=False) or self.data_manager.get_next_assignment_id()
+                    assignments.append(Assignment(assignment_id, title, row.get('description', ""), deadline,
+                                                  subject, teacher_id, class_id, row.get('difficulty') or "medium"))
+                    locations.append(location)
+                except RowError as e:
+                    fail('assignments', location, str(e))
+
+            for location, added in zip(locations, self.data_manager.add_assignments(assignments)):
+                if added:
+                    counts['imported'] += 1
+                else:
+                    fail('assignments', location, "Assignment ID already exists")
+
+    def _import_grades(self, rows: LocatedRows, report: Dict, fail: Fail) -> None:
+        """Validate and insert grades batch by batch"""
+        counts = report['tables']['grades']
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            counts['rows'] += len(batch)
+
+            grades, locations = [], []
+            for location, row in batch:
+                try:
+                    student_id = _int(row, 'student id', required=False)
+                    if student_id is None and row.get('student email'):
+                        student = self.data_manager.get_user_by_email(row['student email'])
+                        student_id = student._id if student is not None else None
+                    if student_id not in self.data_manager.students:
+                        raise RowError("Unknown student")
+                    subject = row.get('subject', "")
+                    if not subject:
+                        raise RowError("Missing subject")
+                    value = _int(row, 'value')
+                    if not 1 <= value <= 5:
+                        raise RowError(f"Grade value out of range 1-5: {value}")
+                    teacher_id = _int(row, 'teacher id')
+                    if teacher_id not in self.data_manager.teachers:
+                        raise RowError(f"Unknown teacher: {teacher_id}")
+                    grades.append((student_id, subject, value, teacher_id, row.get('comment', ""),
+                                   _timestamp(row, 'date')))
+                    locations.append(location)
+                except RowError as e:
+                    fail('grades', location, str(e))
+
+            for location, grade in zip(locations, self.data_manager.add_grades(grades)):
+                if grade is not None:
+                    counts['imported'] += 1
+                else:
+                    fail('grades', location, "Student removed during import")
@@ -0,0 +1,144 @@
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+import logging
+from managers.data_manager import DataManager
+
+logger = logging.getLogger(__name__)
+
+# NotificationDispatcher class content
+
+
+class Broadcast:
+    """Queued notification broadcast and its delivery progress"""
+
+    __slots__ = ('id', 'message', 'target', 'value', 'roles', 'priority', 'status',
+                 'recipients', 'delivered', 'created_at', 'seconds', 'done')
+
+    def __init__(self, broadcast_id: int, message: str, target: str, value: Optional[str],
+                 roles: Optional[List[str]], priority: str):
+        self.id = broadcast_id
+        self.message = message
+        self.target = target
+        self.value = value
+        self.roles = roles
+        self.priority = priority
+        self.status = "queued"
+        self.recipients = 0
+        self.delivered = 0
+        self.created_at = datetime.now().isoformat()
+        self.seconds: Optional[float] = None  # Resolution plus delivery time
+        self.done = threading.Event()
+
+    def get_info(self) -> Dict:
+        """Get broadcast status information"""
+        audience = self.target if self.value is None else f"{self.target} {self.value}"
+        if self.roles:
+            audience += f" ({', '.join(self.roles)})"
+        return {
+            'id': self.id,
+            'audience': audience,
+            'message': self.message,
+            'priority': self.priority,
+            'status': self.status,
+            'recipients': self.recipients,
+            'delivered': self.delivered,
+            'created_at': self.created_at,
+            'seconds': self.seconds
+        }
+
+
+class NotificationDispatcher:
+    """Delivers broadcast notifications from a queue on a worker thread
+
+    broadcast() only queues the request, so a school-wide message returns
+    immediately. The worker resolves recipients through DataManager's class,
+    parent and role indexes and appends the notifications batch_size
+    recipients at a time, each batch under one lock hold and one journal
+    record, so other writers interleave with a large broadcast.
+    """
+
+    TARGETS = ("class", "grade", "role", "all")
+
+    def __init__(self, data_manager: DataManager, batch_size: int = 1000, history: int = 100):
+        self.data_manager = data_manager
+        self.batch_size = batch_size
+        self.broadcasts: Dict[int, Broadcast] = {}  # Latest history broadcasts
+        self.history = history
+        self._queue: 'queue.Queue[Optional[Broadcast]]' = queue.Queue()
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="notification-dispatcher", daemon=True)
+        self._thread.start()
+
+    def broadcast(self, message: str, target: str = "all", value: Optional[str] = None,
+                  roles: Optional[Iterable[str]] = None, priority: str = "normal") -> Broadcast:
+        """Queue a notification for a class, grade level, role or everyone"""
+        if target not in self.TARGETS:
+            raise ValueError(f"Unknown broadcast target: {target}")
+        if target != "all" and not value:
+            raise ValueError(f"Broadcast to a {target} needs a value")
+
+        with self._lock:
+            item = Broadcast(self._next_id, message, target, value, list(roles) if roles else None, priority)
+            self._next_id += 1
+            self.broadcasts[item.id] = item
+            while len(self.broadcasts) > self.history:
+                del self.broadcasts[next(iter(self.broadcasts))]
+        self._queue.put(item)
+        return item
+
+    def status(self) -> List[Dict]:
+        """Get status of recent broadcasts"""
+        with self._lock:
+            return [item.get_info() for item in self.broadcasts.values()]
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued broadcast has been delivered"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _run(self) -> None:
+        """Worker loop draining the broadcast queue"""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._deliver(item)
+            finally:
+                self._queue.task_done()
+
+    def _deliver(self, item: Broadcast) -> None:
+        """Resolve recipients and append notifications batch by batch"""
+        start = time.perf_counter()
+        item.status = "delivering"
+        try:
+            recipients = self.data_manager.get_recipients(item.target, item.value, item.roles)
+            item.recipients = len(recipients)
+            for offset in range(0, len(recipients), self.batch_size):
+                item.delivered += self.data_manager.add_notifications(
+                    recipients[offset:offset + self.batch_size], item.message, item.priority)
+            item.status = "delivered"
+        except Exception as e:
+            logger.error("Broadcast %d failed: %s", item.id, e)
+            item.status = "failed"
+        finally:
+            item.seconds = time.perf_counter() - start
+            item.done.set()
+        logger.info("Broadcast %d to %s: %d of %d delivered in %.2fs", item.id, item.get_info()['audience'],
+                    item.delivered, item.recipients, item.seconds)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker, by default after delivering everything queued"""
+        self._queue.put(None)
+        if wait:
+            self._thread.join()
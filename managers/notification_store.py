@@ -0,0 +1,141 @@
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from models.entities import Notification
+from models.inbox import NotificationInbox
+
+# NotificationStore class content
+
+
+class NotificationStore:
+    """Every notification in the system, indexed by recipient
+
+    Each recipient with notifications owns a NotificationInbox (IDs, unread
+    count and retention per recipient). The store keeps the total and unread
+    counts of all inboxes up to date as notifications are added, read,
+    evicted and deleted, so counting costs O(1) and paging or marking one
+    recipient's notifications touches only that inbox, however many users
+    there are. Not thread-safe on its own: DataManager guards it with its
+    notifications lock.
+    """
+
+    def __init__(self):
+        self._inboxes: Dict[int, NotificationInbox] = {}  # {recipient_id: inbox}
+        self.total = 0
+        self.unread = 0
+
+    def __len__(self) -> int:
+        return self.total
+
+    def inboxes(self) -> Iterator[Tuple[int, NotificationInbox]]:
+        """Yield (recipient_id, inbox) pairs"""
+        yield from self._inboxes.items()
+
+    def _inbox(self, recipient_id: int) -> NotificationInbox:
+        """Get a recipient's inbox, creating it on first use"""
+        inbox = self._inboxes.get(recipient_id)
+        if inbox is None:
+            inbox = self._inboxes[recipient_id] = NotificationInbox()
+        return inbox
+
+    def _adjust(self, inbox: NotificationInbox, size: int, unread: int) -> None:
+        """Apply an inbox's change since (size, unread) to the global counters"""
+        self.total += len(inbox) - size
+        self.unread += inbox.unread - unread
+
+    def add(self, recipient_id: int, message: str, priority: str = "normal",
+            created_at: Optional[str] = None) -> Notification:
+        """Create a notification with the recipient's next ID"""
+        notification = self._inbox(recipient_id).add(message, recipient_id, priority, created_at)
+        self.total += 1
+        self.unread += 1
+        return notification
+
+    def insert(self, notification: Notification) -> None:
+        """Store an existing notification, keeping its ID and read state"""
+        self._inbox(notification.recipient_id).insert(notification)
+        self.total += 1
+        self.unread += not notification.is_read
+
+    def restore(self, recipient_id: int, records: Iterable[Dict[str, Any]], next_id: int = 1) -> None:
+        """Load a recipient's stored notifications and ID counter"""
+        for record in records:
+            self.insert(Notification.from_record(record, recipient_id))
+        self.reserve(recipient_id, next_id)
+
+    def next_id(self, recipient_id: int) -> int:
+        """ID the recipient's next notification will get"""
+        inbox = self._inboxes.get(recipient_id)
+        return inbox.next_id if inbox is not None else 1
+
+    def reserve(self, recipient_id: int, next_id: int) -> None:
+        """Make sure IDs below next_id are never issued to the recipient again"""
+        inbox = self._inbox(recipient_id)
+        inbox.next_id = max(inbox.next_id, next_id)
+
+    def get(self, recipient_id: int, notification_id: int) -> Optional[Notification]:
+        """Find a recipient's notification by ID"""
+        inbox = self._inboxes.get(recipient_id)
+        return inbox.get(notification_id) if inbox is not None else None
+
+    def remove(self, recipient_id: int, notification_id: int) -> bool:
+        """Delete a recipient's notification by ID"""
+        inbox = self._inboxes.get(recipient_id)
+        if inbox is None:
+            return False
+        size, unread = len(inbox), inbox.unread
+        removed = inbox.remove(notification_id)
+        self._adjust(inbox, size, unread)
+        return removed
+
+    def remove_recipient(self, recipient_id: int) -> int:
+        """Drop every notification of a recipient, returning how many"""
+        inbox = self._inboxes.pop(recipient_id, None)
+        if inbox is None:
+            return 0
+        self.total -= len(inbox)
+        self.unread -= inbox.unread
+        return len(inbox)
+
+    def mark_read(self, recipient_id: int, notification_ids: Optional[Iterable[int]] = None) -> int:
+        """Mark some or all of a recipient's notifications read, returning how many changed"""
+        inbox = self._inboxes.get(recipient_id)
+        if inbox is None:
+            return 0
+        if notification_ids is None:
+            marked = inbox.mark_all_read()
+        else:
+            marked = sum(inbox.mark_read(notification_id) for notification_id in notification_ids)
+        self.unread -= marked
+        return marked
+
+    def evict(self, recipient_id: int) -> List[int]:
+        """Apply the retention limits to a recipient's inbox"""
+        inbox = self._inboxes.get(recipient_id)
+        if inbox is None:
+            return []
+        size, unread = len(inbox), inbox.unread
+        evicted = inbox.evict()
+        if evicted:
+            self._adjust(inbox, size, unread)
+        return evicted
+
+    def page(self, recipient_id: int, offset: int = 0, limit: Optional[int] = None) -> List[Notification]:
+        """Get a recipient's notifications, high priority first"""
+        inbox = self._inboxes.get(recipient_id)
+        if inbox is None:
+            return []
+        return list(islice(inbox, offset, None if limit is None else offset + limit))
+
+    def count(self, recipient_id: int) -> int:
+        """Number of notifications of a recipient"""
+        inbox = self._inboxes.get(recipient_id)
+        return len(inbox) if inbox is not None else 0
+
+    def unread_count(self, recipient_id: int) -> int:
+        """Number of unread notifications of a recipient"""
+        inbox = self._inboxes.get(recipient_id)
+        return inbox.unread if inbox is not None else 0
+
+    def stats(self) -> Dict[str, int]:
+        """Global notification counters"""
+        return {'total': self.total, 'unread': self.unread, 'recipients': len(self._inboxes)}
@@ -0,0 +1,149 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Set
+import logging
+from managers.data_manager import DataManager
+from models.base import User
+
+logger = logging.getLogger(__name__)
+
+# SessionManager class content
+
+
+class Session:
+    """Authenticated session bound to one user"""
+
+    __slots__ = ('token', 'user_id', 'created_at', 'last_used')
+
+    def __init__(self, token: str, user_id: int, created_at: float):
+        self.token = token
+        self.user_id = user_id
+        self.created_at = created_at
+        self.last_used = created_at
+
+
+class SessionManager:
+    """In-memory LRU + TTL session store issuing opaque tokens
+
+    Sessions are kept in an OrderedDict ordered by last use, so resolving a
+    token is one dict lookup plus move_to_end, expired sessions are always at
+    the front, and the least recently used session is evicted when the store
+    is full. Sessions of a user are revoked when DataManager reports a password
+    change or removal.
+    """
+
+    def __init__(self, data_manager: DataManager, max_sessions: int = 10000, ttl: float = 1800.0,
+                 max_lifetime: Optional[float] = 12 * 3600.0, clock: Callable[[], float] = time.monotonic):
+        self.data_manager = data_manager
+        self.max_sessions = max_sessions
+        self.ttl = ttl  # Idle timeout in seconds
+        self.max_lifetime = max_lifetime  # Absolute timeout in seconds
+        self._clock = clock
+        self._sessions: 'OrderedDict[str, Session]' = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+
+        data_manager.add_revocation_listener(self.revoke_user)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def login(self, email: str, password: str) -> Optional[str]:
+        """Verify credentials once and open a session"""
+        user = self.data_manager.authenticate_user(email, password)
+        if user is None:
+            return None
+        return self.create(user)
+
+    def create(self, user: User) -> str:
+        """Open a session for an already authenticated user"""
+        token = secrets.token_urlsafe(32)
+        now = self._clock()
+        with self._lock:
+            self._purge_expired(now)
+            while len(self._sessions) >= self.max_sessions:
+                _, evicted = self._sessions.popitem(last=False)
+                self._unlink(evicted)
+
+            self._sessions[token] = Session(token, user._id, now)
+            self._tokens_by_user.setdefault(user._id, set()).add(token)
+        logger.debug("Session opened for user %s", user._id)
+        return token
+
+    def resolve(self, token: Optional[str]) -> Optional[User]:
+        """Get the user of a live session, refreshing its idle timeout"""
+        if not token:
+            return None
+
+        now = self._clock()
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is None:
+                return None
+            if self._is_expired(session, now):
+                self._remove(session)
+                return None
+
+            session.last_used = now
+            self._sessions.move_to_end(token)
+
+        user = self.data_manager.users.get(session.user_id)
+        if user is None:
+            self.revoke(token)  # User removed while the session was open
+        return user
+
+    def revoke(self, token: str) -> bool:
+        """End a single session (logout)"""
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is None:
+                return False
+            self._remove(session)
+        return True
+
+    def revoke_user(self, user_id: int) -> int:
+        """End every session of a user, returning how many were open"""
+        with self._lock:
+            tokens = self._tokens_by_user.pop(user_id, set())
+            for token in tokens:
+                self._sessions.pop(token, None)
+        if tokens:
+            logger.info("Revoked %d session(s) for user %s", len(tokens), user_id)
+        return len(tokens)
+
+    def purge_expired(self) -> int:
+        """Drop idle sessions, returning how many were removed"""
+        with self._lock:
+            return self._purge_expired(self._clock())
+
+    def _purge_expired(self, now: float) -> int:
+        """Pop expired sessions from the least recently used end"""
+        removed = 0
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_used < self.ttl:
+                break  # Everything after it was used more recently
+            self._remove(session)
+            removed += 1
+        return removed
+
+    def _is_expired(self, session: Session, now: float) -> bool:
+        """Check idle and absolute timeouts"""
+        if now - session.last_used >= self.ttl:
+            return True
+        return self.max_lifetime is not None and now - session.created_at >= self.max_lifetime
+
+    def _remove(self, session: Session) -> None:
+        """Drop session from both indexes (caller holds the lock)"""
+        self._sessions.pop(session.token, None)
+        self._unlink(session)
+
+    def _unlink(self, session: Session) -> None:
+        """Drop session from the per-user token index"""
+        tokens = self._tokens_by_user.get(session.user_id)
+        if tokens is not None:
+            tokens.discard(session.token)
+            if not tokens:
+                del self._tokens_by_user[session.user_id]
@@ -0,0 +1,462 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+import logging
+from managers.storage import Storage, Record
+
+logger = logging.getLogger(__name__)
+
+# SQLiteStorage class content
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id            INTEGER PRIMARY KEY,
+    role          TEXT NOT NULL,
+    full_name     TEXT NOT NULL,
+    email         TEXT NOT NULL,
+    password_hash TEXT NOT NULL,
+    created_at    TEXT NOT NULL,
+    phone         TEXT NOT NULL DEFAULT '',
+    address       TEXT NOT NULL DEFAULT '',
+    extra         TEXT NOT NULL DEFAULT '{}'
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email ON users (email COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_users_role ON users (role);
+
+CREATE TABLE IF NOT EXISTS students (
+    user_id     INTEGER PRIMARY KEY REFERENCES users (id),
+    class_id    TEXT NOT NULL,
+    subjects    TEXT NOT NULL DEFAULT '{}',
+    assignments TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_students_class ON students (class_id);
+
+CREATE TABLE IF NOT EXISTS teachers (
+    user_id  INTEGER PRIMARY KEY REFERENCES users (id),
+    subjects TEXT NOT NULL DEFAULT '[]',
+    classes  TEXT NOT NULL DEFAULT '[]',
+    workload INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS assignments (
+    id          INTEGER PRIMARY KEY,
+    title       TEXT NOT NULL,
+    description TEXT NOT NULL,
+    deadline    TEXT NOT NULL,
+    subject     TEXT NOT NULL,
+    teacher_id  INTEGER NOT NULL,
+    class_id    TEXT NOT NULL,
+    difficulty  TEXT NOT NULL DEFAULT 'medium'
+);
+CREATE INDEX IF NOT EXISTS idx_assignments_class_deadline ON assignments (class_id, deadline);
+CREATE INDEX IF NOT EXISTS idx_assignments_teacher ON assignments (teacher_id);
+CREATE INDEX IF NOT EXISTS idx_assignments_subject ON assignments (subject);
+CREATE INDEX IF NOT EXISTS idx_assignments_deadline ON assignments (deadline);
+
+CREATE TABLE IF NOT EXISTS submissions (
+    assignment_id INTEGER NOT NULL,
+    student_id    INTEGER NOT NULL,
+    content       TEXT NOT NULL,
+    PRIMARY KEY (assignment_id, student_id)
+);
+
+CREATE TABLE IF NOT EXISTS assignment_grades (
+    assignment_id INTEGER NOT NULL,
+    student_id    INTEGER NOT NULL,
+    value         INTEGER NOT NULL,
+    PRIMARY KEY (assignment_id, student_id)
+);
+
+CREATE TABLE IF NOT EXISTS grades (
+    id         INTEGER PRIMARY KEY,
+    student_id INTEGER NOT NULL,
+    subject    TEXT NOT NULL,
+    value      INTEGER NOT NULL,
+    date       TEXT NOT NULL,
+    teacher_id INTEGER NOT NULL,
+    comment    TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_grades_student_subject ON grades (student_id, subject);
+CREATE INDEX IF NOT EXISTS idx_grades_teacher ON grades (teacher_id);
+
+CREATE TABLE IF NOT EXISTS notifications (
+    user_id    INTEGER NOT NULL,
+    id         INTEGER NOT NULL,
+    message    TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    is_read    INTEGER NOT NULL DEFAULT 0,
+    priority   TEXT NOT NULL DEFAULT 'normal',
+    PRIMARY KEY (user_id, id)
+);
+
+CREATE TABLE IF NOT EXISTS schedules (
+    id       INTEGER PRIMARY KEY,
+    class_id TEXT NOT NULL,
+    day      TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS lessons (
+    schedule_id INTEGER NOT NULL,
+    time        TEXT NOT NULL,
+    subject     TEXT NOT NULL,
+    teacher_id  INTEGER NOT NULL,
+    duration    INTEGER NOT NULL,
+    PRIMARY KEY (schedule_id, time)
+);
+"""
+
+# Export table queries, columns match ExportManager sheets
+EXPORT_QUERIES = {
+    'users': """SELECT id, full_name, email, role, created_at, phone, address, password_hash
+                FROM users ORDER BY id""",
+    'students': """SELECT s.user_id, s.class_id, s.subjects,
+                          COALESCE((SELECT AVG(g.value) FROM grades g WHERE g.student_id = s.user_id), 0.0)
+                   FROM students s ORDER BY s.user_id""",
+    'teachers': """SELECT user_id, subjects, classes, workload FROM teachers ORDER BY user_id""",
+    'assignments': """SELECT a.id, a.title, a.subject, a.teacher_id, a.class_id, a.deadline, a.difficulty,
+                             (SELECT COUNT(*) FROM submissions s WHERE s.assignment_id = a.id),
+                             (SELECT COUNT(*) FROM assignment_grades g WHERE g.assignment_id = a.id),
+                             a.description
+                      FROM assignments a ORDER BY a.id""",
+    'grades': """SELECT id, student_id, subject, value, date, teacher_id, comment FROM grades ORDER BY id"""
+}
+
+USER_COLUMNS = {'email', 'role', 'phone', 'address'}
+STUDENT_COLUMNS = {'grade': 'class_id', 'subjects': 'subjects', 'assignments': 'assignments'}
+TEACHER_COLUMNS = {'subjects': 'subjects', 'classes': 'classes', 'workload': 'workload'}
+CORE_RECORD_FIELDS = {
+    'id', 'full_name', 'email', 'password_hash', 'created_at', 'role', 'phone', 'address',
+    'notifications', 'grade', 'subjects', 'assignments', 'classes', 'workload'
+}
+
+
+class SQLiteStorage(Storage):
+    """SQLite persistence backend for DataManager
+
+    Mutations are applied to normalized tables inside a write transaction that
+    is committed every ``commit_batch`` operations or ``commit_interval``
+    seconds. The database runs in WAL mode so other processes can read a
+    consistent view while this one writes.
+    """
+
+    def __init__(self, path: str = "eduplatform.db", commit_batch: int = 500,
+                 commit_interval: float = 1.0):
+        self.path = path
+        self.commit_batch = commit_batch
+        self.commit_interval = commit_interval
+        self._pending = 0
+        self._last_commit = time.monotonic()
+        self._lock = threading.RLock()  # One connection shared by writers and export readers
+
+        # Transactions are managed explicitly so writes can be batched
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+        self._handlers = {
+            'user.add': self._add_user,
+            'user.remove': self._remove_user,
+            'user.email': self._update_email,
+            'user.password': self._update_password,
+            'user.update': self._update_user,
+            'assignment.add': self._add_assignment,
+            'assignment.remove': self._remove_assignment,
+            'assignment.grade': self._grade_assignment,
+            'submission': self._add_submission,
+            'grade.add': self._add_grade,
+            'grade.update': self._update_grade,
+            'notification.add': self._add_notification,
+            'notification.bulk': self._add_notification_bulk,
+            'notification.read': self._mark_notifications_read,
+            'notification.delete': self._delete_notification,
+            'schedule.add': self._add_schedule,
+            'schedule.lesson.add': self._add_lesson,
+            'schedule.lesson.remove': self._remove_lesson
+        }
+
+    def load(self) -> Iterator[Record]:
+        """Yield records that rebuild DataManager state from the tables"""
+        self.sync()
+        cursor = self.connection.cursor()
+
+        students = {row[0]: row[1:] for row in cursor.execute(
+            "SELECT user_id, class_id, subjects, assignments FROM students")}
+        teachers = {row[0]: row[1:] for row in cursor.execute(
+            "SELECT user_id, subjects, classes, workload FROM teachers")}
+
+        for row in cursor.execute("""SELECT id, full_name, email, password_hash, created_at, role,
+                                            phone, address, extra FROM users ORDER BY id"""):
+            record = {
+                'id': row[0], 'full_name': row[1], 'email': row[2], 'password_hash': row[3],
+                'created_at': row[4], 'role': row[5], 'phone': row[6], 'address': row[7]
+            }
+            record.update(json.loads(row[8]))
+            if row[0] in students:
+                class_id, subjects, assignments = students[row[0]]
+                record.update(grade=class_id, subjects=json.loads(subjects), assignments=json.loads(assignments))
+            elif row[0] in teachers:
+                subjects, classes, workload = teachers[row[0]]
+                record.update(subjects=json.loads(subjects), classes=json.loads(classes), workload=workload)
+            yield 'user.add', record
+
+        submissions: Dict[int, Dict[int, str]] = {}
+        for assignment_id, student_id, content in cursor.execute(
+                "SELECT assignment_id, student_id, content FROM submissions"):
+            submissions.setdefault(assignment_id, {})[student_id] = content
+        assignment_grades: Dict[int, Dict[int, int]] = {}
+        for assignment_id, student_id, value in cursor.execute(
+                "SELECT assignment_id, student_id, value FROM assignment_grades"):
+            assignment_grades.setdefault(assignment_id, {})[student_id] = value
+
+        for row in cursor.execute("""SELECT id, title, description, deadline, subject, teacher_id,
+                                            class_id, difficulty FROM assignments ORDER BY id"""):
+            yield 'assignment.add', {
+                'id': row[0], 'title': row[1], 'description': row[2], 'deadline': row[3],
+                'subject': row[4], 'teacher_id': row[5], 'class_id': row[6], 'difficulty': row[7],
+                'submissions': submissions.get(row[0], {}), 'grades': assignment_grades.get(row[0], {})
+            }
+
+        for row in cursor.execute(EXPORT_QUERIES['grades']):
+            yield 'grade.add', {
+                'id': row[0], 'student_id': row[1], 'subject': row[2], 'value': row[3],
+                'date': row[4], 'teacher_id': row[5], 'comment': row[6]
+            }
+
+        lessons: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        for schedule_id, time_, subject, teacher_id, duration in cursor.execute(
+                "SELECT schedule_id, time, subject, teacher_id, duration FROM lessons"):
+            lessons.setdefault(schedule_id, {})[time_] = {
+                'subject': subject, 'teacher_id': teacher_id, 'duration': duration}
+        for row in cursor.execute("SELECT id, class_id, day FROM schedules ORDER BY id"):
+            yield 'schedule.add', {'id': row[0], 'class_id': row[1], 'day': row[2],
+                                   'lessons': lessons.get(row[0], {})}
+
+        for row in cursor.execute("""SELECT user_id, id, message, created_at, is_read, priority
+                                     FROM notifications ORDER BY user_id, id"""):
+            yield 'notification.add', {'user_id': row[0], 'notification': {
+                'id': row[1], 'message': row[2], 'created_at': row[3],
+                'is_read': bool(row[4]), 'priority': row[5]
+            }}
+
+    def append(self, operation: str, payload: Dict[str, Any]) -> None:
+        """Apply mutation inside the current batch transaction"""
+        handler = self._handlers.get(operation)
+        if handler is None:
+            return  # Snapshot-only records such as ID counters
+
+        with self._lock:
+            if not self.connection.in_transaction:
+                self.connection.execute("BEGIN")
+            handler(payload)
+            self._pending += 1
+
+            if self._bulk_depth == 0 and (self._pending >= self.commit_batch or
+                                          time.monotonic() - self._last_commit >= self.commit_interval):
+                self.sync()
+
+    def sync(self) -> None:
+        """Commit the current batch transaction"""
+        with self._lock:
+            if self.connection.in_transaction:
+                self.connection.execute("COMMIT")
+            self._pending = 0
+            self._last_commit = time.monotonic()
+
+    def write_snapshot(self, records) -> None:
+        """Tables are always current, so only checkpoint the WAL"""
+        self.sync()
+        self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def stream_rows(self, table: str, batch_size: int = 1000) -> Iterator[Tuple]:
+        """Stream export rows for a table from a separate read connection"""
+        self.sync()
+        reader = sqlite3.connect(self.path)
+        try:
+            cursor = reader.execute(EXPORT_QUERIES[table])
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            reader.close()
+
+    def close(self) -> None:
+        """Commit pending writes and close the database"""
+        with self._lock:
+            self.sync()
+            self.connection.close()
+        logger.info("SQLite storage %s closed", self.path)
+
+    def _add_user(self, record: Dict[str, Any]) -> None:
+        """Insert user and role-specific rows"""
+        extra = {key: value for key, value in record.items() if key not in CORE_RECORD_FIELDS}
+        execute = self.connection.execute
+        execute("""INSERT INTO users (id, role, full_name, email, password_hash, created_at, phone, address, extra)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (record['id'], record['role'], record['full_name'], record['email'], record['password_hash'],
+                 record['created_at'], record['phone'], record['address'], json.dumps(extra)))
+
+        if record['role'] == 'Student':
+            execute("INSERT INTO students (user_id, class_id, subjects, assignments) VALUES (?, ?, ?, ?)",
+                    (record['id'], record['grade'], json.dumps(record['subjects']),
+                     json.dumps(record['assignments'])))
+        elif record['role'] == 'Teacher':
+            execute("INSERT INTO teachers (user_id, subjects, classes, workload) VALUES (?, ?, ?, ?)",
+                    (record['id'], json.dumps(record['subjects']), json.dumps(record['classes']),
+                     record['workload']))
+
+    def _remove_user(self, payload: Dict[str, Any]) -> None:
+        """Delete user, role-specific rows and a teacher's lessons"""
+        user_id = payload['id']
+        for statement in ("DELETE FROM students WHERE user_id = ?",
+                          "DELETE FROM teachers WHERE user_id = ?",
+                          "DELETE FROM notifications WHERE user_id = ?",
+                          "DELETE FROM lessons WHERE teacher_id = ?",
+                          "DELETE FROM users WHERE id = ?"):
+            self.connection.execute(statement, (user_id,))
+
+    def _update_email(self, payload: Dict[str, Any]) -> None:
+        """Change user email"""
+        self.connection.execute("UPDATE users SET email = ? WHERE id = ?", (payload['email'], payload['id']))
+
+    def _update_password(self, payload: Dict[str, Any]) -> None:
+        """Replace user password hash"""
+        self.connection.execute("UPDATE users SET password_hash = ? WHERE id = ?",
+                                (payload['password_hash'], payload['id']))
+
+    def _update_user(self, payload: Dict[str, Any]) -> None:
+        """Apply profile field updates to the matching columns"""
+        user_id = payload['id']
+        for key, value in payload['fields'].items():
+            handled = False
+            if key in USER_COLUMNS:
+                self.connection.execute(f"UPDATE users SET {key} = ? WHERE id = ?", (value, user_id))
+                handled = True
+            stored = value if isinstance(value, (int, str)) else json.dumps(value)
+            if key in STUDENT_COLUMNS:
+                cursor = self.connection.execute(
+                    f"UPDATE students SET {STUDENT_COLUMNS[key]} = ? WHERE user_id = ?", (stored, user_id))
+                handled = handled or cursor.rowcount > 0
+            if key in TEACHER_COLUMNS:
+                cursor = self.connection.execute(
+                    f"UPDATE teachers SET {TEACHER_COLUMNS[key]} = ? WHERE user_id = ?", (stored, user_id))
+                handled = handled or cursor.rowcount > 0
+            if not handled:
+                self.connection.execute("UPDATE users SET extra = json_set(extra, ?, json(?)) WHERE id = ?",
+                                        (f'$."{key}"', json.dumps(value), user_id))
+
+    def _add_assignment(self, record: Dict[str, Any]) -> None:
+        """Insert assignment with its submissions and grades"""
+        self.connection.execute(
+            """INSERT INTO assignments (id, title, description, deadline, subject, teacher_id, class_id, difficulty)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            (record['id'], record['title'], record['description'], record['deadline'],
+             record['subject'], record['teacher_id'], record['class_id'], record['difficulty']))
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO submissions (assignment_id, student_id, content) VALUES (?, ?, ?)",
+            [(record['id'], int(student_id), content) for student_id, content in record['submissions'].items()])
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO assignment_grades (assignment_id, student_id, value) VALUES (?, ?, ?)",
+            [(record['id'], int(student_id), value) for student_id, value in record['grades'].items()])
+
+    def _remove_assignment(self, payload: Dict[str, Any]) -> None:
+        """Delete assignment with its submissions and grades"""
+        for statement in ("DELETE FROM submissions WHERE assignment_id = ?",
+                          "DELETE FROM assignment_grades WHERE assignment_id = ?",
+                          "DELETE FROM assignments WHERE id = ?"):
+            self.connection.execute(statement, (payload['id'],))
+
+    def _add_submission(self, payload: Dict[str, Any]) -> None:
+        """Store submission and mark it on the student"""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO submissions (assignment_id, student_id, content) VALUES (?, ?, ?)",
+            (payload['assignment_id'], payload['student_id'], payload['content']))
+        self.connection.execute(
+            "UPDATE students SET assignments = json_set(assignments, ?, 'submitted') WHERE user_id = ?",
+            (f'$."{payload["assignment_id"]}"', payload['student_id']))
+
+    def _grade_assignment(self, payload: Dict[str, Any]) -> None:
+        """Store assignment grade"""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO assignment_grades (assignment_id, student_id, value) VALUES (?, ?, ?)",
+            (payload['assignment_id'], payload['student_id'], payload['value']))
+
+    def _add_grade(self, payload: Dict[str, Any]) -> None:
+        """Insert grade record"""
+        self.connection.execute(
+            """INSERT INTO grades (id, student_id, subject, value, date, teacher_id, comment)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (payload['id'], payload['student_id'], payload['subject'], payload['value'],
+             payload['date'], payload['teacher_id'], payload['comment']))
+
+    def _update_grade(self, payload: Dict[str, Any]) -> None:
+        """Change grade value"""
+        self.connection.execute("UPDATE grades SET value = ? WHERE id = ?", (payload['value'], payload['id']))
+
+    def _add_notification(self, payload: Dict[str, Any]) -> None:
+        """Insert notification for a user"""
+        self._add_notifications(payload['user_id'], [payload['notification']])
+        self._evict_notifications([(payload['user_id'], notification_id)
+                                   for notification_id in payload.get('evicted', ())])
+
+    def _add_notification_bulk(self, payload: Dict[str, Any]) -> None:
+        """Insert one broadcast notification for many users"""
+        self.connection.executemany(
+            """INSERT OR REPLACE INTO notifications (user_id, id, message, created_at, is_read, priority)
+               VALUES (?, ?, ?, ?, 0, ?)""",
+            [(user_id, notification_id, payload['message'], payload['created_at'], payload['priority'])
+             for user_id, notification_id in payload['recipients']])
+        self._evict_notifications(payload.get('evicted', ()))
+
+    def _mark_notifications_read(self, payload: Dict[str, Any]) -> None:
+        """Set the read flag of some or all of a user's notifications"""
+        user_id = payload['user_id']
+        if payload['ids'] is None:
+            self.connection.execute("UPDATE notifications SET is_read = 1 WHERE user_id = ?", (user_id,))
+        else:
+            self.connection.executemany("UPDATE notifications SET is_read = 1 WHERE user_id = ? AND id = ?",
+                                        [(user_id, notification_id) for notification_id in payload['ids']])
+        self._evict_notifications([(user_id, notification_id) for notification_id in payload.get('evicted', ())])
+
+    def _delete_notification(self, payload: Dict[str, Any]) -> None:
+        """Delete a notification, remembering the user's next notification ID"""
+        self._evict_notifications([(payload['user_id'], payload['id'])])
+        self.connection.execute("UPDATE users SET extra = json_set(extra, '$.next_notification_id', ?) WHERE id = ?",
+                                (payload['next_id'], payload['user_id']))
+
+    def _add_schedule(self, record: Dict[str, Any]) -> None:
+        """Insert schedule with its lessons"""
+        self.connection.execute("INSERT INTO schedules (id, class_id, day) VALUES (?, ?, ?)",
+                                (record['id'], record['class_id'], record['day']))
+        self.connection.executemany(
+            "INSERT INTO lessons (schedule_id, time, subject, teacher_id, duration) VALUES (?, ?, ?, ?, ?)",
+            [(record['id'], time_, lesson['subject'], lesson['teacher_id'], lesson['duration'])
+             for time_, lesson in record['lessons'].items()])
+
+    def _add_lesson(self, payload: Dict[str, Any]) -> None:
+        """Insert lesson into a schedule"""
+        self.connection.execute(
+            "INSERT INTO lessons (schedule_id, time, subject, teacher_id, duration) VALUES (?, ?, ?, ?, ?)",
+            (payload['schedule_id'], payload['time'], payload['subject'], payload['teacher_id'],
+             payload['duration']))
+
+    def _remove_lesson(self, payload: Dict[str, Any]) -> None:
+        """Delete lesson from a schedule"""
+        self.connection.execute("DELETE FROM lessons WHERE schedule_id = ? AND time = ?",
+                                (payload['schedule_id'], payload['time']))
+
+    def _evict_notifications(self, pairs: Iterable[Tuple[int, int]]) -> None:
+        """Delete notifications given as (user_id, id) pairs"""
+        self.connection.executemany("DELETE FROM notifications WHERE user_id = ? AND id = ?", pairs)
+
+    def _add_notifications(self, user_id: int, notifications: List[Dict[str, Any]]) -> None:
+        """Insert notifications for a user"""
+        self.connection.executemany(
+            """INSERT OR REPLACE INTO notifications (user_id, id, message, created_at, is_read, priority)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            [(user_id, n['id'], n['message'], n['created_at'], int(n['is_read']), n['priority'])
+             for n in notifications])
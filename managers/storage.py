@@ -0,0 +1,232 @@
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterable, Iterator, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Storage backends content
+
+Record = Tuple[str, Dict[str, Any]]  # (operation, payload)
+
+
+class Storage(ABC):
+    """Abstract persistence backend for DataManager mutations"""
+
+    _bulk_depth = 0  # Nesting level of bulk() blocks
+
+    @abstractmethod
+    def load(self) -> Iterator[Record]:
+        """Yield records that rebuild the stored state"""
+        pass
+
+    @abstractmethod
+    def append(self, operation: str, payload: Dict[str, Any]) -> None:
+        """Persist a single mutation"""
+        pass
+
+    @abstractmethod
+    def sync(self) -> None:
+        """Make buffered mutations durable"""
+        pass
+
+    @contextmanager
+    def bulk(self, lock: Optional[ContextManager] = None) -> Iterator[None]:
+        """Group many mutations into one durable batch
+
+        lock is the caller's lock that serializes append() and sync(); it is
+        held while the nesting level changes and for the final sync, so
+        overlapping bulk() blocks of several threads sync exactly once.
+        """
+        lock = lock if lock is not None else nullcontext()
+        with lock:
+            self._bulk_depth += 1
+        try:
+            yield
+        finally:
+            with lock:
+                self._bulk_depth -= 1
+                if self._bulk_depth == 0:
+                    self.sync()
+
+    def needs_snapshot(self) -> bool:
+        """Check whether the backend wants a full state snapshot"""
+        return False
+
+    def write_snapshot(self, records: Iterable[Record]) -> None:
+        """Store full state snapshot"""
+        self.sync()
+
+    @abstractmethod
+    def close(self) -> None:
+        """Flush and release resources"""
+        pass
+
+
+class JournalStorage(Storage):
+    """Append-only journal with periodic snapshots for DataManager persistence
+
+    Every mutation is appended to ``journal.log`` as one JSON line
+    ``[sequence, operation, payload]``. The file is fsynced in batches, so a
+    crash can lose at most the last unsynced batch. A snapshot holds the full
+    state as the same kind of records plus the last journal sequence it covers,
+    so recovery reads the snapshot and replays only the newer journal entries.
+    """
+
+    SNAPSHOT_FILE = "snapshot.jsonl"
+    JOURNAL_FILE = "journal.log"
+    READ_CHUNK_BYTES = 1 << 20
+
+    def __init__(self, directory: str = "eduplatform_data", fsync_batch: int = 100,
+                 fsync_interval: float = 1.0, snapshot_every: int = 50000):
+        self.directory = directory
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self.snapshot_path = os.path.join(directory, self.SNAPSHOT_FILE)
+        self.journal_path = os.path.join(directory, self.JOURNAL_FILE)
+        self._sequence = 0
+        self._journal_records = 0  # Records appended since the last snapshot
+        self._pending = 0  # Records written but not yet fsynced
+        self._torn_offset: Optional[int] = None  # Byte offset of a torn journal entry found on load
+        self._last_sync = time.monotonic()
+        self._journal = None
+
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self) -> Iterator[Record]:
+        """Yield snapshot records followed by newer journal records"""
+        snapshot_sequence = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'rb') as f:
+                header = json.loads(f.readline())
+                snapshot_sequence = header['sequence']
+                for operation, payload in self._read_entries(f):
+                    yield operation, payload
+
+        self._sequence = snapshot_sequence
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'rb') as f:
+                for sequence, operation, payload in self._read_entries(f):
+                    if sequence <= snapshot_sequence:
+                        continue  # Already covered by the snapshot
+                    self._sequence = sequence
+                    self._journal_records += 1
+                    yield operation, payload
+            self._repair_journal()
+
+    def _read_entries(self, f) -> Iterator[list]:
+        """Parse binary JSON lines in batches, stopping at a torn trailing write
+
+        The byte offset of a torn entry is left in _torn_offset.
+        """
+        self._torn_offset = None
+        while True:
+            chunk_offset = f.tell()
+            lines = f.readlines(self.READ_CHUNK_BYTES)
+            if not lines:
+                return
+            try:
+                # One decoder call per chunk is much cheaper than one per line
+                yield from json.loads(b"[" + b",".join(lines) + b"]")
+                continue
+            except ValueError:
+                pass
+
+            for line in lines:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Torn write from a crash: everything after it was never synced
+                    logger.warning("Ignoring incomplete entry in %s", f.name)
+                    self._torn_offset = chunk_offset
+                    return
+                chunk_offset += len(line)
+
+    def _repair_journal(self) -> None:
+        """Cut a torn tail off the journal so new entries start on a fresh line"""
+        with open(self.journal_path, 'rb+') as f:
+            if self._torn_offset is not None:
+                f.truncate(self._torn_offset)
+                logger.warning("Truncated torn journal tail at byte %d", self._torn_offset)
+            else:
+                size = f.seek(0, os.SEEK_END)
+                if size == 0:
+                    return
+                f.seek(size - 1)
+                if f.read(1) == b"\n":
+                    return
+                f.write(b"\n")  # The last entry is complete but lost its newline
+            f.flush()
+            os.fsync(f.fileno())
+
+    def append(self, operation: str, payload: Dict[str, Any]) -> None:
+        """Append mutation to the journal"""
+        if self._journal is None:
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+
+        self._sequence += 1
+        self._journal.write(json.dumps([self._sequence, operation, payload], separators=(',', ':')) + "\n")
+        self._journal_records += 1
+        self._pending += 1
+
+        if self._bulk_depth == 0 and (self._pending >= self.fsync_batch or
+                                      time.monotonic() - self._last_sync >= self.fsync_interval):
+            self.sync()
+
+    def sync(self) -> None:
+        """Flush buffered journal entries to disk"""
+        if self._journal is not None and self._pending:
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def needs_snapshot(self) -> bool:
+        """Check whether the journal has grown enough to compact"""
+        return self._journal_records >= self.snapshot_every
+
+    def write_snapshot(self, records: Iterable[Record]) -> None:
+        """Write full state snapshot and truncate the journal"""
+        self.sync()
+        temp_path = self.snapshot_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'sequence': self._sequence}) + "\n")
+            for operation, payload in records:
+                f.write(json.dumps([operation, payload], separators=(',', ':')) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        self._fsync_directory()
+
+        # Journal entries up to the snapshot sequence are skipped on load,
+        # so a crash between the rename and the truncation is harmless
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = open(self.journal_path, 'w', encoding='utf-8')
+        self._journal_records = 0
+        logger.info("Snapshot written at journal sequence %d", self._sequence)
+
+    def _fsync_directory(self) -> None:
+        """Persist directory entry changes (no-op where unsupported)"""
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        fd: Optional[int] = None
+        try:
+            fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+    def close(self) -> None:
+        """Sync and close the journal"""
+        self.sync()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
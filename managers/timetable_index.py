@@ -0,0 +1,161 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# TimetableIndex class content
+
+# (start minute, end minute, class_id, teacher_id, subject, schedule_id)
+Lesson = Tuple[int, int, str, int, str, int]
+
+
+def to_minutes(time: str) -> int:
+    """Convert "HH:MM" to minutes after midnight"""
+    hours, minutes = time.split(":")
+    value = int(hours) * 60 + int(minutes)
+    if not 0 <= int(minutes) < 60 or not 0 <= value < 24 * 60:
+        raise ValueError(f"Invalid lesson time: {time}")
+    return value
+
+
+class TimetableIndex:
+    """Lessons of every timetable indexed by teacher, class and day
+
+    Each (teacher, day) and (class, day) key holds its lessons as a list
+    sorted by start minute. The lessons of one key never overlap, so a new
+    lesson only has to be compared with its neighbours at the bisect
+    position: overlap checks and "where is teacher X at T" cost O(log n).
+    These lists hold one class's or one teacher's day, a handful of lessons,
+    so adding or removing a lesson costs the same however big the school is.
+    Each day also buckets its lessons by start minute, with the distinct start
+    minutes kept sorted (at most 1440 of them, usually a dozen). Finding what
+    runs at T, and so which classes or teachers are free, bisects those start
+    minutes and reads only the buckets within the longest lesson length
+    before T; adding or removing a lesson touches one bucket.
+    """
+
+    def __init__(self):
+        self._teachers: Dict[Tuple[int, str], List[Lesson]] = {}
+        self._classes: Dict[Tuple[str, str], List[Lesson]] = {}
+        self._starts: Dict[str, List[int]] = {}  # {day: sorted distinct start minutes}
+        self._by_start: Dict[Tuple[str, int], Dict[Lesson, None]] = {}  # {(day, start minute): lessons}
+        self._max_duration = 0
+        self._class_lessons: Dict[str, int] = {}  # {class_id: lessons of the week}
+        self._size = 0
+        self.classes: Set[str] = set()  # Every class that has a lesson
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _overlapping(lessons: List[Lesson], start: int, end: int) -> Optional[Lesson]:
+        """Lesson of a non-overlapping sorted list that overlaps [start, end)"""
+        position = bisect_left(lessons, (start,))
+        if position > 0 and lessons[position - 1][1] > start:
+            return lessons[position - 1]
+        if position < len(lessons) and lessons[position][0] < end:
+            return lessons[position]
+        return None
+
+    def conflict(self, class_id: str, day: str, time: str, teacher_id: int, duration: int) -> Optional[Lesson]:
+        """Lesson that keeps the class or the teacher busy during the new lesson, if any"""
+        start = to_minutes(time)
+        end = start + duration
+        return (self._overlapping(self._classes.get((class_id, day), []), start, end)
+                or self._overlapping(self._teachers.get((teacher_id, day), []), start, end))
+
+    def add(self, schedule_id: int, class_id: str, day: str, time: str, subject: str,
+            teacher_id: int, duration: int) -> bool:
+        """Index a lesson unless it overlaps the class's or the teacher's other lessons"""
+        if duration <= 0 or self.conflict(class_id, day, time, teacher_id, duration) is not None:
+            return False
+        start = to_minutes(time)
+        lesson = (start, start + duration, class_id, teacher_id, subject, schedule_id)
+        insort(self._classes.setdefault((class_id, day), []), lesson)
+        insort(self._teachers.setdefault((teacher_id, day), []), lesson)
+        bucket = self._by_start.get((day, start))
+        if bucket is None:
+            bucket = self._by_start[(day, start)] = {}
+            insort(self._starts.setdefault(day, []), start)
+        bucket[lesson] = None
+        self._max_duration = max(self._max_duration, duration)
+        self._class_lessons[class_id] = self._class_lessons.get(class_id, 0) + 1
+        self.classes.add(class_id)
+        self._size += 1
+        return True
+
+    def remove(self, class_id: str, day: str, time: str) -> bool:
+        """Drop the class's lesson starting at time"""
+        lessons = self._classes.get((class_id, day), [])
+        position = bisect_left(lessons, (to_minutes(time),))
+        if position == len(lessons) or lessons[position][0] != to_minutes(time):
+            return False
+        lesson = lessons[position]
+        self._discard(self._classes, (class_id, day), lesson)
+        self._discard(self._teachers, (lesson[3], day), lesson)
+        bucket = self._by_start[(day, lesson[0])]
+        del bucket[lesson]
+        if not bucket:
+            del self._by_start[(day, lesson[0])]
+            starts = self._starts[day]
+            del starts[bisect_left(starts, lesson[0])]
+            if not starts:
+                del self._starts[day]
+        self._class_lessons[class_id] -= 1
+        if not self._class_lessons[class_id]:
+            del self._class_lessons[class_id]
+            self.classes.discard(class_id)
+        self._size -= 1
+        return True
+
+    @staticmethod
+    def _discard(index: Dict, key: Any, lesson: Lesson) -> None:
+        """Take a lesson out of a key's sorted list, dropping the key once it is empty"""
+        lessons = index[key]
+        del lessons[bisect_left(lessons, lesson)]
+        if not lessons:
+            del index[key]
+
+    @staticmethod
+    def _at(lessons: List[Lesson], minute: int) -> Optional[Lesson]:
+        """Lesson of a non-overlapping sorted list running at minute"""
+        position = bisect_right(lessons, (minute, float('inf')))
+        if position and lessons[position - 1][1] > minute:
+            return lessons[position - 1]
+        return None
+
+    def where_is(self, teacher_id: int, day: str, time: str) -> Optional[Lesson]:
+        """Lesson the teacher is giving at time, None if free"""
+        return self._at(self._teachers.get((teacher_id, day), []), to_minutes(time))
+
+    def class_lesson(self, class_id: str, day: str, time: str) -> Optional[Lesson]:
+        """Lesson the class is having at time, None if free"""
+        return self._at(self._classes.get((class_id, day), []), to_minutes(time))
+
+    def running(self, day: str, time: str) -> List[Lesson]:
+        """Every lesson in progress at time, in start order"""
+        minute = to_minutes(time)
+        starts = self._starts.get(day, [])
+        low = bisect_left(starts, minute - self._max_duration + 1)
+        high = bisect_right(starts, minute)
+        return [lesson for start in starts[low:high] for lesson in self._by_start[(day, start)]
+                if lesson[1] > minute]
+
+    def free_classes(self, day: str, time: str, classes: Optional[Iterable[str]] = None) -> List[str]:
+        """Classes without a lesson at time (default: every class with a timetable)"""
+        busy: Set[str] = {lesson[2] for lesson in self.running(day, time)}
+        if classes is None:
+            classes = self.classes
+        return sorted(class_id for class_id in classes if class_id not in busy)
+
+    def free_teachers(self, day: str, time: str, teachers: Iterable[int]) -> List[int]:
+        """Teachers among the given ones who are not teaching at time"""
+        busy: Set[int] = {lesson[3] for lesson in self.running(day, time)}
+        return sorted(teacher_id for teacher_id in teachers if teacher_id not in busy)
+
+    def teacher_day(self, teacher_id: int, day: str) -> List[Lesson]:
+        """Teacher's lessons of a day in time order"""
+        return list(self._teachers.get((teacher_id, day), []))
+
+    def teacher_lessons(self, teacher_id: int) -> List[Lesson]:
+        """Every lesson of a teacher, scanning the (teacher, day) keys"""
+        return [lesson for (key_teacher, _), lessons in self._teachers.items() if key_teacher == teacher_id
+                for lesson in lessons]
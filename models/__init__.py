@@ -1,3 +1,4 @@
 from .users import Student, Teacher, Parent, Admin
 from .entities import Assignment, Grade, Schedule, Notification
+from .inbox import NotificationInbox
 from .base import AbstractRole, User
\ No newline at end of file
@@ -1,13 +1,14 @@
-import hashlib
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, List, Any
-import logging
+from typing import Dict, Any
+from models import passwords
 
 
 class AbstractRole(ABC):
     """Abstract base class for all user roles"""
 
+    __slots__ = ('_id', '_full_name', '_email', '_password_hash', '_created_at')
+
     def __init__(self, user_id: int, full_name: str, email: str, password: str):
         self._id = user_id
         self._full_name = full_name
@@ -16,12 +17,20 @@ class AbstractRole(ABC):
         self._created_at = datetime.now().isoformat()
 
     def _hash_password(self, password: str) -> str:
-        """Hash password using SHA-256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+        """Hash password with the configured salted hasher"""
+        return passwords.hash_password(password)
 
     def verify_password(self, password: str) -> bool:
-        """Verify password against stored hash"""
-        return self._hash_password(password) == self._password_hash
+        """Verify password against stored hash (legacy SHA-256 hashes included)"""
+        return passwords.verify_password(password, self._password_hash)
+
+    def set_password(self, password: str) -> None:
+        """Replace stored password hash"""
+        self._password_hash = self._hash_password(password)
+
+    def password_needs_rehash(self) -> bool:
+        """Check whether the stored hash is weaker than the configured hasher"""
+        return passwords.needs_rehash(self._password_hash)
 
     @abstractmethod
     def get_profile(self) -> Dict[str, Any]:
@@ -37,37 +46,14 @@ class AbstractRole(ABC):
 class User(AbstractRole):
     """Base user class with common functionality"""
 
+    __slots__ = ('role', 'phone', 'address')
+
     def __init__(self, user_id: int, full_name: str, email: str, password: str, role: str):
         super().__init__(user_id, full_name, email, password)
         self.role = role
-        self._notifications: List[Dict] = []
         self.phone = ""
         self.address = ""
 
-    def add_notification(self, message: str, priority: str = "normal") -> None:
-        """Add notification to the user"""
-        notification = {
-            'id': len(self._notifications) + 1,
-            'message': message,
-            'created_at': datetime.now().isoformat(),
-            'is_read': False,
-            'priority': priority
-        }
-        self._notifications.append(notification)
-        logging.info(f"Notification added for user {self._id}: {message}")
-
-    def view_notifications(self) -> List[Dict]:
-        """View all notifications"""
-        return sorted(self._notifications, key=lambda x: x['priority'] == 'high', reverse=True)
-
-    def delete_notification(self, notification_id: int) -> bool:
-        """Delete notification by ID"""
-        for i, notif in enumerate(self._notifications):
-            if notif['id'] == notification_id:
-                del self._notifications[i]
-                return True
-        return False
-
     def get_profile(self) -> Dict[str, Any]:
         """Get user profile"""
         return {
@@ -85,4 +71,35 @@ class User(AbstractRole):
         for key, value in kwargs.items():
             if hasattr(self, key) and not key.startswith('_'):
                 setattr(self, key, value)
-        return True
\ No newline at end of file
+        return True
+
+    def to_record(self) -> Dict[str, Any]:
+        """Serialize user state for persistent storage"""
+        return {
+            'id': self._id,
+            'full_name': self._full_name,
+            'email': self._email,
+            'password_hash': self._password_hash,
+            'created_at': self._created_at,
+            'role': self.role,
+            'phone': self.phone,
+            'address': self.address
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'User':
+        """Restore user from a stored record without re-hashing the password"""
+        user = cls.__new__(cls)
+        user._restore(record)
+        return user
+
+    def _restore(self, record: Dict[str, Any]) -> None:
+        """Load user state from a stored record"""
+        self._id = record['id']
+        self._full_name = record['full_name']
+        self._email = record['email']
+        self._password_hash = record['password_hash']
+        self._created_at = record['created_at']
+        self.role = record['role']
+        self.phone = record['phone']
+        self.address = record['address']
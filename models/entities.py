@@ -1,11 +1,17 @@
+from array import array
 from datetime import datetime
 from typing import Dict, Any, Union
 import logging
 
+logger = logging.getLogger(__name__)
+
 
 class Assignment:
     """Assignment class for managing student tasks"""
 
+    __slots__ = ('id', 'title', 'description', 'deadline', 'subject', 'teacher_id',
+                 'class_id', 'difficulty', 'submissions', 'grades')
+
     def __init__(self, assignment_id: int, title: str, description: str,
                  deadline: str, subject: str, teacher_id: int, class_id: str,
                  difficulty: str = "medium"):
@@ -46,10 +52,39 @@ class Assignment:
             "deadline": self.deadline
         }
 
+    def to_record(self) -> Dict[str, Any]:
+        """Serialize assignment for persistent storage"""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "deadline": self.deadline,
+            "subject": self.subject,
+            "teacher_id": self.teacher_id,
+            "class_id": self.class_id,
+            "difficulty": self.difficulty,
+            "submissions": self.submissions,
+            "grades": self.grades
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'Assignment':
+        """Restore assignment from a stored record"""
+        assignment = cls(
+            record["id"], record["title"], record["description"], record["deadline"],
+            record["subject"], record["teacher_id"], record["class_id"], record["difficulty"]
+        )
+        # JSON object keys are strings, student IDs are ints
+        assignment.submissions = {int(key): value for key, value in record["submissions"].items()}
+        assignment.grades = {int(key): value for key, value in record["grades"].items()}
+        return assignment
+
 
 class Grade:
     """Grade class for managing student grades"""
 
+    __slots__ = ('id', 'student_id', 'subject', 'value', 'date', 'teacher_id', 'comment')
+
     def __init__(self, grade_id: int, student_id: int, subject: str,
                  value: int, teacher_id: int, comment: str = ""):
         self.id = grade_id
@@ -79,20 +114,38 @@ class Grade:
             "comment": self.comment
         }
 
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'Grade':
+        """Restore grade from a stored record"""
+        # Bypass __init__ so restoring does not stamp a new date
+        grade = cls.__new__(cls)
+        grade.id = record["id"]
+        grade.student_id = record["student_id"]
+        grade.subject = record["subject"]
+        grade.value = record["value"]
+        grade.date = record["date"]
+        grade.teacher_id = record["teacher_id"]
+        grade.comment = record["comment"]
+        return grade
+
 
 class Schedule:
     """Schedule class for managing class timetables"""
 
+    LESSON_MINUTES = 45
+
+    __slots__ = ('id', 'class_id', 'day', 'lessons')
+
     def __init__(self, schedule_id: int, class_id: str, day: str):
         self.id = schedule_id
         self.class_id = class_id
         self.day = day
-        self.lessons: Dict[str, Dict[str, Union[str, int]]] = {}  # {time: {subject, teacher_id}}
+        self.lessons: Dict[str, Dict[str, Union[str, int]]] = {}  # {time: {subject, teacher_id, duration}}
 
-    def add_lesson(self, time: str, subject: str, teacher_id: int) -> bool:
+    def add_lesson(self, time: str, subject: str, teacher_id: int, duration: int = LESSON_MINUTES) -> bool:
         """Add lesson to schedule"""
         if time not in self.lessons:
-            self.lessons[time] = {"subject": subject, "teacher_id": teacher_id}
+            self.lessons[time] = {"subject": subject, "teacher_id": teacher_id, "duration": duration}
             return True
         return False  # Time slot already occupied
 
@@ -107,23 +160,64 @@ class Schedule:
             return True
         return False
 
+    def to_record(self) -> Dict[str, Any]:
+        """Serialize schedule for persistent storage"""
+        return {
+            "id": self.id,
+            "class_id": self.class_id,
+            "day": self.day,
+            "lessons": {time: {"duration": self.LESSON_MINUTES, **lesson} for time, lesson in self.lessons.items()}
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'Schedule':
+        """Restore schedule from a stored record"""
+        schedule = cls(record["id"], record["class_id"], record["day"])
+        schedule.lessons = {time: dict(lesson) for time, lesson in record["lessons"].items()}
+        return schedule
+
 
 class Notification:
     """Notification class for managing system notifications"""
 
-    def __init__(self, notification_id: int, message: str, recipient_id: int):
+    __slots__ = ('id', 'message', 'recipient_id', 'created_at', 'is_read', 'priority')
+
+    def __init__(self, notification_id: int, message: str, recipient_id: int, priority: str = "normal"):
         self.id = notification_id
         self.message = message
         self.recipient_id = recipient_id
         self.created_at = datetime.now().isoformat()
         self.is_read = False
-        self.priority = "normal"
+        self.priority = priority
 
     def send(self) -> bool:
         """Send notification"""
-        logging.info(f"Notification {self.id} sent to user {self.recipient_id}")
+        logger.debug("Notification %d sent to user %s", self.id, self.recipient_id)
         return True
 
     def mark_as_read(self) -> None:
         """Mark notification as read"""
-        self.is_read = True
\ No newline at end of file
+        self.is_read = True
+
+    def to_record(self) -> Dict[str, Any]:
+        """Serialize notification for persistent storage"""
+        return {
+            "id": self.id,
+            "message": self.message,
+            "created_at": self.created_at,
+            "is_read": self.is_read,
+            "priority": self.priority
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any], recipient_id: int) -> 'Notification':
+        """Restore notification from a stored record"""
+        notification = cls(record["id"], record["message"], recipient_id, record["priority"])
+        notification.created_at = record["created_at"]
+        notification.is_read = record["is_read"]
+        return notification
+
+
+def grade_array(values=()) -> array:
+    """Create compact grade sequence (grades are always 1-5)"""
+    return array('b', values)
@@ -0,0 +1,172 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from heapq import heapify, heappop, heappush
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from models.entities import Notification
+
+
+class NotificationInbox:
+    """Notifications of one user, bucketed by priority
+
+    Every priority keeps a dict of its notifications keyed by ID in arrival
+    order, so lookup, delete and mark-read are dict operations and
+    iteration walks the buckets from high to low priority without sorting.
+    IDs come from a counter that only moves forward, so an ID is never reused
+    after a delete. evict() enforces the retention limits: every read
+    notification created more than max_age seconds ago is dropped, and past
+    max_items the earliest read one goes first; unread notifications are
+    only dropped, oldest and least urgent first, when nothing read is left.
+    Read notifications are also kept in a heap by creation time, so the age
+    sweep stops at the first one still within max_age.
+    """
+
+    PRIORITIES = ("high", "normal", "low")
+    max_items: Optional[int] = 500
+    max_age: Optional[float] = 180 * 24 * 3600.0
+
+    __slots__ = ('next_id', 'unread', '_size', '_buckets', '_read', '_read_by_age')
+
+    def __init__(self):
+        self.next_id = 1
+        self.unread = 0
+        self._size = 0
+        self._buckets: Dict[str, Dict[int, Notification]] = {}
+        self._read: Optional['OrderedDict[int, Notification]'] = None  # In the order they were read
+        self._read_by_age: Optional[List[Tuple[str, int]]] = None  # Heap of (created_at, id), may hold removed IDs
+
+    @classmethod
+    def configure(cls, max_items: Optional[int] = 500, max_age: Optional[float] = 180 * 24 * 3600.0) -> None:
+        """Set retention limits for every inbox (None disables a limit)"""
+        cls.max_items = max_items
+        cls.max_age = max_age
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, notification_id: int) -> bool:
+        return self.get(notification_id) is not None
+
+    def __iter__(self) -> Iterator[Notification]:
+        """Iterate high priority first, oldest first within a priority"""
+        for bucket in self._ordered_buckets():
+            yield from bucket.values()
+
+    def _ordered_buckets(self) -> List[Dict[int, Notification]]:
+        """Non-empty buckets from high to low priority, unknown priorities last"""
+        buckets = self._buckets
+        ordered = [buckets[priority] for priority in self.PRIORITIES if buckets.get(priority)]
+        ordered.extend(bucket for priority, bucket in buckets.items()
+                       if bucket and priority not in self.PRIORITIES)
+        return ordered
+
+    def get(self, notification_id: int) -> Optional[Notification]:
+        """Find notification by ID"""
+        for bucket in self._buckets.values():
+            notification = bucket.get(notification_id)
+            if notification is not None:
+                return notification
+        return None
+
+    def add(self, message: str, recipient_id: int, priority: str = "normal",
+            created_at: Optional[str] = None) -> Notification:
+        """Create a notification with the next ID"""
+        notification = Notification(self.next_id, message, recipient_id, priority)
+        if created_at is not None:
+            notification.created_at = created_at
+        self.insert(notification)
+        return notification
+
+    def insert(self, notification: Notification) -> None:
+        """Store an existing notification, keeping its ID and read state"""
+        bucket = self._buckets.get(notification.priority)
+        if bucket is None:
+            bucket = self._buckets[notification.priority] = {}
+        bucket[notification.id] = notification
+        self._size += 1
+        if notification.is_read:
+            self._mark(notification)
+        else:
+            self.unread += 1
+        if notification.id >= self.next_id:
+            self.next_id = notification.id + 1
+
+    def remove(self, notification_id: int) -> bool:
+        """Delete notification by ID"""
+        for bucket in self._buckets.values():
+            notification = bucket.pop(notification_id, None)
+            if notification is not None:
+                self._size -= 1
+                if notification.is_read:
+                    del self._read[notification_id]
+                    if len(self._read_by_age) > 2 * len(self._read) + 32:
+                        self._compact_read_by_age()
+                else:
+                    self.unread -= 1
+                return True
+        return False
+
+    def mark_read(self, notification_id: int) -> bool:
+        """Mark one notification as read, False if unknown or already read"""
+        notification = self.get(notification_id)
+        if notification is None or notification.is_read:
+            return False
+        self._mark(notification)
+        self.unread -= 1
+        return True
+
+    def _mark(self, notification: Notification) -> None:
+        """Flag notification as read and queue it for eviction"""
+        notification.mark_as_read()
+        if self._read is None:
+            self._read = OrderedDict()
+            self._read_by_age = []
+        self._read[notification.id] = notification
+        heappush(self._read_by_age, (notification.created_at, notification.id))
+
+    def _compact_read_by_age(self) -> None:
+        """Drop heap entries of removed notifications"""
+        self._read_by_age = [(notification.created_at, notification_id)
+                             for notification_id, notification in self._read.items()]
+        heapify(self._read_by_age)
+
+    def mark_all_read(self) -> int:
+        """Mark every unread notification as read, returning how many changed"""
+        if not self.unread:
+            return 0
+        marked = 0
+        for bucket in self._ordered_buckets():
+            for notification in bucket.values():
+                if not notification.is_read:
+                    self._mark(notification)
+                    marked += 1
+        self.unread = 0
+        return marked
+
+    def evict(self) -> List[int]:
+        """Apply the age and size limits, returning IDs of dropped notifications"""
+        evicted = []
+        read = self._read
+        if self.max_age is not None and read:
+            cutoff = (datetime.now() - timedelta(seconds=self.max_age)).isoformat()
+            while self._read_by_age and self._read_by_age[0][0] < cutoff:
+                _, notification_id = heappop(self._read_by_age)
+                if notification_id in read:  # IDs are never reused, so a match is this notification
+                    self.remove(notification_id)
+                    evicted.append(notification_id)
+
+        if self.max_items is not None and self._size > self.max_items:
+            excess = self._size - self.max_items
+            while excess > 0:
+                if read:
+                    notification_id = next(iter(read))
+                else:
+                    bucket = self._ordered_buckets()[-1]
+                    notification_id = next(iter(bucket))
+                self.remove(notification_id)
+                evicted.append(notification_id)
+                excess -= 1
+        return evicted
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Serialize notifications for persistent storage"""
+        return [notification.to_record() for notification in self]
@@ -0,0 +1,174 @@
+import base64
+import hashlib
+import hmac
+import os
+from abc import ABC, abstractmethod
+from typing import Dict
+
+# Password hasher classes content
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode('ascii').rstrip('=')
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.b64decode(data + '=' * (-len(data) % 4))
+
+
+class PasswordHasher(ABC):
+    """Abstract password hasher producing self-describing encoded hashes
+
+    Encoded hashes look like ``algorithm$param$...$salt$hash`` so every stored
+    hash keeps the parameters it was created with.
+    """
+
+    algorithm = ""
+
+    @abstractmethod
+    def hash(self, password: str) -> str:
+        """Hash password with a fresh salt"""
+        pass
+
+    @abstractmethod
+    def verify(self, password: str, encoded: str) -> bool:
+        """Check password against an encoded hash of this algorithm"""
+        pass
+
+    @abstractmethod
+    def needs_rehash(self, encoded: str) -> bool:
+        """Check whether an encoded hash uses weaker or different parameters"""
+        pass
+
+
+class PBKDF2Hasher(PasswordHasher):
+    """PBKDF2-HMAC-SHA256 hasher"""
+
+    algorithm = "pbkdf2_sha256"
+
+    def __init__(self, iterations: int = 600_000, salt_size: int = 16):
+        self.iterations = iterations
+        self.salt_size = salt_size
+
+    def hash(self, password: str) -> str:
+        """Hash password with a fresh salt"""
+        salt = os.urandom(self.salt_size)
+        digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, self.iterations)
+        return f"{self.algorithm}${self.iterations}${_b64encode(salt)}${_b64encode(digest)}"
+
+    def verify(self, password: str, encoded: str) -> bool:
+        """Check password against an encoded PBKDF2 hash"""
+        _, iterations, salt, digest = encoded.split('$')
+        expected = _b64decode(digest)
+        actual = hashlib.pbkdf2_hmac('sha256', password.encode(), _b64decode(salt), int(iterations),
+                                     dklen=len(expected))
+        return hmac.compare_digest(actual, expected)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        """Check whether the hash was made with a different iteration count"""
+        return int(encoded.split('$')[1]) != self.iterations
+
+
+class ScryptHasher(PasswordHasher):
+    """scrypt hasher (memory-hard)"""
+
+    algorithm = "scrypt"
+
+    def __init__(self, n: int = 2 ** 14, r: int = 8, p: int = 1, salt_size: int = 16, key_size: int = 32):
+        self.n = n
+        self.r = r
+        self.p = p
+        self.salt_size = salt_size
+        self.key_size = key_size
+
+    @staticmethod
+    def _derive(password: str, salt: bytes, n: int, r: int, p: int, key_size: int) -> bytes:
+        # 128 * n * r bytes of working memory plus headroom
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                              maxmem=256 * n * r + 1024 * 1024, dklen=key_size)
+
+    def hash(self, password: str) -> str:
+        """Hash password with a fresh salt"""
+        salt = os.urandom(self.salt_size)
+        digest = self._derive(password, salt, self.n, self.r, self.p, self.key_size)
+        return f"{self.algorithm}${self.n}${self.r}${self.p}${_b64encode(salt)}${_b64encode(digest)}"
+
+    def verify(self, password: str, encoded: str) -> bool:
+        """Check password against an encoded scrypt hash"""
+        _, n, r, p, salt, digest = encoded.split('$')
+        expected = _b64decode(digest)
+        actual = self._derive(password, _b64decode(salt), int(n), int(r), int(p), len(expected))
+        return hmac.compare_digest(actual, expected)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        """Check whether the hash was made with different cost parameters"""
+        _, n, r, p, _, _ = encoded.split('$')
+        return (int(n), int(r), int(p)) != (self.n, self.r, self.p)
+
+
+class SHA256Hasher(PasswordHasher):
+    """Legacy unsalted SHA-256 hasher (stored as plain hex digests)"""
+
+    algorithm = "sha256"
+
+    def hash(self, password: str) -> str:
+        """Hash password using SHA-256"""
+        return hashlib.sha256(password.encode()).hexdigest()
+
+    def verify(self, password: str, encoded: str) -> bool:
+        """Check password against a hex digest"""
+        return hmac.compare_digest(self.hash(password), encoded)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        """Legacy digests never need rehashing by this hasher"""
+        return False
+
+
+HASHERS: Dict[str, PasswordHasher] = {
+    PBKDF2Hasher.algorithm: PBKDF2Hasher(),
+    ScryptHasher.algorithm: ScryptHasher(),
+    SHA256Hasher.algorithm: SHA256Hasher()
+}
+
+_default_hasher: PasswordHasher = HASHERS[ScryptHasher.algorithm]
+
+
+def get_default_hasher() -> PasswordHasher:
+    """Get hasher used for new passwords"""
+    return _default_hasher
+
+
+def set_default_hasher(hasher: PasswordHasher) -> None:
+    """Set hasher used for new passwords and rehash-on-login"""
+    global _default_hasher
+    _default_hasher = hasher
+
+
+def identify_hasher(encoded: str) -> PasswordHasher:
+    """Find the hasher that produced an encoded hash"""
+    if '$' not in encoded:
+        return HASHERS[SHA256Hasher.algorithm]  # Digests stored before salted hashing
+    return HASHERS[encoded.split('$', 1)[0]]
+
+
+def hash_password(password: str) -> str:
+    """Hash password with the default hasher"""
+    return _default_hasher.hash(password)
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    """Check password against any supported encoded hash"""
+    try:
+        return identify_hasher(encoded).verify(password, encoded)
+    except (KeyError, ValueError):
+        return False  # Unknown algorithm or malformed hash
+
+
+def needs_rehash(encoded: str) -> bool:
+    """Check whether an encoded hash should be upgraded to the default hasher"""
+    try:
+        if identify_hasher(encoded).algorithm != _default_hasher.algorithm:
+            return True
+        return _default_hasher.needs_rehash(encoded)
+    except (KeyError, ValueError):
+        return True
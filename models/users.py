@@ -1,19 +1,26 @@
+from array import array
 from models.base import User
-from models.entities import Assignment
+from models.entities import Assignment, grade_array
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 import logging
 
+logger = logging.getLogger(__name__)
+
 
 class Student(User):
     """Student class with academic functionality"""
 
+    __slots__ = ('grade', 'subjects', 'assignments', 'grades', '_grade_stats', '_grade_totals')
+
     def __init__(self, user_id: int, full_name: str, email: str, password: str, grade: str):
         super().__init__(user_id, full_name, email, password, "Student")
         self.grade = grade
         self.subjects: Dict[str, int] = {}  # {subject: teacher_id}
         self.assignments: Dict[int, str] = {}  # {assignment_id: status}
-        self.grades: Dict[str, List[int]] = {}  # {subject: [grades]}
+        self.grades: Dict[str, array] = {}  # {subject: array('b') of grades}
+        self._grade_stats: Dict[str, List[int]] = {}  # {subject: [sum, count, sum of squares]}
+        self._grade_totals: List[int] = [0, 0, 0]  # [sum, count, sum of squares] over all subjects
 
     def submit_assignment(self, assignment_id: int, content: str) -> bool:
         """Submit assignment"""
@@ -22,31 +29,93 @@ class Student(User):
             return False
 
         self.assignments[assignment_id] = "submitted"
-        logging.info(f"Student {self._id} submitted assignment {assignment_id}")
+        logger.debug("Student %s submitted assignment %s", self._id, assignment_id)
+        return True
+
+    def add_grade(self, subject: str, value: int) -> None:
+        """Append grade to the subject's grade sequence"""
+        grades = self.grades.get(subject)
+        if grades is None:
+            grades = self.grades[subject] = grade_array()
+            self._grade_stats[subject] = [0, 0, 0]
+        grades.append(value)
+        self._update_grade_stats(subject, value, 1)
+
+    def update_grade(self, subject: str, old_value: int, new_value: int) -> bool:
+        """Replace the most recent occurrence of old_value in a subject"""
+        grades = self.grades.get(subject)
+        if not grades or old_value not in grades:
+            return False
+
+        # Equal values are interchangeable for aggregates, so the latest one is corrected
+        index = len(grades) - 1 - grades[::-1].index(old_value)
+        grades[index] = new_value
+        self._update_grade_stats(subject, old_value, -1)
+        self._update_grade_stats(subject, new_value, 1)
         return True
 
-    def view_grades(self, subject: Optional[str] = None) -> Dict[str, List[int]]:
+    def _update_grade_stats(self, subject: str, value: int, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) a value from running aggregates"""
+        for stats in (self._grade_stats[subject], self._grade_totals):
+            stats[0] += sign * value
+            stats[1] += sign
+            stats[2] += sign * value * value
+
+    def view_grades(self, subject: Optional[str] = None) -> Dict[str, array]:
         """View grades, optionally filtered by subject"""
         if subject:
-            return {subject: self.grades.get(subject, [])}
+            return {subject: self.grades.get(subject, grade_array())}
         return self.grades
 
-    def calculate_average_grade(self, subject: Optional[str] = None) -> float:
-        """Calculate average grade"""
+    def _get_grade_stats(self, subject: Optional[str]) -> List[int]:
+        """Get [sum, count, sum of squares] for a subject or overall"""
         if subject:
-            grades = self.grades.get(subject, [])
-            return sum(grades) / len(grades) if grades else 0.0
-
-        all_grades = []
-        for subject_grades in self.grades.values():
-            all_grades.extend(subject_grades)
+            return self._grade_stats.get(subject, [0, 0, 0])
+        return self._grade_totals
 
-        return sum(all_grades) / len(all_grades) if all_grades else 0.0
+    def calculate_average_grade(self, subject: Optional[str] = None) -> float:
+        """Calculate average grade"""
+        total, count, _ = self._get_grade_stats(subject)
+        return total / count if count else 0.0
+
+    def calculate_grade_variance(self, subject: Optional[str] = None) -> float:
+        """Calculate population variance of grades"""
+        total, count, squares = self._get_grade_stats(subject)
+        if not count:
+            return 0.0
+        mean = total / count
+        return max(squares / count - mean * mean, 0.0)
+
+    def get_grade_count(self, subject: Optional[str] = None) -> int:
+        """Get number of grades for a subject or overall"""
+        return self._get_grade_stats(subject)[1]
+
+    def to_record(self) -> Dict[str, Any]:
+        """Serialize student state (grades are stored as Grade records)"""
+        record = super().to_record()
+        record.update({
+            'grade': self.grade,
+            'subjects': self.subjects,
+            'assignments': self.assignments
+        })
+        return record
+
+    def _restore(self, record: Dict[str, Any]) -> None:
+        """Load student state from a stored record"""
+        super()._restore(record)
+        self.grade = record['grade']
+        self.subjects = dict(record['subjects'])
+        self.assignments = {int(key): status for key, status in record['assignments'].items()}
+        self.grades = {}
+        self._grade_stats = {}
+        self._grade_totals = [0, 0, 0]
 
 
 class Teacher(User):
     """Teacher class with teaching functionality"""
 
+    __slots__ = ('subjects', 'classes', 'assignments', 'workload')
+
     def __init__(self, user_id: int, full_name: str, email: str, password: str, subjects: List[str]):
         super().__init__(user_id, full_name, email, password, "Teacher")
         self.subjects = subjects
@@ -55,15 +124,17 @@ class Teacher(User):
         self.workload = 0  # Teaching hours per week
 
     def create_assignment(self, title: str, description: str, deadline: str,
-                          subject: str, class_id: str, difficulty: str = "medium") -> int:
+                          subject: str, class_id: str, difficulty: str = "medium",
+                          assignment_id: Optional[int] = None) -> int:
         """Create new assignment"""
-        assignment_id = len(self.assignments) + 1
+        if assignment_id is None:
+            assignment_id = len(self.assignments) + 1
         assignment = Assignment(
             assignment_id, title, description, deadline,
             subject, self._id, class_id, difficulty
         )
         self.assignments[assignment_id] = assignment
-        logging.info(f"Teacher {self._id} created assignment: {title}")
+        logger.debug("Teacher %s created assignment: %s", self._id, title)
         return assignment_id
 
     def grade_assignment(self, assignment_id: int, student_id: int, grade: int) -> bool:
@@ -71,7 +142,7 @@ class Teacher(User):
         if assignment_id in self.assignments:
             assignment = self.assignments[assignment_id]
             assignment.set_grade(student_id, grade)
-            logging.info(f"Teacher {self._id} graded assignment {assignment_id} for student {student_id}: {grade}")
+            logger.debug("Teacher %s graded assignment %s for student %s: %s", self._id, assignment_id, student_id, grade)
             return True
         return False
 
@@ -80,10 +151,30 @@ class Teacher(User):
         # This would be implemented with access to the data manager
         return {"student_id": student_id, "progress": "Implementation needed"}
 
+    def to_record(self) -> Dict[str, Any]:
+        """Serialize teacher state (assignments are stored separately)"""
+        record = super().to_record()
+        record.update({
+            'subjects': self.subjects,
+            'classes': self.classes,
+            'workload': self.workload
+        })
+        return record
+
+    def _restore(self, record: Dict[str, Any]) -> None:
+        """Load teacher state from a stored record"""
+        super()._restore(record)
+        self.subjects = list(record['subjects'])
+        self.classes = list(record['classes'])
+        self.assignments = {}
+        self.workload = record['workload']
+
 
 class Parent(User):
     """Parent class with child monitoring functionality"""
 
+    __slots__ = ('children', 'notification_preferences')
+
     def __init__(self, user_id: int, full_name: str, email: str, password: str):
         super().__init__(user_id, full_name, email, password, "Parent")
         self.children: List[int] = []  # List of student IDs
@@ -102,14 +193,27 @@ class Parent(User):
         """View child's assignments"""
         return {"child_id": child_id, "assignments": "Implementation needed"}
 
-    def receive_child_notification(self, child_id: int, message: str) -> None:
-        """Receive notification about child"""
-        self.add_notification(f"Child {child_id}: {message}", priority="high")
+    def to_record(self) -> Dict[str, Any]:
+        """Serialize parent state"""
+        record = super().to_record()
+        record.update({
+            'children': self.children,
+            'notification_preferences': self.notification_preferences
+        })
+        return record
+
+    def _restore(self, record: Dict[str, Any]) -> None:
+        """Load parent state from a stored record"""
+        super()._restore(record)
+        self.children = list(record['children'])
+        self.notification_preferences = dict(record['notification_preferences'])
 
 
 class Admin(User):
     """Admin class with system management functionality"""
 
+    __slots__ = ('permissions',)
+
     def __init__(self, user_id: int, full_name: str, email: str, password: str):
         super().__init__(user_id, full_name, email, password, "Admin")
         self.permissions = [
@@ -119,12 +223,12 @@ class Admin(User):
 
     def add_user(self, user_data: Dict[str, Any]) -> bool:
         """Add new user to system"""
-        logging.info(f"Admin {self._id} adding new user: {user_data.get('email')}")
+        logger.info("Admin %s adding new user: %s", self._id, user_data.get('email'))
         return True
 
     def remove_user(self, user_id: int) -> bool:
         """Remove user from system"""
-        logging.info(f"Admin {self._id} removing user: {user_id}")
+        logger.info("Admin %s removing user: %s", self._id, user_id)
         return True
 
     def generate_report(self, report_type: str) -> Dict[str, Any]:
@@ -133,4 +237,15 @@ class Admin(User):
             "report_type": report_type,
             "generated_at": datetime.now().isoformat(),
             "generated_by": self._id
-        }
\ No newline at end of file
+        }
+
+    def to_record(self) -> Dict[str, Any]:
+        """Serialize admin state"""
+        record = super().to_record()
+        record['permissions'] = self.permissions
+        return record
+
+    def _restore(self, record: Dict[str, Any]) -> None:
+        """Load admin state from a stored record"""
+        super()._restore(record)
+        self.permissions = list(record['permissions'])
@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from managers.data_manager import DataManager
+from models.passwords import SHA256Hasher, get_default_hasher, set_default_hasher
+from models.users import Student, Teacher
+
+
+@pytest.fixture(autouse=True)
+def fast_hasher():
+    """Keep key derivation cost out of tests that create many users"""
+    previous = get_default_hasher()
+    set_default_hasher(SHA256Hasher())
+    yield
+    set_default_hasher(previous)
+
+
+@pytest.fixture
+def school():
+    """DataManager with one teacher of 9-A and two of its students"""
+    data_manager = DataManager()
+    teacher = Teacher(1, "Ann Smith", "ann@school.edu", "secret", ["Math", "Physics"])
+    teacher.classes.append("9-A")
+    data_manager.add_user(teacher)
+    data_manager.add_user(Student(2, "Bob Lee", "bob@school.edu", "secret", "9-A"))
+    data_manager.add_user(Student(3, "Cat Ray", "cat@school.edu", "secret", "9-A"))
+    return data_manager
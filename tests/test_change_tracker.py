@@ -0,0 +1,111 @@
+import pytest
+
+from managers.change_tracker import ChangeTracker
+from managers.data_manager import DataManager
+from managers.export_manager import ExportManager
+from managers.storage import JournalStorage
+from models.entities import Assignment
+from models.users import Student
+
+
+def test_changes_since_keeps_latest_change_per_row():
+    tracker = ChangeTracker()
+    tracker.mark('users', 1)
+    watermark = tracker.watermark()
+    tracker.mark('users', 2)
+    tracker.mark('users', 1, deleted=True)
+    tracker.mark('students', 2)
+
+    assert tracker.changes_since(watermark['version']) == {'users': ([2], [1]), 'students': ([2], [])}
+    assert tracker.changes_since(tracker.version) == {}
+
+
+def test_watermark_from_other_epoch_or_ahead_is_not_current():
+    tracker = ChangeTracker()
+    tracker.mark('users', 1)
+    assert tracker.is_current(tracker.watermark())
+    assert not tracker.is_current(ChangeTracker().watermark())
+    assert not tracker.is_current({'epoch': tracker.epoch, 'version': tracker.version + 1})
+    assert not tracker.is_current(None)
+
+
+def test_restore_continues_epoch_and_versions():
+    tracker = ChangeTracker()
+    tracker.mark('users', 1)
+    tracker.mark('assignments', 7, deleted=True)
+    restored = ChangeTracker()
+    restored.restore(tracker.to_record())
+
+    assert restored.watermark() == tracker.watermark()
+    assert restored.changes_since(0) == tracker.changes_since(0)
+
+
+def populate(data_manager: DataManager) -> None:
+    for user in (Student(1, "Ann", "ann@school.edu", "secret", "9-A"),
+                 Student(2, "Bob", "bob@school.edu", "secret", "9-A")):
+        assert data_manager.add_user(user)
+    assert data_manager.add_assignment(
+        Assignment(5, "Essay", "Two pages", "2099-01-01T00:00:00", "English", 9, "9-A"))
+
+
+def change_after_watermark(data_manager: DataManager) -> None:
+    assert data_manager.update_user_email(1, "ann.lee@school.edu")
+    assert data_manager.submit_assignment(2, 5, "Draft")
+    assert data_manager.add_user(Student(3, "Cat", "cat@school.edu", "secret", "9-B"))
+
+
+@pytest.mark.parametrize("snapshot_every", [50000, 4])
+def test_watermark_survives_restart(tmp_path, snapshot_every):
+    data_manager = DataManager(storage=JournalStorage(str(tmp_path), snapshot_every=snapshot_every))
+    populate(data_manager)
+    watermark = data_manager.changes.watermark()
+    change_after_watermark(data_manager)
+    expected = data_manager.changes.changes_since(watermark['version'])
+    final = data_manager.changes.watermark()
+    data_manager.close()
+
+    reloaded = DataManager(storage=JournalStorage(str(tmp_path), snapshot_every=snapshot_every))
+    assert reloaded.changes.watermark() == final
+    assert reloaded.changes.is_current(watermark)
+    assert reloaded.changes.changes_since(watermark['version']) == expected
+    assert expected == {'users': ([3, 1], []), 'students': ([3], []), 'assignments': ([5], [])}
+
+    with reloaded.locked():
+        delta, full = ExportManager(reloaded)._delta_rows(watermark)
+    assert not full
+    assert [row[0] for row in delta['users'][0]] == [1, 3]
+    reloaded.close()
+
+
+def test_first_restart_of_untracked_store_starts_new_epoch(tmp_path):
+    data_manager = DataManager(storage=JournalStorage(str(tmp_path)))
+    populate(data_manager)
+    watermark = data_manager.changes.watermark()
+    data_manager.close()
+    with open(tmp_path / JournalStorage.JOURNAL_FILE, encoding='utf-8') as f:
+        lines = [line for line in f if '"changes"' not in line]  # As written before the tracker was stored
+    with open(tmp_path / JournalStorage.JOURNAL_FILE, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+
+    reloaded = DataManager(storage=JournalStorage(str(tmp_path)))
+    assert not reloaded.changes.is_current(watermark)
+    epoch = reloaded.changes.epoch
+    reloaded.close()
+    restarted = DataManager(storage=JournalStorage(str(tmp_path)))
+    assert restarted.changes.epoch == epoch
+    restarted.close()
+
+
+def test_delta_sql_deletes_a_removed_teachers_assignments_before_the_user(school, tmp_path):
+    assert school.add_assignment(Assignment(7, "Fractions", "Exercises", "2099-01-01T00:00:00", "Math", 1, "9-A"))
+    export_manager = ExportManager(school)
+    assert export_manager.export_delta(str(tmp_path))
+    assert school.remove_user(1)
+    assert export_manager.export_delta(str(tmp_path))
+
+    version = export_manager.last_watermark()['version']
+    with open(tmp_path / f"delta_{version}.sql", encoding='utf-8') as f:
+        script = f.read()
+    assert script.index("DELETE FROM Assignments WHERE TeacherID IN (1);") < script.index(
+        "DELETE FROM Users WHERE ID IN (1);")
+    assert "WHERE TeacherID IN (SELECT ID FROM Users)" in script
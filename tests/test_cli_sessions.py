@@ -0,0 +1,56 @@
+import pytest
+
+from cli.interface import CLIInterface
+from managers.export_manager import ExportManager
+from managers.session_manager import SessionManager
+
+
+@pytest.fixture
+def cli(school):
+    clock = [0.0]
+    session_manager = SessionManager(school, ttl=60.0, clock=lambda: clock[0])
+    interface = CLIInterface(school, ExportManager(school), session_manager=session_manager)
+    interface.clock = clock
+    yield interface
+    interface.export_scheduler.shutdown()
+    interface.notification_dispatcher.shutdown()
+
+
+def run_with_inputs(cli, monkeypatch, answers):
+    """Run the CLI feeding answers; callables are side effects run before the next answer"""
+    script = iter(answers)
+
+    def fake_input(prompt=""):
+        answer = next(script)
+        while callable(answer):
+            answer()
+            answer = next(script)
+        return answer
+
+    monkeypatch.setattr("builtins.input", fake_input)
+    cli.run()
+
+
+def test_expired_session_is_logged_out_before_dispatch(cli, monkeypatch, capsys):
+    shown = []
+    monkeypatch.setattr(cli, "view_student_grades", lambda: shown.append(True))
+
+    def idle():
+        cli.clock[0] += 61.0
+
+    run_with_inputs(cli, monkeypatch, ["1", "bob@school.edu", "secret", "1", idle, "1", "2"])
+    assert shown == [True]  # The second choice came after the idle timeout
+    assert cli.current_user is None and cli.session_token is None
+    assert "Session expired" in capsys.readouterr().out
+
+
+def test_revoked_session_is_logged_out_before_dispatch(cli, monkeypatch):
+    shown = []
+    monkeypatch.setattr(cli, "view_student_grades", lambda: shown.append(True))
+
+    def revoke():
+        cli.data_manager.remove_user(2)
+
+    run_with_inputs(cli, monkeypatch, ["1", "bob@school.edu", "secret", revoke, "1", "2"])
+    assert shown == []
+    assert cli.current_user is None
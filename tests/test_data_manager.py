@@ -0,0 +1,163 @@
+from datetime import datetime
+
+import pytest
+
+from managers.data_manager import DataManager
+from managers.storage import JournalStorage
+from models.entities import Assignment
+from models.users import Admin, Parent, Student, Teacher
+
+
+def test_email_lookup_is_case_insensitive(school):
+    assert school.get_user_by_email("  BOB@School.edu ")._id == 2
+    assert school.get_user_by_email("nobody@school.edu") is None
+
+
+def test_duplicate_email_is_rejected(school):
+    assert not school.add_user(Student(4, "Bob Two", "Bob@school.edu", "secret", "9-B"))
+    assert 4 not in school.users
+
+
+def test_email_change_moves_index_entry(school):
+    assert school.update_user_email(2, "robert@school.edu")
+    assert school.get_user_by_email("bob@school.edu") is None
+    assert school.get_user_by_email("robert@school.edu")._id == 2
+    assert not school.update_user_email(3, "ROBERT@school.edu")  # Taken by user 2
+
+
+def test_profile_update_with_taken_email_changes_nothing(school):
+    assert not school.update_user_profile(2, phone="555-0100", email="cat@school.edu")
+    assert school.users[2].phone == ""
+    assert school.get_user_by_email("bob@school.edu")._id == 2
+
+
+def test_profile_update_with_unknown_field_changes_nothing(school):
+    assert not school.update_user_profile(2, email="robert@school.edu", nickname="Bobby")
+    assert school.get_user_by_email("bob@school.edu")._id == 2
+
+
+def test_profile_update_is_journaled_as_one_record(tmp_path, school):
+    data_manager = DataManager(storage=JournalStorage(str(tmp_path)))
+    for user in list(school.users.values()):
+        data_manager.add_user(user)
+    assert data_manager.update_user_profile(2, phone="555-0100", email="robert@school.edu", grade="9-B")
+    data_manager.close()
+    operations = [line.split(",")[1] for line in (tmp_path / "journal.log").read_text().splitlines()]
+    assert operations[-1] == '"user.update"' and '"user.email"' not in operations
+
+    reloaded = DataManager(storage=JournalStorage(str(tmp_path)))
+    student = reloaded.get_user_by_email("robert@school.edu")
+    assert student._id == 2 and student.phone == "555-0100"
+    assert [s._id for s in reloaded.get_students_by_class("9-B")] == [2]
+    reloaded.close()
+
+
+def add_assignments(data_manager: DataManager, deadlines) -> None:
+    for assignment_id, (deadline, class_id) in enumerate(deadlines, start=1):
+        assert data_manager.add_assignment(
+            Assignment(assignment_id, f"Task {assignment_id}", "", deadline, "Math", 1, class_id))
+
+
+def due_ids(data_manager: DataManager, start, end, class_id=None):
+    return [assignment.id for assignment in data_manager.get_assignments_due(start, end, class_id)]
+
+
+def test_deadline_index_follows_adds_and_removes(school):
+    add_assignments(school, [("2030-01-03T10:00:00", "9-A"), ("2030-01-01T10:00:00", "9-B"),
+                             ("2030-01-02T10:00:00", "9-A"), ("2030-01-02T10:00:00", "9-B")])
+    assert due_ids(school, "2030-01-01", "2030-12-31") == [2, 3, 4, 1]  # Ordered by deadline, then ID
+    assert due_ids(school, "2030-01-01", "2030-12-31", "9-A") == [3, 1]
+
+    assert school.remove_assignment(3)
+    assert not school.remove_assignment(3)
+    assert due_ids(school, "2030-01-01", "2030-12-31") == [2, 4, 1]
+    assert school.remove_assignment(1)
+    assert due_ids(school, "2030-01-01", "2030-12-31", "9-A") == []
+    assert "9-A" not in school._class_deadline_index
+
+
+def test_due_window_includes_both_bounds(school):
+    add_assignments(school, [("2030-01-01T08:00:00", "9-A"), ("2030-01-02T08:00:00", "9-A"),
+                             ("2030-01-02T08:00:01", "9-A")])
+    assert due_ids(school, "2030-01-01T08:00:00", "2030-01-02T08:00:00") == [1, 2]
+    assert due_ids(school, datetime(2030, 1, 1, 8, 0, 1), datetime(2030, 1, 2, 8)) == [2]
+    assert due_ids(school, "2030-01-02T08:00:00.000001", "2030-01-03") == [3]
+    assert due_ids(school, "2030-01-03", "2030-01-04") == []
+
+
+def test_deadlines_with_mixed_iso_precision(school):
+    add_assignments(school, [("2030-01-02", "9-A"), ("2030-01-02T00:00:00.250000", "9-A"),
+                             ("2030-01-02T00:00", "9-A"), ("2030-01-01T23:59:59.999999", "9-A")])
+    assert due_ids(school, "2030-01-02T00:00:00", "2030-01-02T00:00:00") == [1, 3]  # Same instant
+    assert due_ids(school, datetime(2030, 1, 1), "2030-01-02T00:00:00.5") == [4, 1, 3, 2]
+    assert school.remove_assignment(1)
+    assert due_ids(school, "2030-01-02", "2030-01-02") == [3]
+
+
+def add_families(data_manager: DataManager) -> None:
+    teacher = Teacher(4, "Dan Cole", "dan@school.edu", "secret", ["History"])
+    teacher.classes.extend(["9-B", "10-A"])
+    parent = Parent(7, "Eve Lee", "eve@school.edu", "secret")
+    parent.children.extend([2, 5])
+    for user in (teacher, Student(5, "Fay Ray", "fay@school.edu", "secret", "9-B"),
+                 Student(6, "Gus Kim", "gus@school.edu", "secret", "10-A"), parent,
+                 Admin(8, "Hal Admin", "hal@school.edu", "secret")):
+        assert data_manager.add_user(user)
+
+
+def test_recipients_by_role_and_class(school):
+    add_families(school)
+    assert school.get_recipients("role", "Student") == [2, 3, 5, 6]
+    assert school.get_recipients("role", "Parent") == [7]
+    assert school.get_recipients("class", "9-A") == [1, 2, 3, 7]  # Teacher, students and a parent
+    assert school.get_recipients("class", "9-B", roles=["Parent", "Teacher"]) == [4, 7]
+    assert school.get_recipients("grade", "9") == [1, 2, 3, 4, 5, 7]
+    assert school.get_recipients("all", roles=["Admin"]) == [8]
+    assert school.get_recipients("class", "11-C") == []
+    with pytest.raises(ValueError):
+        school.get_recipients("role", "Janitor")
+
+    assert school.remove_user(2)
+    assert school.get_recipients("class", "9-A") == [1, 3]  # Parent 7 only reaches 9-A through 2
+    assert school.remove_user(4)
+    assert school.get_recipients("class", "9-B") == [5, 7]
+
+
+def notification_counts(data_manager: DataManager):
+    stats = data_manager.notifications.stats()
+    users = data_manager.users
+    return (stats['total'], stats['unread'],
+            sum(data_manager.notifications.count(user_id) for user_id in users),
+            sum(data_manager.notifications.unread_count(user_id) for user_id in users))
+
+
+def test_notification_counters_survive_remove_and_replay(tmp_path, school):
+    data_manager = DataManager(storage=JournalStorage(str(tmp_path)))
+    for user in list(school.users.values()):
+        data_manager.add_user(user)
+    add_families(data_manager)
+    assert data_manager.add_notifications(data_manager.get_recipients("grade", "9"), "Trip on Friday") == 6
+    assert data_manager.add_notification(2, "See me", "high")
+    assert data_manager.add_notification(7, "Meeting")
+    assert data_manager.mark_notifications_read(2) == 2
+    assert data_manager.mark_notifications_read(7, [1]) == 1
+    assert data_manager.delete_notification(3, 1)
+    assert not data_manager.delete_notification(3, 1)
+    assert notification_counts(data_manager) == (7, 4, 7, 4)
+
+    assert data_manager.remove_user(7)  # One read and one unread notification go with the parent
+    assert data_manager.remove_user(3)  # Inbox already empty
+    assert notification_counts(data_manager) == (5, 3, 5, 3)
+    data_manager.close()
+
+    reloaded = DataManager(storage=JournalStorage(str(tmp_path)))
+    assert notification_counts(reloaded) == (5, 3, 5, 3)
+    assert reloaded.notifications.stats()['recipients'] == 4
+    assert reloaded.create_snapshot()
+    reloaded.close()
+
+    from_snapshot = DataManager(storage=JournalStorage(str(tmp_path)))
+    assert notification_counts(from_snapshot) == (5, 3, 5, 3)
+    assert from_snapshot.add_notification(2, "Graded")
+    assert notification_counts(from_snapshot) == (6, 4, 6, 4)
+    from_snapshot.close()
@@ -0,0 +1,152 @@
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import sqlite3
+
+import pytest
+from openpyxl import load_workbook
+
+from managers.export_manager import ExportManager, _sql_value
+from models.users import Student
+
+
+@pytest.fixture
+def export_manager(school):
+    manager = ExportManager(school)
+    yield manager
+    manager.shutdown()
+
+
+def test_auto_export_all_reuses_one_spawned_worker(export_manager, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert export_manager.auto_export_all()
+    worker_pool = export_manager._processes
+    assert worker_pool._mp_context.get_start_method() == "spawn"
+
+    assert export_manager.auto_export_all()
+    assert export_manager._processes is worker_pool
+    users = list(load_workbook(tmp_path / "eduplatform_data.xlsx", read_only=True)["Users"].values)
+    assert [row[0] for row in users] == ["ID", 1, 2, 3]
+    assert os.path.isdir(tmp_path / "csv_exports")
+    assert [entry['success'] for entry in export_manager.export_log] == [True] * 6
+
+
+def test_shutdown_stops_the_worker(export_manager, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert export_manager.auto_export_all()
+    export_manager.shutdown()
+    assert export_manager._processes is None
+    assert export_manager.auto_export_all()  # A new worker is started on demand
+
+
+def test_export_stats_report_process_peak_memory_and_growth(export_manager, tmp_path):
+    assert export_manager.export_to_csv(str(tmp_path / "first"))
+    assert export_manager.export_to_csv(str(tmp_path / "second"))
+    first, second = export_manager.export_log[-2], export_manager.export_log[-1]
+    assert 0 < first['peak_rss_mb'] <= second['peak_rss_mb']  # The high-water mark is never reset
+    assert first['peak_rss_growth_mb'] >= 0 and second['peak_rss_growth_mb'] >= 0
+
+
+def test_delta_watermark_outlives_job_entries_in_the_log(school, tmp_path):
+    log_path = str(tmp_path / "export_log.jsonl")
+    export_manager = ExportManager(school, log_path=log_path, log_size=10)
+    assert export_manager.export_delta(str(tmp_path / "delta"))
+    for job_id in range(6):
+        export_manager.log_job(job_id, "nightly", "running")
+        export_manager.log_job(job_id, "nightly", "done", True)
+    assert all(entry['format'] == "JOB" for entry in export_manager.export_log)
+
+    assert school.update_user_email(2, "bob.lee@school.edu")
+    assert export_manager.export_delta(str(tmp_path / "delta"))
+    version = export_manager.last_watermark()['version']
+    with open(tmp_path / "delta" / f"users_delta_{version}.csv", encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert [row[:2] for row in rows[1:]] == [["upsert", "2"]]  # Incremental, not a full resync
+
+    assert ExportManager(school, log_path=log_path, log_size=10).last_watermark() == export_manager.last_watermark()
+
+
+@pytest.mark.parametrize("text", ["O'Brien", "''", "a'; DROP TABLE Users; --", "Zoë\n'quoted'"])
+def test_sql_literals_escape_quotes(text):
+    literal = _sql_value(text)
+    assert literal.startswith("N'")
+    assert sqlite3.connect(":memory:").execute("SELECT " + literal[1:]).fetchone()[0] == text
+
+
+def test_sql_literals_of_other_types():
+    assert [_sql_value(value) for value in (None, True, False, 7, 2.5)] == ["NULL", "1", "0", "7", "2.5"]
+
+
+@pytest.mark.parametrize("rows, batch_size, statements", [(0, 2, 0), (1, 2, 1), (4, 2, 2), (5, 2, 3)])
+def test_insert_batches_split_at_batch_size(rows, batch_size, statements):
+    f = io.StringIO()
+    count = ExportManager._write_insert_batches(f, "T", ["ID"], [(index,) for index in range(rows)], batch_size, 2)
+    script = f.getvalue()
+    assert count == rows
+    assert script.count("INSERT INTO T (ID) VALUES") == statements
+    assert script.count("BEGIN TRANSACTION;") == script.count("COMMIT TRANSACTION;") == (statements + 1) // 2
+    values = [line.strip(" ,;\n") for line in script.splitlines() if line.startswith("    (")]
+    assert values == [f"({index})" for index in range(rows)]
+
+
+def test_sql_export_escapes_names_and_batches_users(export_manager, school, tmp_path):
+    assert school.add_user(Student(4, "Dan O'Neil", "dan@school.edu", "secret", "9-A"))
+    filename = tmp_path / "school.sql"
+    assert export_manager.export_to_sql(str(filename), batch_size=3, batches_per_transaction=1)
+    script = filename.read_text(encoding='utf-8')
+    assert "N'Dan O''Neil'" in script
+    assert script.count("INSERT INTO Users (") == 2  # 4 users in batches of 3
+    assert export_manager.export_log[-1]['tables']['users']['rows'] == 4
+
+
+def read_manifest(directory):
+    with open(directory / "manifest.json", encoding='utf-8') as f:
+        return json.load(f)
+
+
+def part_rows(directory, part):
+    opener = gzip.open if part['file'].endswith(".gz") else open
+    with opener(directory / part['file'], 'rt', encoding='utf-8', newline='') as f:
+        return list(csv.reader(f))
+
+
+def test_csv_parts_roll_over_by_rows_and_match_the_manifest(export_manager, tmp_path):
+    assert export_manager.export_to_csv(str(tmp_path), max_rows_per_part=2)
+    manifest = read_manifest(tmp_path)
+    users = manifest['tables']['users']
+    assert users['rows'] == 3
+    assert [(part['file'], part['rows']) for part in users['parts']] == [
+        ("users.part0001.csv", 2), ("users.part0002.csv", 1)]
+    ids = []
+    for part in users['parts']:
+        data = (tmp_path / part['file']).read_bytes()
+        assert part['bytes'] == len(data) and part['sha256'] == hashlib.sha256(data).hexdigest()
+        header, *rows = part_rows(tmp_path, part)
+        assert header[0] == "ID" and len(rows) == part['rows']
+        ids += [row[0] for row in rows]
+    assert ids == ["1", "2", "3"]
+    assert manifest['tables']['teachers']['parts'][0]['rows'] == 1
+
+
+def test_csv_parts_roll_over_by_bytes(school, tmp_path):
+    for user_id in range(4, 60):
+        assert school.add_user(Student(user_id, f"Student {user_id}", f"s{user_id}@school.edu", "secret", "9-B"))
+    export_manager = ExportManager(school)
+    assert export_manager.export_to_csv(str(tmp_path), max_bytes_per_part=1000)
+    parts = read_manifest(tmp_path)['tables']['users']['parts']
+    assert len(parts) > 2 and sum(part['rows'] for part in parts) == 59
+    row_bytes = max(len(line) for part in parts for line in (tmp_path / part['file']).read_bytes().splitlines(True))
+    assert all(part['bytes'] < 1000 + row_bytes for part in parts)  # A part closes on the first row past the limit
+
+
+def test_gzip_parts_hold_every_row(export_manager, tmp_path):
+    assert export_manager.export_to_csv(str(tmp_path), compression="gzip", max_rows_per_part=2)
+    manifest = read_manifest(tmp_path)
+    assert manifest['compression'] == "gzip"
+    parts = manifest['tables']['users']['parts']
+    assert [part['file'] for part in parts] == ["users.part0001.csv.gz", "users.part0002.csv.gz"]
+    assert [row[2] for part in parts for row in part_rows(tmp_path, part)[1:]] == [
+        "ann@school.edu", "bob@school.edu", "cat@school.edu"]
@@ -0,0 +1,72 @@
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from managers.data_manager import DataManager
+from managers.export_manager import ExportManager
+from managers.export_scheduler import CronSchedule, ExportScheduler
+
+
+def test_cron_fields_expand_lists_ranges_and_steps():
+    cron = CronSchedule("*/15 8-10 1,15 * 1-5")
+    assert cron.minutes == [0, 15, 30, 45]
+    assert cron.hours == [8, 9, 10]
+    assert cron.days == [1, 15]
+    assert cron.months == list(range(1, 13))
+    assert cron.weekdays == [1, 2, 3, 4, 5]
+    assert CronSchedule("5/20 0 * * *").minutes == [5, 25, 45]
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "* 24 * * *", "0 0 0 * *",
+                                        "5-1 * * * *", "*/0 * * * *", "* * * * 7"])
+def test_invalid_cron_expressions_are_rejected(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+@pytest.mark.parametrize("expression, moment, expected", [
+    ("30 2 * * *", datetime(2024, 3, 5, 2, 30), datetime(2024, 3, 6, 2, 30)),  # Strictly after
+    ("30 2 * * *", datetime(2024, 3, 5, 2, 29, 59), datetime(2024, 3, 5, 2, 30)),
+    ("0 9 * * 1", datetime(2024, 3, 5, 12, 0), datetime(2024, 3, 11, 9, 0)),  # Next Monday
+    ("0 0 1 * *", datetime(2024, 12, 31, 23, 59), datetime(2025, 1, 1, 0, 0)),  # Year rollover
+    ("0 12 29 2 *", datetime(2025, 3, 1), datetime(2028, 2, 29, 12, 0)),  # Leap day
+    ("0 6 13 * 5", datetime(2024, 1, 1), datetime(2024, 9, 13, 6, 0)),  # Both day and weekday must match
+])
+def test_next_after(expression, moment, expected):
+    assert CronSchedule(expression).next_after(moment) == expected
+
+
+def test_cron_that_never_fires_raises():
+    with pytest.raises(ValueError):
+        CronSchedule("0 0 31 2 *").next_after(datetime(2024, 1, 1))
+
+
+@pytest.fixture
+def scheduler():
+    export_scheduler = ExportScheduler(ExportManager(DataManager()), max_workers=1)
+    yield export_scheduler
+    export_scheduler.shutdown()
+
+
+def test_job_cancelled_while_queued_for_a_worker_does_not_run(scheduler):
+    started, release = threading.Event(), threading.Event()
+    ran = []
+
+    def blocking_export() -> bool:
+        started.set()
+        return release.wait(5)
+
+    first = scheduler.run_now(blocking_export, name="blocking")
+    assert started.wait(5)
+    second = scheduler.run_now(lambda: ran.append(True) or True, name="queued")
+    while scheduler.jobs[second].status != "running":  # Handed to the busy executor
+        time.sleep(0.01)
+    assert scheduler.cancel(second)
+    release.set()
+    scheduler.shutdown()
+
+    assert ran == []
+    assert scheduler.jobs[second].status == "cancelled" and scheduler.jobs[second].runs == 0
+    assert scheduler.jobs[first].status == "succeeded"
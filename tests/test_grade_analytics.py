@@ -0,0 +1,91 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from managers.data_manager import DataManager
+from managers.grade_analytics import GradeAnalytics, GradeStore
+from managers.sqlite_storage import SQLiteStorage
+from managers.storage import JournalStorage
+from models.entities import Grade
+from models.users import Student
+
+
+def make_store():
+    """Store of 40 grades over two classes, three subjects, two teachers and two months"""
+    store = GradeStore(capacity=4)  # Small, so appends have to grow the columns
+    rng = np.random.default_rng(7)
+    for grade_id in range(1, 41):
+        grade = Grade(grade_id, grade_id % 5, ("Math", "Physics", "Art")[grade_id % 3],
+                      int(rng.integers(1, 6)), 10 + grade_id % 2)
+        grade.date = f"2030-0{1 + grade_id % 2}-15T12:00:00"
+        store.append(grade, "9-A" if grade_id % 4 else "9-B")
+    return store
+
+
+def rows(store: GradeStore, group_column: str):
+    """{group code: values} from the raw columns"""
+    groups = {}
+    for key, value in zip(store.column(group_column), store.column('value')):
+        groups.setdefault(int(key), []).append(float(value))
+    return groups
+
+
+def test_grouped_percentiles_match_numpy():
+    store = make_store()
+    summary = GradeAnalytics(store).summary('subject', percentiles=(10, 25, 50, 90, 99))
+    for code, values in rows(store, 'subject_code').items():
+        stats = summary[store.subjects[code]]
+        assert stats['count'] == len(values)
+        assert stats['mean'] == pytest.approx(np.mean(values))
+        assert stats['std'] == pytest.approx(np.std(values))
+        assert (stats['min'], stats['max']) == (min(values), max(values))
+        for q in (10, 25, 50, 90, 99):
+            assert stats[f'p{q}'] == pytest.approx(np.percentile(values, q))
+        assert stats['median'] == pytest.approx(np.median(values))
+
+
+def test_histogram_per_group_and_since_filter():
+    store = make_store()
+    analytics = GradeAnalytics(store)
+    histogram = analytics.histogram('class')
+    for code, values in rows(store, 'class_code').items():
+        assert histogram[store.classes[code]] == {value: values.count(value) for value in range(1, 6)}
+    assert sum(analytics.histogram().values()) == 40
+
+    since = datetime(2030, 2, 1)
+    recent = [float(value) for value, timestamp in zip(store.column('value'), store.column('timestamp'))
+              if timestamp >= since.timestamp()]
+    assert analytics.summary(since=since)['count'] == len(recent) == 20
+    assert sum(sum(counts.values()) for counts in analytics.histogram('teacher', since=since).values()) == 20
+    assert analytics.summary('teacher', since=datetime(2031, 1, 1)) == {}
+
+
+def test_update_finds_rows_in_and_out_of_order():
+    store = make_store()
+    assert store.update(17, 5) and store.column('value')[16] == 5
+    assert not store.update(99, 5)
+
+    store.append(Grade(0, 1, "Math", 2, 10), "9-A")  # An ID below the last one
+    assert not store.ordered
+    assert store.update(0, 4) and store.column('value')[40] == 4
+    assert store.update(17, 1) and store.column('value')[16] == 1
+
+
+@pytest.mark.parametrize("storage", [
+    lambda path: JournalStorage(str(path), snapshot_every=5),
+    lambda path: SQLiteStorage(str(path / "school.db")),
+], ids=["journal", "sqlite"])
+def test_grade_ids_stay_increasing_after_replay(tmp_path, storage):
+    data_manager = DataManager(storage=storage(tmp_path))
+    data_manager.add_user(Student(1, "Ann", "ann@school.edu", "secret", "9-A"))
+    for value in (3, 4, 5, 2, 1, 4, 3):
+        assert data_manager.add_grade(1, "Math", value, 9) is not None
+    data_manager.close()
+
+    reloaded = DataManager(storage=storage(tmp_path))
+    store = reloaded.grade_store
+    assert store.ordered and np.all(np.diff(store.column('grade_id')) > 0)
+    assert reloaded.update_grade(4, 5)
+    assert GradeAnalytics(store).histogram() == {1: 1, 2: 0, 3: 2, 4: 2, 5: 2}
+    reloaded.close()
@@ -0,0 +1,91 @@
+import csv
+
+import pytest
+
+from managers.data_manager import DataManager
+from managers.import_manager import ImportManager, _ProfileRows
+
+
+def write_csv(path, header, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+@pytest.fixture
+def source(tmp_path):
+    write_csv(tmp_path / "users.csv", ["ID", "Full Name", "Email", "Role", "Password"], [
+        [1, "Ann Smith", "ann@school.edu", "teacher", "pw"],
+        [2, "Bob Lee", "bob@school.edu", "student", "pw"],
+        [3, "No Email", "not-an-email", "student", "pw"],
+        [4, "Dup Bob", "BOB@school.edu", "student", "pw"],
+        [5, "Eve Ray", "eve@school.edu", "wizard", "pw"],
+        [6, "Cat Ray", "cat@school.edu", "student", ""],
+        [7, "Dan Roe", "dan@school.edu", "student", "pw"],
+    ])
+    write_csv(tmp_path / "students.csv", ["User ID", "Grade", "Subjects"], [
+        [2, "9-A", "Math:1"], [7, "9-B", "Physics"], ["x", "9-C", ""], [99, "9-D", ""]])
+    write_csv(tmp_path / "teachers.csv", ["User ID", "Subjects", "Classes", "Workload"], [
+        [1, "Math, Physics", "9-A", "many"]])
+    write_csv(tmp_path / "assignments.csv", ["ID", "Title", "Subject", "Teacher ID", "Class ID", "Deadline"], [
+        [10, "Fractions", "Math", 1, "9-A", "2099-01-01T00:00:00"],
+        [11, "Orphan", "Math", 42, "9-A", "2099-01-01T00:00:00"],
+        [12, "Undated", "Math", 1, "9-A", "next week"],
+    ])
+    write_csv(tmp_path / "grades.csv", ["Student ID", "Subject", "Value", "Teacher ID"], [
+        [2, "Math", 5, 1], [2, "Math", 9, 1], [8, "Math", 4, 1]])
+    return str(tmp_path)
+
+
+def test_bad_rows_are_reported_with_location_and_skipped(source):
+    data_manager = DataManager()
+    report = ImportManager(data_manager, batch_size=2).import_data(source)
+
+    errors = {(error['table'], error['location']): error['error'] for error in report['errors']}
+    assert errors == {
+        ('users', "users.csv row 4"): "Invalid email: 'not-an-email'",
+        ('users', "users.csv row 5"): "Email already registered: BOB@school.edu",
+        ('users', "users.csv row 6"): "Invalid role: 'wizard'",
+        ('users', "users.csv row 7"): "Missing password",
+        ('students', "students.csv row 4"): "Invalid user id: 'x'",
+        ('students', "students.csv row 5"): "User ID not found in users table",
+        ('teachers', "teachers.csv row 2"): "Invalid workload: 'many'",
+        ('assignments', "assignments.csv row 3"): "Unknown teacher: 42",
+        ('assignments', "assignments.csv row 4"): "Invalid deadline: 'next week'",
+        ('grades', "grades.csv row 3"): "Grade value out of range 1-5: 9",
+        ('grades', "grades.csv row 4"): "Unknown student",
+    }
+    assert report['error_count'] == len(errors)
+    assert report['tables']['users'] == {'rows': 7, 'imported': 3, 'failed': 4}
+    assert set(data_manager.users) == {1, 2, 7}  # Ann is imported without her rejected Teachers row
+    assert (data_manager.students[2].grade, data_manager.students[7].grade) == ("9-A", "9-B")
+    assert data_manager.students[2].subjects == {"Math": 1}
+    assert list(data_manager.assignments) == [10]
+    assert [grade.value for grade in data_manager.grades.values()] == [5]
+
+
+def test_unsorted_profile_rows_are_still_merged(source, tmp_path):
+    write_csv(tmp_path / "students.csv", ["User ID", "Grade"], [[7, "9-B"], [2, "9-A"]])
+    data_manager = DataManager()
+    report = ImportManager(data_manager, batch_size=1).import_data(source)
+
+    assert (data_manager.students[2].grade, data_manager.students[7].grade) == ("9-A", "9-B")
+    assert report['tables']['students'] == {'rows': 2, 'imported': 2, 'failed': 0}
+
+
+def test_profile_rows_are_read_only_up_to_the_users_batch():
+    read = []
+
+    def rows():
+        for user_id in range(1, 101):
+            read.append(user_id)
+            yield f"students.csv row {user_id + 1}", {'user id': str(user_id)}
+
+    report = {'tables': {'students': {'rows': 0, 'imported': 0, 'failed': 0}}}
+    profiles = _ProfileRows('students', rows(), report, lambda *error: None)
+    profiles.read_until(10)
+    assert max(read) == 11  # One row of lookahead
+    assert profiles.pop(10) == ("students.csv row 11", {'user id': "10"})
+    assert profiles.pop(11) is None
+    assert len(list(profiles.remaining())) == 99
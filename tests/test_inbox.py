@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+
+from models.inbox import NotificationInbox
+
+
+def test_age_eviction_drops_every_expired_read_notification():
+    inbox = NotificationInbox()
+    old = (datetime.now() - timedelta(days=365)).isoformat()
+    recent = inbox.add("Recent", 2)
+    expired = [inbox.add(f"Old {index}", 2, created_at=old) for index in range(3)]
+    unread_old = inbox.add("Old, unread", 2, created_at=old)
+    inbox.mark_read(recent.id)  # Read first, so it heads the read order
+    for notification in expired:
+        inbox.mark_read(notification.id)
+
+    assert sorted(inbox.evict()) == [notification.id for notification in expired]
+    assert [notification.id for notification in inbox] == [recent.id, unread_old.id]
+    assert (len(inbox), inbox.unread) == (2, 1)
+
+
+def test_size_eviction_drops_read_before_unread(monkeypatch):
+    monkeypatch.setattr(NotificationInbox, 'max_items', 2)
+    inbox = NotificationInbox()
+    first, second, third = (inbox.add(f"Message {index}", 2) for index in range(3))
+    inbox.mark_read(second.id)
+
+    assert inbox.evict() == [second.id]
+    assert [notification.id for notification in inbox] == [first.id, third.id]
+
+
+def test_age_heap_drops_entries_of_removed_notifications():
+    inbox = NotificationInbox()
+    notifications = [inbox.add(f"Message {index}", 2) for index in range(200)]
+    inbox.mark_all_read()
+    for notification in notifications[:190]:
+        assert inbox.remove(notification.id)
+
+    assert len(inbox._read_by_age) <= 2 * len(inbox._read) + 32
+    assert inbox.evict() == []
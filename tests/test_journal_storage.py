@@ -0,0 +1,104 @@
+import threading
+
+from managers.data_manager import DataManager
+from managers.storage import JournalStorage
+from models.users import Student
+
+
+def open_school(directory) -> DataManager:
+    return DataManager(storage=JournalStorage(str(directory), fsync_batch=1))
+
+
+def add_student(data_manager: DataManager, user_id: int) -> None:
+    assert data_manager.add_user(Student(user_id, f"Student {user_id}", f"s{user_id}@school.edu", "secret", "9-A"))
+
+
+def test_reload_replays_journal(tmp_path):
+    data_manager = open_school(tmp_path)
+    add_student(data_manager, 1)
+    assert data_manager.update_user_email(1, "first@school.edu")
+    data_manager.close()
+
+    reloaded = open_school(tmp_path)
+    assert reloaded.get_user_by_email("first@school.edu")._id == 1
+    assert reloaded.get_next_id() == 2
+    reloaded.close()
+
+
+def test_append_after_torn_tail_survives_reload(tmp_path):
+    data_manager = open_school(tmp_path)
+    add_student(data_manager, 1)
+    data_manager.close()
+    with open(tmp_path / JournalStorage.JOURNAL_FILE, 'a', encoding='utf-8') as f:
+        f.write('[2,"user.add",{"id":2,"ful')  # Crash in the middle of a write
+
+    recovered = open_school(tmp_path)
+    assert set(recovered.users) == {1}
+    add_student(recovered, 3)
+    recovered.close()
+
+    reloaded = open_school(tmp_path)
+    assert set(reloaded.users) == {1, 3}
+    reloaded.close()
+
+
+def test_append_after_missing_newline_survives_reload(tmp_path):
+    data_manager = open_school(tmp_path)
+    add_student(data_manager, 1)
+    data_manager.close()
+    journal = tmp_path / JournalStorage.JOURNAL_FILE
+    journal.write_bytes(journal.read_bytes().rstrip(b"\n"))
+
+    recovered = open_school(tmp_path)
+    add_student(recovered, 2)
+    recovered.close()
+
+    reloaded = open_school(tmp_path)
+    assert set(reloaded.users) == {1, 2}
+    reloaded.close()
+
+
+def test_snapshot_then_journal_reload(tmp_path):
+    data_manager = DataManager(storage=JournalStorage(str(tmp_path), snapshot_every=3))
+    for user_id in range(1, 6):
+        add_student(data_manager, user_id)
+    data_manager.close()
+    assert (tmp_path / JournalStorage.SNAPSHOT_FILE).exists()
+
+    reloaded = open_school(tmp_path)
+    assert set(reloaded.users) == {1, 2, 3, 4, 5}
+    reloaded.close()
+
+
+def test_bulk_syncs_once_under_the_storage_lock_across_threads(tmp_path):
+    data_manager = open_school(tmp_path)
+    storage = data_manager.storage
+    synced_unlocked = []
+    original_sync = storage.sync
+
+    def checked_sync():
+        synced_unlocked.append(not data_manager._storage_lock._is_owned())
+        original_sync()
+
+    storage.sync = checked_sync
+    inside = threading.Barrier(4)
+
+    def import_batch(first_id: int) -> None:
+        with data_manager.bulk():
+            inside.wait()  # Every thread is inside bulk() at once
+            data_manager.add_users([Student(user_id, f"Student {user_id}", f"s{user_id}@school.edu", "secret", "9-A")
+                                    for user_id in range(first_id, first_id + 25)])
+
+    threads = [threading.Thread(target=import_batch, args=(first_id,)) for first_id in range(1, 101, 25)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert storage._bulk_depth == 0
+    assert synced_unlocked and not any(synced_unlocked)
+    assert storage._pending == 0
+    data_manager.close()
+    reloaded = open_school(tmp_path)
+    assert len(reloaded.users) == 100
+    reloaded.close()
@@ -0,0 +1,20 @@
+import logging
+import os
+
+from config.logging_config import setup_logging
+
+
+def test_fast_records_is_opt_in_and_restored(tmp_path):
+    default = logging._srcfile
+    try:
+        setup_logging(mode="queue", path=str(tmp_path / "queue.log")).stop()
+        assert logging._srcfile == default and logging.logProcesses
+
+        setup_logging(mode="queue", path=str(tmp_path / "fast.log"), fast_records=True).stop()
+        assert logging._srcfile is None and not logging.logProcesses
+
+        setup_logging(mode="basic", path=os.devnull)
+        assert logging._srcfile == default and logging.logProcesses and logging.logMultiprocessing
+    finally:
+        setup_logging(mode="basic", path=os.devnull)
+        logging.getLogger().setLevel(logging.WARNING)
@@ -0,0 +1,50 @@
+from managers.data_manager import DataManager
+from managers.sqlite_storage import SQLiteStorage
+from models.entities import Assignment
+
+
+def open_school(path) -> DataManager:
+    return DataManager(storage=SQLiteStorage(str(path)))
+
+
+def test_round_trip_restores_users_assignments_and_grades(tmp_path, school):
+    path = tmp_path / "school.db"
+    data_manager = open_school(path)
+    for user in list(school.users.values()):
+        assert data_manager.add_user(user)
+    assert data_manager.update_user_email(3, "cat.ray@school.edu")
+    assert data_manager.update_user_profile(2, phone="555-0100", email="bob.lee@school.edu")
+    assert data_manager.add_assignment(
+        Assignment(7, "Fractions", "Exercises 1-10", "2099-01-01T00:00:00", "Math", 1, "9-A"))
+    assert data_manager.submit_assignment(2, 7, "My answers")
+    assert data_manager.grade_assignment(1, 7, 2, 5, "Well done")
+    assert data_manager.add_grade(3, "Physics", 4, 1) is not None
+    assert data_manager.add_notification(2, "Graded", "high")
+    data_manager.close()
+
+    reloaded = open_school(path)
+    assert set(reloaded.students) == {2, 3} and set(reloaded.teachers) == {1}
+    assert reloaded.get_user_by_email("cat.ray@school.edu")._id == 3
+    assert reloaded.users[2].phone == "555-0100"
+    assert reloaded.get_user_by_email("bob.lee@school.edu")._id == 2
+    assignment = reloaded.assignments[7]
+    assert assignment.submissions == {2: "My answers"} and assignment.grades == {2: 5}
+    assert sorted((g.student_id, g.subject, g.value) for g in reloaded.grades.values()) == [
+        (2, "Math", 5), (3, "Physics", 4)]
+    assert [n.message for n in reloaded.get_notifications(2)] == ["Graded"]
+    assert reloaded.get_next_id() == 4
+    reloaded.close()
+
+
+def test_removed_user_stays_removed(tmp_path, school):
+    path = tmp_path / "school.db"
+    data_manager = open_school(path)
+    for user in list(school.users.values()):
+        data_manager.add_user(user)
+    assert data_manager.remove_user(3)
+    data_manager.close()
+
+    reloaded = open_school(path)
+    assert set(reloaded.users) == {1, 2}
+    assert reloaded.get_user_by_email("cat@school.edu") is None
+    reloaded.close()
@@ -0,0 +1,92 @@
+import pytest
+
+from managers.data_manager import DataManager
+from managers.sqlite_storage import SQLiteStorage
+from managers.storage import JournalStorage
+from managers.timetable_index import TimetableIndex
+from models.entities import Schedule
+
+
+def test_conflicts_with_class_or_teacher_lessons():
+    index = TimetableIndex()
+    assert index.add(1, "9-A", "Monday", "09:00", "Math", 1, 45)
+
+    assert index.conflict("9-A", "Monday", "09:30", 2, 45)[4] == "Math"  # Class busy
+    assert index.conflict("9-B", "Monday", "08:30", 1, 45)[2] == "9-A"  # Teacher busy
+    assert index.conflict("9-B", "Monday", "09:45", 1, 45) is None  # Starts as the lesson ends
+    assert not index.add(2, "9-B", "Monday", "09:15", "Math", 1, 45)
+    assert index.add(2, "9-B", "Monday", "09:45", "Math", 1, 45)
+    assert index.where_is(1, "Monday", "10:00")[2] == "9-B"
+    assert index.free_classes("Monday", "09:10") == ["9-B"]
+    assert [lesson[2] for lesson in index.running("Monday", "09:44")] == ["9-A"]
+    assert index.free_teachers("Monday", "09:50", [1, 2]) == [2]
+
+
+def test_remove_drops_emptied_keys_and_classes():
+    index = TimetableIndex()
+    assert index.add(1, "9-A", "Monday", "09:00", "Math", 1, 45)
+    assert index.add(1, "9-A", "Monday", "10:00", "Physics", 2, 45)
+    assert index.add(2, "9-B", "Tuesday", "09:00", "Math", 1, 45)
+
+    assert index.remove("9-A", "Monday", "09:00")
+    assert index.classes == {"9-A", "9-B"}
+    assert index.remove("9-A", "Monday", "10:00")
+    assert not index.remove("9-A", "Monday", "10:00")
+    assert index.classes == {"9-B"}
+    assert (index._classes.keys(), index._teachers.keys(), index._starts, index._by_start.keys()) == (
+        {("9-B", "Tuesday")}, {(1, "Tuesday")}, {"Tuesday": [540]}, {("Tuesday", 540)})
+    assert len(index) == 1
+
+
+@pytest.mark.parametrize("storage", [
+    lambda path: JournalStorage(str(path), fsync_batch=1),
+    lambda path: SQLiteStorage(str(path / "school.db")),
+], ids=["journal", "sqlite"])
+def test_schedules_survive_restart(tmp_path, storage):
+    data_manager = DataManager(storage=storage(tmp_path))
+    schedule = Schedule(1, "9-A", "Monday")
+    schedule.add_lesson("09:00", "Math", 1)
+    assert data_manager.add_schedule(schedule)
+    assert data_manager.add_lesson(1, "10:00", "Physics", 1, 40)
+    assert data_manager.add_lesson(1, "11:00", "Math", 1)
+    assert data_manager.remove_lesson(1, "09:00")
+    data_manager.close()
+
+    reloaded = DataManager(storage=storage(tmp_path))
+    assert reloaded.schedules[1].lessons == {
+        "10:00": {"subject": "Physics", "teacher_id": 1, "duration": 40},
+        "11:00": {"subject": "Math", "teacher_id": 1, "duration": 45}}
+    assert reloaded.where_is_teacher(1, "Monday", "10:30")['subject'] == "Physics"
+    assert not reloaded.add_lesson(1, "10:20", "Math", 1)  # Conflict checks see the restored lessons
+    assert reloaded.create_snapshot()
+    reloaded.close()
+
+    compacted = DataManager(storage=storage(tmp_path))
+    assert compacted.schedules[1].lessons.keys() == {"10:00", "11:00"}
+    assert len(compacted.timetable) == 2
+    compacted.close()
+
+
+@pytest.mark.parametrize("storage", [
+    lambda path: JournalStorage(str(path), fsync_batch=1),
+    lambda path: SQLiteStorage(str(path / "school.db")),
+], ids=["journal", "sqlite"])
+def test_removed_teacher_leaves_no_lessons(tmp_path, storage, school):
+    data_manager = DataManager(storage=storage(tmp_path))
+    for user in list(school.users.values()):
+        assert data_manager.add_user(user)
+    schedule = Schedule(1, "9-A", "Monday")
+    schedule.add_lesson("09:00", "Math", 1)
+    schedule.add_lesson("10:00", "Art", 4)
+    assert data_manager.add_schedule(schedule)
+    assert data_manager.remove_user(1)
+
+    assert list(data_manager.schedules[1].lessons) == ["10:00"]
+    assert data_manager.timetable.teacher_lessons(1) == []
+    assert data_manager.where_is_teacher(1, "Monday", "09:10") is None
+    data_manager.close()
+
+    reloaded = DataManager(storage=storage(tmp_path))
+    assert list(reloaded.schedules[1].lessons) == ["10:00"]
+    assert len(reloaded.timetable) == 1
+    reloaded.close()